@@ -1,9 +1,159 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
 import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Large reads keep per-chunk overhead negligible; hashlib releases the GIL for
+# updates this size, so artifacts hashed on separate threads use separate cores.
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Content-defined chunking. Every byte is mapped to one of four symbols by a fixed
+# table, and a chunk ends where the last CDC_TARGET_LENGTH symbols spell
+# CDC_TARGET, i.e. where a 16-bit fingerprint of the trailing 8-byte window hits a
+# fixed value. Both steps run inside bytes.translate/bytes.find, so boundaries are
+# found at memory speed without a per-byte Python loop. Changing any of these
+# values changes every boundary, so bump CDC_VERSION with them.
+CDC_VERSION = 1
+CDC_MIN_CHUNK = 16 * 1024
+CDC_MAX_CHUNK = 256 * 1024
+CDC_TARGET = b"01123302"
+CDC_TARGET_LENGTH = len(CDC_TARGET)
+
+
+def _cdc_symbol_table() -> bytes:
+    seed = b""
+    counter = 0
+    while len(seed) < 256:
+        seed += hashlib.sha256(b"oscillo-cdc-v%d-%d" % (CDC_VERSION, counter)).digest()
+        counter += 1
+    return bytes(b"0123"[value & 3] for value in seed[:256])
+
+
+CDC_SYMBOLS = _cdc_symbol_table()
+
+
+def digest_file(path: Path) -> dict:
+    """Return size, SHA-256 and SHA-512 of a file, computed in a single read pass."""
+    sha256 = hashlib.sha256()
+    sha512 = hashlib.sha512()
+    size = 0
+    buffer = bytearray(READ_CHUNK_BYTES)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as handle:
+        while True:
+            count = handle.readinto(buffer)
+            if not count:
+                break
+            chunk = view[:count]
+            sha256.update(chunk)
+            sha512.update(chunk)
+            size += count
+    return {
+        "name": path.name,
+        "size": size,
+        "sha256": sha256.hexdigest(),
+        "sha512": sha512.hexdigest(),
+    }
+
+
+def digest_artifacts(paths: list[Path], jobs: int) -> list[dict]:
+    """Hash every artifact, in parallel, preserving the order they were given in."""
+    if len(paths) <= 1 or jobs <= 1:
+        return [digest_file(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(digest_file, paths))
+
+
+def chunk_file(path: Path) -> list[list]:
+    """Split a file into content-defined chunks and return [offset, length, sha256] rows.
+
+    Memory stays bounded by one read block plus at most one unfinished chunk.
+    """
+    chunks = []
+    buffer = bytearray()
+    base = 0
+    with path.open("rb") as handle:
+        eof = False
+        while not eof:
+            block = handle.read(READ_CHUNK_BYTES)
+            eof = not block
+            buffer += block
+            symbols = buffer.translate(CDC_SYMBOLS)
+            view = memoryview(buffer)
+            start = 0
+            while start < len(buffer):
+                limit = start + CDC_MAX_CHUNK
+                match = symbols.find(CDC_TARGET, start + CDC_MIN_CHUNK - CDC_TARGET_LENGTH, limit)
+                if match >= 0:
+                    end = match + CDC_TARGET_LENGTH
+                elif len(buffer) >= limit:
+                    end = limit
+                elif eof:
+                    end = len(buffer)
+                else:
+                    break
+                chunks.append([base + start, end - start, hashlib.sha256(view[start:end]).hexdigest()])
+                start = end
+            view.release()
+            del buffer[:start]
+            base += start
+    return chunks
+
+
+def build_chunk_index(source: Path) -> dict:
+    """Chunk an archive, or every file under an unpacked bundle, into an index."""
+    if source.is_dir():
+        paths = sorted(path for path in source.rglob("*") if path.is_file() and not path.is_symlink())
+        names = [path.relative_to(source).as_posix() for path in paths]
+    else:
+        paths = [source]
+        names = [source.name]
+    files = []
+    for name, path in zip(names, paths):
+        chunks = chunk_file(path)
+        files.append({"path": name, "size": sum(chunk[1] for chunk in chunks), "chunks": chunks})
+    return {
+        "version": CDC_VERSION,
+        "minChunk": CDC_MIN_CHUNK,
+        "maxChunk": CDC_MAX_CHUNK,
+        "hash": "sha256",
+        "source": source.name,
+        "files": files,
+    }
+
+
+def changed_ranges(index: dict, previous: dict) -> list[dict]:
+    """List the byte ranges of each file in index whose chunks are not in previous.
+
+    Chunks are matched by hash across all files of the previous index, so moved
+    content is not reported. Adjacent changed chunks are merged into one range.
+    """
+    if (previous.get("version"), previous.get("minChunk"), previous.get("maxChunk")) != (
+        index["version"],
+        index["minChunk"],
+        index["maxChunk"],
+    ):
+        raise ValueError("previous chunk index was built with different chunking parameters")
+    known = {chunk[2] for entry in previous["files"] for chunk in entry["chunks"]}
+    changes = []
+    for entry in index["files"]:
+        ranges = []
+        for offset, length, digest in entry["chunks"]:
+            if digest in known:
+                continue
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1][1] = offset + length
+            else:
+                ranges.append([offset, offset + length])
+        if ranges:
+            changes.append({"path": entry["path"], "ranges": ranges})
+    return changes
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate Oscillo native update manifest.")
@@ -11,10 +161,62 @@ def main() -> None:
     parser.add_argument("--tag", required=True)
     parser.add_argument("--download-url", required=True)
     parser.add_argument("--release-url", required=True)
-    parser.add_argument("--sha256", required=True)
+    parser.add_argument(
+        "--artifact",
+        action="append",
+        default=[],
+        type=Path,
+        help="Release file to hash. The first one is the download behind --download-url. Repeatable.",
+    )
+    parser.add_argument(
+        "--sha256",
+        help="Expected SHA-256 of the download. Required without --artifact; checked against it otherwise.",
+    )
+    parser.add_argument(
+        "--sha256-sidecar",
+        action="store_true",
+        help="Also write '<download>.sha256' in shasum format next to the first artifact.",
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--chunk-source",
+        type=Path,
+        help="Archive or unpacked Oscillo.app to build a content-defined chunk index for.",
+    )
+    parser.add_argument(
+        "--previous-chunk-index",
+        type=Path,
+        help="Chunk index of the previous release; changed byte ranges are added to the new index.",
+    )
     parser.add_argument("--output", required=True)
     args = parser.parse_args()
 
+    if not args.artifact and not args.sha256:
+        parser.error("either --artifact or --sha256 is required")
+    if args.sha256_sidecar and not args.artifact:
+        parser.error("--sha256-sidecar requires --artifact")
+    for path in args.artifact:
+        if not path.is_file():
+            parser.error(f"artifact not found: {path}")
+    if args.chunk_source and not args.chunk_source.exists():
+        parser.error(f"chunk source not found: {args.chunk_source}")
+    if args.previous_chunk_index and not args.chunk_source:
+        parser.error("--previous-chunk-index requires --chunk-source")
+
+    artifacts = digest_artifacts(args.artifact, args.jobs)
+
+    sha256 = args.sha256.lower() if args.sha256 else None
+    if artifacts:
+        download = artifacts[0]
+        download["url"] = args.download_url
+        if sha256 and sha256 != download["sha256"]:
+            print(
+                f"{download['name']}: SHA-256 mismatch, expected {sha256}, computed {download['sha256']}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        sha256 = download["sha256"]
+
     payload = {
         "platform": "macos",
         "version": args.version,
@@ -23,13 +225,46 @@ def main() -> None:
         "publishedAt": datetime.now(timezone.utc).isoformat(),
         "downloadURL": args.download_url,
         "releaseURL": args.release_url,
-        "sha256": args.sha256,
+        "sha256": sha256,
     }
+    if artifacts:
+        payload["size"] = artifacts[0]["size"]
+        payload["sha512"] = artifacts[0]["sha512"]
+        payload["artifacts"] = artifacts
 
     output = Path(args.output)
     output.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.chunk_source:
+        index = build_chunk_index(args.chunk_source)
+        if args.previous_chunk_index:
+            previous = json.loads(args.previous_chunk_index.read_text(encoding="utf-8"))
+            try:
+                changes = changed_ranges(index, previous)
+            except ValueError as error:
+                print(f"{args.previous_chunk_index}: {error}", file=sys.stderr)
+                sys.exit(1)
+            changed = sum(end - start for entry in changes for start, end in entry["ranges"])
+            total = sum(entry["size"] for entry in index["files"])
+            index["changes"] = {"from": previous.get("release"), "bytes": changed, "files": changes}
+            print(f"chunk index: {changed} of {total} bytes changed since {previous.get('release') or 'previous index'}")
+        index["release"] = args.version
+        index_path = output.with_name(output.name.removesuffix(".json") + ".chunks.json")
+        index_bytes = (json.dumps(index, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8")
+        index_path.write_bytes(index_bytes)
+        payload["chunkIndex"] = {
+            "name": index_path.name,
+            "size": len(index_bytes),
+            "sha256": hashlib.sha256(index_bytes).hexdigest(),
+        }
+
     output.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
+    if args.sha256_sidecar:
+        primary = args.artifact[0]
+        sidecar = primary.with_name(primary.name + ".sha256")
+        sidecar.write_text(f"{sha256}  {primary.name}\n", encoding="utf-8")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,10 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "generate-update-manifest.py"
+
+_spec = importlib.util.spec_from_file_location("generate_update_manifest", SCRIPT)
+generate_update_manifest = importlib.util.module_from_spec(_spec)
+sys.modules["generate_update_manifest"] = generate_update_manifest
+_spec.loader.exec_module(generate_update_manifest)
@@ -0,0 +1,121 @@
+import hashlib
+import random
+
+import pytest
+
+from conftest import generate_update_manifest as manifest
+
+
+def random_bytes(size, seed=7):
+    return random.Random(seed).randbytes(size)
+
+
+def test_chunks_cover_file_within_size_bounds(tmp_path):
+    data = random_bytes(3 * 1024 * 1024)
+    path = tmp_path / "Oscillo.zip"
+    path.write_bytes(data)
+
+    chunks = manifest.chunk_file(path)
+
+    offset = 0
+    for start, length, digest in chunks:
+        assert start == offset
+        assert digest == hashlib.sha256(data[start : start + length]).hexdigest()
+        offset += length
+    assert offset == len(data)
+    for _, length, _ in chunks[:-1]:
+        assert manifest.CDC_MIN_CHUNK <= length <= manifest.CDC_MAX_CHUNK
+    assert 0 < chunks[-1][1] <= manifest.CDC_MAX_CHUNK
+
+
+def test_boundaries_do_not_depend_on_read_block_size(tmp_path, monkeypatch):
+    path = tmp_path / "Oscillo.zip"
+    path.write_bytes(random_bytes(2 * 1024 * 1024))
+    expected = manifest.chunk_file(path)
+
+    monkeypatch.setattr(manifest, "READ_CHUNK_BYTES", 10_000)
+
+    assert manifest.chunk_file(path) == expected
+
+
+def test_constant_input_is_cut_at_max_chunk(tmp_path):
+    path = tmp_path / "zeros"
+    path.write_bytes(bytes(manifest.CDC_MAX_CHUNK * 3 + 10))
+
+    chunks = manifest.chunk_file(path)
+
+    assert [length for _, length, _ in chunks] == [manifest.CDC_MAX_CHUNK] * 3 + [10]
+
+
+def test_insertion_changes_only_nearby_chunks(tmp_path):
+    data = random_bytes(4 * 1024 * 1024)
+    old = tmp_path / "old" / "Oscillo.zip"
+    new = tmp_path / "new" / "Oscillo.zip"
+    old.parent.mkdir()
+    new.parent.mkdir()
+    old.write_bytes(data)
+    new.write_bytes(data[:100_000] + b"inserted" * 100 + data[100_000:])
+
+    changes = manifest.changed_ranges(manifest.build_chunk_index(new), manifest.build_chunk_index(old))
+
+    assert len(changes) == 1
+    assert changes[0]["path"] == "Oscillo.zip"
+    ranges = changes[0]["ranges"]
+    assert len(ranges) == 1
+    start, end = ranges[0]
+    assert start <= 100_000 < end
+    assert end - start <= 2 * manifest.CDC_MAX_CHUNK
+
+
+def test_unchanged_index_reports_nothing(tmp_path):
+    path = tmp_path / "Oscillo.zip"
+    path.write_bytes(random_bytes(1024 * 1024))
+    index = manifest.build_chunk_index(path)
+
+    assert manifest.changed_ranges(index, index) == []
+
+
+def test_directory_index_lists_regular_files_by_relative_path(tmp_path):
+    bundle = tmp_path / "Oscillo.app"
+    (bundle / "Contents" / "MacOS").mkdir(parents=True)
+    (bundle / "Contents" / "Info.plist").write_bytes(b"<plist/>")
+    (bundle / "Contents" / "MacOS" / "Oscillo").write_bytes(random_bytes(300_000))
+    (bundle / "Contents" / "Link").symlink_to("Info.plist")
+
+    index = manifest.build_chunk_index(bundle)
+
+    assert index["source"] == "Oscillo.app"
+    assert (index["version"], index["minChunk"], index["maxChunk"], index["hash"]) == (
+        manifest.CDC_VERSION,
+        manifest.CDC_MIN_CHUNK,
+        manifest.CDC_MAX_CHUNK,
+        "sha256",
+    )
+    assert [(entry["path"], entry["size"]) for entry in index["files"]] == [
+        ("Contents/Info.plist", 8),
+        ("Contents/MacOS/Oscillo", 300_000),
+    ]
+
+
+def test_content_moved_between_files_is_not_reported(tmp_path):
+    payload = random_bytes(600_000)
+    old = tmp_path / "old"
+    new = tmp_path / "new"
+    old.mkdir()
+    new.mkdir()
+    (old / "a.bin").write_bytes(payload)
+    (new / "b.bin").write_bytes(payload)
+
+    changes = manifest.changed_ranges(manifest.build_chunk_index(new), manifest.build_chunk_index(old))
+
+    assert changes == []
+
+
+def test_mismatched_chunking_parameters_are_rejected(tmp_path):
+    path = tmp_path / "Oscillo.zip"
+    path.write_bytes(random_bytes(100_000))
+    index = manifest.build_chunk_index(path)
+    previous = dict(index, maxChunk=index["maxChunk"] * 2)
+
+    with pytest.raises(ValueError):
+        manifest.changed_ranges(index, previous)
@@ -0,0 +1,44 @@
+import hashlib
+import os
+
+from conftest import generate_update_manifest as manifest
+
+
+def test_digest_file_matches_hashlib_across_read_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest, "READ_CHUNK_BYTES", 4096)
+    data = os.urandom(4096 * 5 + 123)
+    path = tmp_path / "Oscillo-macOS-0.1.0.zip"
+    path.write_bytes(data)
+
+    digest = manifest.digest_file(path)
+
+    assert digest == {
+        "name": "Oscillo-macOS-0.1.0.zip",
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "sha512": hashlib.sha512(data).hexdigest(),
+    }
+
+
+def test_digest_file_of_empty_file(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+
+    digest = manifest.digest_file(path)
+
+    assert digest["size"] == 0
+    assert digest["sha256"] == hashlib.sha256(b"").hexdigest()
+
+
+def test_digest_artifacts_keeps_input_order_in_parallel(tmp_path):
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"artifact-{index}"
+        # Larger files first, so the later ones finish earlier on the pool.
+        path.write_bytes(bytes([index]) * (200_000 - index * 30_000))
+        paths.append(path)
+
+    digests = manifest.digest_artifacts(paths, jobs=4)
+
+    assert [digest["name"] for digest in digests] == [path.name for path in paths]
+    assert digests == [manifest.digest_file(path) for path in paths]
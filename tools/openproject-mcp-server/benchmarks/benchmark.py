@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the OpenProject MCP server.
+
+Starts the stub OpenProject API from stub_server.py in a separate process and
+drives the server's MCP tool handler the same way an MCP client does. Reports
+throughput, latency percentiles and peak memory per tool as JSON, and can
+compare a run against an earlier result file.
+
+Examples:
+    python benchmarks/benchmark.py --output baseline.json
+    python benchmarks/benchmark.py --work-packages 100000 --compare baseline.json
+    python benchmarks/benchmark.py --scenarios upload_attachment download_attachment --attachment-mb 500
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from stub_server import LARGE_ATTACHMENT_ID, StubOpenProject, add_arguments  # noqa: E402
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "openproject-mcp.py"
+
+
+def _download_directory(args: argparse.Namespace, i: int) -> str:
+    """One target directory per concurrent call, so downloads never share a file"""
+    directory = Path(args.scratch_dir) / f"download-{i % args.concurrency}"
+    directory.mkdir(exist_ok=True)
+    return str(directory)
+
+
+# Arguments each scenario passes to its tool
+SCENARIOS = {
+    "list_projects": lambda args, i: {},
+    "list_work_packages": lambda args, i: {
+        "status": "all",
+        **({"max_results": args.list_max_results} if args.list_max_results else {})
+    },
+    "list_types": lambda args, i: {},
+    "get_work_package_details_batch": lambda args, i: {
+        "work_package_ids": [
+            (i * args.detail_batch + offset) % args.work_packages + 1
+            for offset in range(args.detail_batch)
+        ]
+    },
+    "summarize_work_packages": lambda args, i: {
+        "group_by": "status",
+        "status": "all",
+        "show_sums": True
+    },
+    "update_work_packages": lambda args, i: {
+        "work_package_ids": [
+            (i * args.detail_batch + offset) % args.work_packages + 1
+            for offset in range(args.detail_batch)
+        ],
+        "changes": {"status_id": 2, "assignee_id": i % 25 + 1}
+    },
+    "create_work_package": lambda args, i: {
+        "project_id": 1,
+        "type_id": 1,
+        "subject": f"Benchmark work package {i}"
+    },
+    "upload_attachment": lambda args, i: {
+        "work_package_id": i % args.work_packages + 1,
+        "paths": [args.upload_path] * args.attachment_files
+    },
+    "download_attachment": lambda args, i: {
+        "attachment_ids": [LARGE_ATTACHMENT_ID],
+        "directory": _download_directory(args, i),
+        "overwrite": True
+    }
+}
+
+# Transfers of large files are only run when asked for
+DEFAULT_SCENARIOS = [name for name in SCENARIOS if not name.endswith("_attachment")]
+
+
+def load_server_module():
+    """Import openproject-mcp.py, whose file name is not a valid module name"""
+    spec = importlib.util.spec_from_file_location("openproject_mcp", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def run_stub(args: argparse.Namespace, port: int, ready) -> None:
+    """Serve the stub API in a child process so it does not share the event loop"""
+    stub = StubOpenProject(
+        work_packages=args.work_packages,
+        projects=args.projects,
+        latency=args.latency_ms / 1000,
+        max_page_size=args.max_page_size,
+        grouping=not args.no_grouping,
+        conflict_every=args.conflict_every,
+        connect_latency=args.connect_latency_ms / 1000,
+        large_attachment=int(args.attachment_mb * 1024 * 1024)
+    )
+    app = stub.build_app()
+
+    async def announce(app):
+        ready.set()
+
+    app.on_startup.append(announce)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+class Benchmark:
+    """Runs the tool scenarios against one stub instance"""
+
+    def __init__(self, module, base_url: str, args: argparse.Namespace):
+        self.module = module
+        self.base_url = base_url
+        self.args = args
+
+    async def _make_server(self):
+        """Build a server with a client configured the way run() does"""
+        server = self.module.OpenProjectMCPServer()
+        server.client = self.module.OpenProjectClient.from_env(
+            self.base_url, "benchmark", metrics=server.metrics
+        )
+        await server.client.open()
+        return server
+
+    async def _call(self, server, name: str, arguments: Dict[str, Any]) -> bool:
+        """Call a tool through the MCP request handler; returns whether it succeeded"""
+        from mcp import types
+
+        request = types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(name=name, arguments=arguments)
+        )
+        result = await server.server.request_handlers[types.CallToolRequest](request)
+        content = result.root.content
+        return not result.root.isError and not (content and content[0].text.startswith("❌"))
+
+    async def run_scenario(self, name: str) -> Dict[str, Any]:
+        """Warm up, measure latency and throughput, then measure peak memory"""
+        args = self.args
+        build_arguments = SCENARIOS[name]
+        server = await self._make_server()
+        try:
+            for i in range(args.warmup):
+                await self._call(server, name, build_arguments(args, i))
+
+            latencies: List[float] = []
+            errors = 0
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def timed_call(i: int):
+                nonlocal errors
+                async with semaphore:
+                    started = time.perf_counter()
+                    ok = await self._call(server, name, build_arguments(args, i))
+                    latencies.append(time.perf_counter() - started)
+                    if not ok:
+                        errors += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                timed_call(i) for i in range(args.warmup, args.warmup + args.iterations)
+            ))
+            elapsed = time.perf_counter() - started
+
+            # Tracing slows allocation down, so memory gets its own pass
+            tracemalloc.start()
+            try:
+                await self._call(server, name, build_arguments(args, args.warmup + args.iterations))
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            api_requests = sum(
+                value
+                for labels, value in server.metrics.counters("openproject_mcp_http_requests_total").items()
+            )
+            response_bytes = sum(
+                histogram.sum
+                for histogram in server.metrics.histograms("openproject_mcp_http_response_bytes").values()
+            )
+        finally:
+            await server.client.close()
+
+        latencies.sort()
+        calls = args.warmup + args.iterations + 1
+        return {
+            "iterations": args.iterations,
+            "errors": errors,
+            "throughput_per_second": round(args.iterations / elapsed, 3),
+            "latency_ms": {
+                "min": round(latencies[0] * 1000, 3),
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3)
+            },
+            "peak_memory_bytes": peak_memory,
+            "api_requests_per_call": round(api_requests / calls, 2),
+            "response_bytes_per_call": int(response_bytes / calls)
+        }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List the metrics that got worse than the baseline by more than threshold.
+
+    Args:
+        current: Result of this run
+        baseline: Result of an earlier run
+        threshold: Allowed relative slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        List[str]: Human readable regressions
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        checks = [
+            ("p50 latency", result["latency_ms"]["p50"], before["latency_ms"]["p50"], True),
+            ("p95 latency", result["latency_ms"]["p95"], before["latency_ms"]["p95"], True),
+            ("peak memory", result["peak_memory_bytes"], before["peak_memory_bytes"], True),
+            ("throughput", result["throughput_per_second"], before["throughput_per_second"], False)
+        ]
+        for label, now, then, lower_is_better in checks:
+            if not then:
+                continue
+            change = (now - then) / then
+            if (change if lower_is_better else -change) > threshold:
+                regressions.append(f"{name}: {label} {then:g} -> {now:g} ({change:+.1%})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every selected scenario and assemble the result document"""
+    module = load_server_module()
+    # Keep the server's INFO logging out of the timings and the report
+    logging.getLogger().setLevel(logging.WARNING)
+    process = None
+    base_url = args.url
+    if not base_url:
+        context = multiprocessing.get_context("spawn")
+        ready = context.Event()
+        process = context.Process(target=run_stub, args=(args, args.port, ready), daemon=True)
+        process.start()
+        if not await asyncio.to_thread(ready.wait, 30):
+            process.terminate()
+            raise RuntimeError("Stub OpenProject server did not start")
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    scratch = tempfile.TemporaryDirectory(prefix="openproject-mcp-bench-")
+    args.scratch_dir = scratch.name
+    # The attachment tools only touch files inside their root
+    os.environ["OPENPROJECT_ATTACHMENT_ROOT"] = scratch.name
+    if "upload_attachment" in args.scenarios:
+        # Random content, so nothing along the way can compress it
+        args.upload_path = os.path.join(scratch.name, "upload.bin")
+        with open(args.upload_path, "wb") as handle:
+            remaining = int(args.attachment_mb * 1024 * 1024)
+            while remaining > 0:
+                handle.write(os.urandom(min(remaining, 1024 * 1024)))
+                remaining -= 1024 * 1024
+
+    try:
+        benchmark = Benchmark(module, base_url, args)
+        scenarios = {}
+        for name in args.scenarios:
+            scenarios[name] = await benchmark.run_scenario(name)
+            latency = scenarios[name]["latency_ms"]
+            print(
+                f"{name:22} {scenarios[name]['throughput_per_second']:9.1f}/s  "
+                f"p50 {latency['p50']:9.1f}ms  p95 {latency['p95']:9.1f}ms  "
+                f"p99 {latency['p99']:9.1f}ms  "
+                f"peak {scenarios[name]['peak_memory_bytes'] / 1048576:7.1f}MiB",
+                file=sys.stderr
+            )
+    finally:
+        if process:
+            process.terminate()
+            process.join()
+        scratch.cleanup()
+
+    return {
+        "server_version": module.__version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "url": args.url,
+            "work_packages": args.work_packages,
+            "projects": args.projects,
+            "latency_ms": args.latency_ms,
+            "max_page_size": args.max_page_size,
+            "grouping": not args.no_grouping,
+            "conflict_every": args.conflict_every,
+            "connect_latency_ms": args.connect_latency_ms,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "list_max_results": args.list_max_results,
+            "detail_batch": args.detail_batch,
+            "attachment_mb": args.attachment_mb,
+            "attachment_files": args.attachment_files,
+            "environment": {
+                key: value for key, value in sorted(os.environ.items())
+                if key.startswith("OPENPROJECT_") and key not in ("OPENPROJECT_API_KEY", "OPENPROJECT_URL")
+            }
+        },
+        "scenarios": scenarios,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+            1 if sys.platform == "darwin" else 1024
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_arguments(parser)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=DEFAULT_SCENARIOS,
+                        help="Tools to benchmark (default: all but the attachment transfers)")
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="Measured calls per scenario (default: 20)")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="Unmeasured calls before measuring (default: 2)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Tool calls in flight at once (default: 1)")
+    parser.add_argument("--list-max-results", type=int, default=None,
+                        help="max_results passed to list_work_packages (default: the whole dataset)")
+    parser.add_argument("--detail-batch", type=int, default=20,
+                        help="Work packages per get_work_package_details_batch call (default: 20)")
+    parser.add_argument("--attachment-files", type=int, default=2,
+                        help="Files per upload_attachment call (default: 2)")
+    parser.add_argument("--port", type=int, default=8091,
+                        help="Port for the stub server (default: 8091)")
+    parser.add_argument("--url", help="Benchmark an already running stub instead of starting one")
+    parser.add_argument("--output", help="Write the JSON result to this file instead of stdout")
+    parser.add_argument("--compare", help="Earlier JSON result to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(result, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
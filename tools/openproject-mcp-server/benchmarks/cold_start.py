@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the stdio server.
+
+MCP clients usually spawn one stdio server per agent session, so the time
+until the first tool call returns matters as much as steady-state latency.
+Starts the stub OpenProject API, then repeatedly spawns the server the way
+an MCP client does, waits for the initialize handshake, optionally pauses
+like a model picking its first tool, and calls one tool. Reports the median
+time to the handshake and to the first tool response, measured from spawn.
+
+Use --connect-latency-ms to make new connections to the stub as expensive
+as DNS, TCP and TLS setup to a remote instance, and --snapshot to keep a
+metadata cache snapshot between the runs.
+
+Examples:
+    python benchmarks/cold_start.py --connect-latency-ms 150
+    python benchmarks/cold_start.py --connect-latency-ms 150 --snapshot /tmp/op-cache.json
+    python benchmarks/cold_start.py --server /tmp/openproject-mcp-old.py
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from benchmark import SERVER_PATH, percentile, run_stub  # noqa: E402
+from stub_server import add_arguments  # noqa: E402
+
+
+async def spawn_and_call(args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, float]:
+    """Spawn one server, run the handshake and the first tool call"""
+    from mcp import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    parameters = StdioServerParameters(command=sys.executable, args=[args.server], env=env)
+    started = time.perf_counter()
+    async with stdio_client(parameters) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            initialized = time.perf_counter()
+            if args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+            call_started = time.perf_counter()
+            result = await session.call_tool(args.tool, json.loads(args.arguments))
+            finished = time.perf_counter()
+    if result.isError or result.content[0].text.startswith(("❌", "Error")):
+        raise RuntimeError(f"{args.tool} failed: {result.content[0].text[:200]}")
+    return {
+        "initialize": initialized - started,
+        "first_response": finished - started,
+        "tool_call": finished - call_started
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start the stub, spawn the server repeatedly and summarize the timings"""
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    stub = context.Process(target=run_stub, args=(args, args.port, ready), daemon=True)
+    stub.start()
+    try:
+        if not await asyncio.to_thread(ready.wait, 30):
+            raise RuntimeError("Stub OpenProject server did not start")
+        env = dict(
+            os.environ,
+            OPENPROJECT_URL=f"http://127.0.0.1:{args.port}",
+            OPENPROJECT_API_KEY="cold-start",
+            LOG_LEVEL="WARNING"
+        )
+        if args.snapshot:
+            env["OPENPROJECT_CACHE_SNAPSHOT"] = args.snapshot
+            # One unmeasured run leaves the snapshot the measured runs start from
+            await spawn_and_call(args, env)
+        runs = [await spawn_and_call(args, env) for _ in range(args.runs)]
+    finally:
+        stub.terminate()
+        stub.join()
+
+    def median_ms(key: str) -> float:
+        return round(percentile(sorted(run[key] for run in runs), 0.5) * 1000, 1)
+
+    return {
+        "server": str(args.server),
+        "tool": args.tool,
+        "runs": args.runs,
+        "latency_ms": args.latency_ms,
+        "connect_latency_ms": args.connect_latency_ms,
+        "think_ms": args.think_ms,
+        "snapshot": bool(args.snapshot),
+        "initialize_ms": median_ms("initialize"),
+        "first_response_ms": median_ms("first_response"),
+        "tool_call_ms": median_ms("tool_call")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_arguments(parser)
+    parser.add_argument("--server", default=str(SERVER_PATH),
+                        help="Server script to spawn (default: this checkout's openproject-mcp.py)")
+    parser.add_argument("--tool", default="list_types",
+                        help="Tool called first (default: list_types)")
+    parser.add_argument("--arguments", default="{}",
+                        help="JSON arguments of the first tool call (default: {})")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="Pause between the handshake and the first call (default: 0)")
+    parser.add_argument("--runs", type=int, default=7,
+                        help="Measured spawns (default: 7)")
+    parser.add_argument("--snapshot", help="Metadata cache snapshot file kept between runs (default: none)")
+    parser.add_argument("--port", type=int, default=8091,
+                        help="Port for the stub server (default: 8091)")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
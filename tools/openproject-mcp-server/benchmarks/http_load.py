@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Load test for sharing one server process between many MCP clients.
+
+Starts the stub OpenProject API and the MCP server, then connects many
+concurrent MCP clients that each run a mix of tool calls. With
+``--transport http`` all clients talk to one server process over Streamable
+HTTP. With ``--transport stdio`` every client spawns its own server process,
+which is how stdio-only deployments behave. Reports session setup time,
+tool call latency percentiles, throughput and the number of OpenProject API
+requests the server(s) made.
+
+Examples:
+    python benchmarks/http_load.py --clients 50
+    python benchmarks/http_load.py --clients 50 --transport stdio
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from benchmark import SERVER_PATH, percentile, run_stub  # noqa: E402
+from stub_server import add_arguments  # noqa: E402
+
+# Tool calls every client cycles through
+CALLS = [
+    ("list_types", lambda i: {}),
+    ("list_projects", lambda i: {}),
+    ("get_work_package_details", lambda i: {"work_package_id": i % 200 + 1}),
+    ("list_work_packages", lambda i: {"project_id": i % 20 + 1, "max_results": 50}),
+]
+
+_API_REQUESTS = re.compile(r"^openproject_mcp_http_requests_total\{[^}]*\} (\S+)$", re.MULTILINE)
+
+
+def server_environment(args: argparse.Namespace, stub_url: str) -> Dict[str, str]:
+    """Environment for the MCP server process(es)"""
+    return dict(
+        os.environ,
+        OPENPROJECT_URL=stub_url,
+        OPENPROJECT_API_KEY="load-test",
+        OPENPROJECT_TRANSPORT=args.transport,
+        OPENPROJECT_HTTP_PORT=str(args.server_port),
+        OPENPROJECT_HTTP_MAX_SESSIONS=str(max(args.clients * 2, 100)),
+        LOG_LEVEL="WARNING"
+    )
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    """Block until something listens on a local port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"Nothing listening on port {port}")
+
+
+def api_requests(prometheus_text: str) -> float:
+    """Total OpenProject API requests in a Prometheus exposition"""
+    return sum(float(value) for value in _API_REQUESTS.findall(prometheus_text))
+
+
+async def run_client(args: argparse.Namespace, index: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """Connect one MCP client, run its calls and collect timings"""
+    from mcp import ClientSession
+
+    if args.transport == "http":
+        from mcp.client.streamable_http import streamable_http_client
+        transport = streamable_http_client(f"http://127.0.0.1:{args.server_port}/mcp")
+    else:
+        from mcp.client.stdio import StdioServerParameters, stdio_client
+        transport = stdio_client(StdioServerParameters(
+            command=sys.executable, args=[str(SERVER_PATH)], env=env
+        ))
+
+    latencies: List[float] = []
+    errors = 0
+    requests = 0.0
+    started = time.perf_counter()
+    async with transport as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            setup = time.perf_counter() - started
+            for call in range(args.calls):
+                name, build_arguments = CALLS[(index + call) % len(CALLS)]
+                call_started = time.perf_counter()
+                result = await session.call_tool(name, build_arguments(index * args.calls + call))
+                latencies.append(time.perf_counter() - call_started)
+                if result.isError or result.content[0].text.startswith(("❌", "Error")):
+                    errors += 1
+            if args.transport == "stdio":
+                # Each client has its own server; count its API requests before it exits
+                stats = await session.call_tool("server_stats", {"format": "prometheus"})
+                requests = api_requests(stats.content[0].text)
+    return {"setup": setup, "latencies": latencies, "errors": errors, "api_requests": requests}
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start the stub and server, run all clients concurrently and summarize"""
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    stub = context.Process(target=run_stub, args=(args, args.port, ready), daemon=True)
+    stub.start()
+    server = None
+    try:
+        if not await asyncio.to_thread(ready.wait, 30):
+            raise RuntimeError("Stub OpenProject server did not start")
+        env = server_environment(args, f"http://127.0.0.1:{args.port}")
+        if args.transport == "http":
+            server = await asyncio.create_subprocess_exec(sys.executable, str(SERVER_PATH), env=env)
+            await asyncio.to_thread(wait_for_port, args.server_port)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_client(args, index, env) for index in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+        total_requests = sum(result["api_requests"] for result in results)
+        if args.transport == "http":
+            from mcp import ClientSession
+            from mcp.client.streamable_http import streamable_http_client
+
+            async with streamable_http_client(f"http://127.0.0.1:{args.server_port}/mcp") as streams:
+                async with ClientSession(streams[0], streams[1]) as session:
+                    await session.initialize()
+                    stats = await session.call_tool("server_stats", {"format": "prometheus"})
+                    total_requests = api_requests(stats.content[0].text)
+    finally:
+        if server:
+            server.terminate()
+            await server.wait()
+        stub.terminate()
+        stub.join()
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    setups = sorted(result["setup"] for result in results)
+    calls = len(latencies)
+    return {
+        "transport": args.transport,
+        "clients": args.clients,
+        "calls_per_client": args.calls,
+        "session_concurrency": os.getenv("OPENPROJECT_SESSION_CONCURRENCY", "4"),
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(calls / elapsed, 1),
+        "errors": sum(result["errors"] for result in results),
+        "session_setup_ms": {
+            "p50": round(percentile(setups, 0.50) * 1000, 1),
+            "max": round(setups[-1] * 1000, 1)
+        },
+        "call_latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99": round(percentile(latencies, 0.99) * 1000, 1)
+        },
+        "api_requests": int(total_requests),
+        "api_requests_per_call": round(total_requests / calls, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_arguments(parser)
+    parser.add_argument("--transport", choices=["http", "stdio"], default="http",
+                        help="One shared HTTP server, or one stdio server per client (default: http)")
+    parser.add_argument("--clients", type=int, default=50,
+                        help="Concurrent MCP clients (default: 50)")
+    parser.add_argument("--calls", type=int, default=20,
+                        help="Tool calls per client (default: 20)")
+    parser.add_argument("--port", type=int, default=8091,
+                        help="Port for the stub server (default: 8091)")
+    parser.add_argument("--server-port", type=int, default=8092,
+                        help="Port for the MCP server in HTTP mode (default: 8092)")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,822 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenProject API v3, used by the tests and the benchmark suite.
+
+Serves a synthetic dataset of projects and work packages with configurable
+size, response latency and page size limit. It implements the parts of the
+API the MCP server talks to: collections with offset pagination, filters,
+sortBy, sparse fieldsets (select), groupBy with showSums, ETags on metadata resources, work
+package relations, activities, watchers and attachments, users, the work
+package form, work package creation and updates with lock versions, and
+attachment uploads, downloads and deletion of uploads. Downloaded content is generated on the fly;
+uploaded files are hashed and discarded.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Any
+
+from aiohttp import web
+
+API = "/api/v3"
+
+STATUSES = [
+    (1, "New", False),
+    (2, "In progress", False),
+    (3, "On hold", False),
+    (4, "Closed", True)
+]
+TYPES = [
+    (1, "Task", True, False),
+    (2, "Milestone", False, True),
+    (3, "Bug", False, False),
+    (4, "Feature", False, False)
+]
+PRIORITIES = [(7, "Low"), (8, "Normal"), (9, "High"), (10, "Immediate")]
+USERS = 25
+
+# Links a real work package resource carries besides the ones the server reads
+EXTRA_LINKS = (
+    "author", "responsible", "category", "version", "parent", "children",
+    "ancestors", "watchers", "relations", "revisions", "attachments",
+    "activities", "addComment", "update", "updateImmediately", "delete",
+    "logTime", "move", "copy", "pdf", "atom", "schema", "timeEntries"
+)
+
+# Attachment whose size is set by --attachment-mb; synthetic attachment IDs start at 4
+LARGE_ATTACHMENT_ID = 1
+CONTENT_BLOCK = 1024 * 1024
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DESCRIPTION = "Synthetic work package used for benchmarking the MCP server. " * 8
+
+
+def _timestamp(moment: datetime) -> str:
+    """Format a timestamp the way OpenProject does"""
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+class StubOpenProject:
+    """Synthetic OpenProject instance served by aiohttp"""
+
+    def __init__(
+        self,
+        work_packages: int = 10000,
+        projects: int = 20,
+        latency: float = 0.0,
+        max_page_size: int = 1000,
+        grouping: bool = True,
+        conflict_every: int = 0,
+        connect_latency: float = 0.0,
+        large_attachment: int = 64 * 1024 * 1024
+    ):
+        """
+        Initialize the stub.
+
+        Args:
+            work_packages: Number of work packages in the dataset
+            projects: Number of projects the work packages are spread over
+            latency: Seconds every API response is delayed by
+            max_page_size: Largest page size a collection request may return
+            grouping: Answer groupBy queries; when False the parameter is
+                ignored like on instances without grouped collections
+            conflict_every: Simulate a concurrent edit before every Nth
+                update so it fails with 409; 0 disables conflicts
+            connect_latency: Extra seconds the first response on a new
+                connection is delayed by, standing in for DNS, TCP and TLS setup
+            large_attachment: Size in bytes of attachment LARGE_ATTACHMENT_ID
+        """
+        self.work_package_count = work_packages
+        self.project_count = projects
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.grouping = grouping
+        self.conflict_every = conflict_every
+        self.connect_latency = connect_latency
+        self.large_attachment = large_attachment
+        self._digests: Dict[int, str] = {}
+        self._uploads: Dict[int, Dict[str, Any]] = {}
+        self._next_attachment_id = itertools.count(10_000_000)
+        self._connections: set = set()
+        self._updates = 0
+        self._edits: Dict[int, Dict[str, Any]] = {}
+        self.requests: Dict[str, int] = {}
+        self._created: Dict[int, Dict] = {}
+        self._next_id = itertools.count(work_packages + 1)
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    # Dataset
+
+    def _attributes(self, wp_id: int) -> Dict[str, Any]:
+        """Derive the filterable attributes of a work package from its ID"""
+        return {
+            "project": wp_id % self.project_count + 1,
+            "status": STATUSES[wp_id % len(STATUSES)],
+            "type": TYPES[wp_id % len(TYPES)],
+            "priority": PRIORITIES[wp_id % len(PRIORITIES)],
+            "assignee": wp_id % (USERS + 1) or None,
+            "subject": f"Work package {wp_id}",
+            "estimatedTime": f"PT{wp_id % 9}H" if wp_id % 9 else None,
+            "remainingTime": f"PT{wp_id % 5}H30M" if wp_id % 9 else None,
+            "updatedAt": _timestamp(EPOCH + timedelta(minutes=wp_id))
+        }
+
+    def work_package(self, wp_id: int) -> Dict[str, Any]:
+        """Build the full HAL representation of a work package, with any edits applied"""
+        if wp_id in self._created:
+            work_package = self._created[wp_id]
+        else:
+            work_package = self._generated_work_package(wp_id)
+        edits = self._edits.get(wp_id)
+        if edits:
+            work_package = dict(work_package, **{key: value for key, value in edits.items() if key != "_links"})
+            work_package["_links"] = dict(work_package["_links"], **edits.get("_links", {}))
+            # Drop embedded resources whose link was changed rather than rebuilding them
+            work_package["_embedded"] = {
+                key: value for key, value in work_package.get("_embedded", {}).items()
+                if key not in edits.get("_links", {})
+            }
+        return work_package
+
+    def _generated_work_package(self, wp_id: int) -> Dict[str, Any]:
+        """Build a work package of the synthetic dataset"""
+        attrs = self._attributes(wp_id)
+        status_id, status_name, is_closed = attrs["status"]
+        type_id, type_name, _, is_milestone = attrs["type"]
+        priority_id, priority_name = attrs["priority"]
+        project_id = attrs["project"]
+        assignee = attrs["assignee"]
+        links = {
+            "self": {"href": f"{API}/work_packages/{wp_id}", "title": attrs["subject"]},
+            "project": {"href": f"{API}/projects/{project_id}", "title": f"Project {project_id}"},
+            "status": {"href": f"{API}/statuses/{status_id}", "title": status_name},
+            "type": {"href": f"{API}/types/{type_id}", "title": type_name},
+            "priority": {"href": f"{API}/priorities/{priority_id}", "title": priority_name},
+            "assignee": (
+                {"href": f"{API}/users/{assignee}", "title": f"User {assignee}"}
+                if assignee else {"href": None}
+            )
+        }
+        for relation in EXTRA_LINKS:
+            links[relation] = {"href": f"{API}/work_packages/{wp_id}/{relation}"}
+        return {
+            "_type": "WorkPackage",
+            "id": wp_id,
+            "lockVersion": 0,
+            "subject": attrs["subject"],
+            "description": {
+                "format": "markdown",
+                "raw": DESCRIPTION,
+                "html": f"<p>{DESCRIPTION}</p>"
+            },
+            "scheduleManually": False,
+            "startDate": None,
+            "dueDate": None,
+            "estimatedTime": attrs["estimatedTime"],
+            "remainingTime": attrs["remainingTime"],
+            "spentTime": "PT0S",
+            "percentageDone": wp_id % 101,
+            "createdAt": attrs["updatedAt"],
+            "updatedAt": attrs["updatedAt"],
+            "_embedded": {
+                "type": {
+                    "_type": "Type", "id": type_id, "name": type_name,
+                    "isMilestone": is_milestone, "_links": {"self": links["type"]}
+                },
+                "status": {
+                    "_type": "Status", "id": status_id, "name": status_name,
+                    "isClosed": is_closed, "_links": {"self": links["status"]}
+                },
+                "project": self.project(project_id)
+            },
+            "_links": links
+        }
+
+    def project(self, project_id: int) -> Dict[str, Any]:
+        """Build the HAL representation of a project"""
+        return {
+            "_type": "Project",
+            "id": project_id,
+            "identifier": f"project-{project_id}",
+            "name": f"Project {project_id}",
+            "active": project_id % 7 != 0,
+            "public": project_id % 2 == 0,
+            "description": {"format": "markdown", "raw": f"Benchmark project {project_id}"},
+            "_links": {"self": {"href": f"{API}/projects/{project_id}"}}
+        }
+
+    # Collection helpers
+
+    @staticmethod
+    def _select(element: Dict[str, Any], select: Optional[str]) -> Dict[str, Any]:
+        """Apply a sparse fieldset to a collection element"""
+        if not select:
+            return element
+        fields = [
+            field.split("/", 1)[1]
+            for field in select.split(",")
+            if field.startswith("elements/")
+        ]
+        selected = {field: element[field] for field in fields if field in element}
+        selected["_links"] = {
+            field: element["_links"][field]
+            for field in fields
+            if field in element["_links"]
+        }
+        return selected
+
+    def _matches(self, wp_id: int, filters: List[Dict], project_id: Optional[int]) -> bool:
+        """Evaluate OpenProject filters against a work package"""
+        attrs = self._attributes(wp_id)
+        edits = self._edits.get(wp_id)
+        if edits:
+            attrs.update((key, edits[key]) for key in ("subject", "updatedAt") if key in edits)
+        if project_id is not None and attrs["project"] != project_id:
+            return False
+        for condition in filters:
+            for field, spec in condition.items():
+                operator = spec.get("operator")
+                values = spec.get("values") or []
+                if field == "status":
+                    is_closed = attrs["status"][2]
+                    if operator == "o" and is_closed or operator == "c" and not is_closed:
+                        return False
+                    if operator == "=" and str(attrs["status"][0]) not in values:
+                        return False
+                elif field in ("type", "priority") and operator == "=":
+                    if str(attrs[field][0]) not in values:
+                        return False
+                elif field == "assignee" and operator == "=":
+                    if str(attrs["assignee"]) not in values:
+                        return False
+                elif field == "id" and operator == "=":
+                    if str(wp_id) not in values:
+                        return False
+                elif field == "subject" and operator == "~":
+                    if values[0].lower() not in attrs["subject"].lower():
+                        return False
+                elif field == "updatedAt" and operator == "<>d":
+                    low, high = (values + ["", ""])[:2]
+                    if low and attrs["updatedAt"] < low or high and attrs["updatedAt"] > high:
+                        return False
+        return True
+
+    def _page(self, request: web.Request, elements: List[Any], build) -> Dict[str, Any]:
+        """Slice a collection according to offset and pageSize"""
+        page_size = min(int(request.query.get("pageSize", 20)), self.max_page_size)
+        offset = max(int(request.query.get("offset", 1)), 1)
+        start = (offset - 1) * page_size
+        select = request.query.get("select")
+        page = [self._select(build(item), select) for item in elements[start:start + page_size]]
+        return {
+            "_type": "Collection",
+            "total": len(elements),
+            "count": len(page),
+            "pageSize": page_size,
+            "offset": offset,
+            "_embedded": {"elements": page}
+        }
+
+    async def _delay(self, request: web.Request) -> None:
+        """Count a request and apply the simulated connect and response latency"""
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "?"
+        key = f"{request.method} {route}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+        if self.connect_latency and id(request.transport) not in self._connections:
+            self._connections.add(id(request.transport))
+            await asyncio.sleep(self.connect_latency)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _respond(self, request: web.Request, body: Dict[str, Any], status: int = 200) -> web.Response:
+        """Delay, count and serialize a response, honouring If-None-Match"""
+        await self._delay(request)
+        text = json.dumps(body)
+        headers = {}
+        if request.method == "GET" and status == 200:
+            etag = '"' + hashlib.md5(text.encode()).hexdigest() + '"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers=headers)
+        return web.Response(
+            text=text,
+            status=status,
+            content_type="application/hal+json",
+            headers=headers
+        )
+
+    # Handlers
+
+    async def root(self, request: web.Request) -> web.Response:
+        return await self._respond(request, {
+            "_type": "Root",
+            "instanceName": "OpenProject benchmark stub",
+            "coreVersion": "stub"
+        })
+
+    async def projects(self, request: web.Request) -> web.Response:
+        ids = list(range(1, self.project_count + 1))
+        return await self._respond(request, self._page(request, ids, self.project))
+
+    async def work_packages(self, request: web.Request) -> web.Response:
+        project_id = request.match_info.get("project_id")
+        project_id = int(project_id) if project_id else None
+        filters = json.loads(request.query.get("filters", '[{"status":{"operator":"o","values":[]}}]'))
+        ids = list(range(1, self.work_package_count + 1)) + list(self._created)
+        for condition in filters:
+            if condition.get("id", {}).get("operator") == "=":
+                wanted = {int(value) for value in condition["id"]["values"]}
+                ids = [wp_id for wp_id in ids if wp_id in wanted]
+        if filters or project_id is not None:
+            ids = [wp_id for wp_id in ids if self._matches(wp_id, filters, project_id)]
+        sort_by = json.loads(request.query.get("sortBy", "[]"))
+        if sort_by and sort_by[0] == ["id", "desc"]:
+            ids.reverse()
+        elif sort_by and sort_by[0][0] == "updatedAt":
+            ids.sort(key=self._updated_at, reverse=sort_by[0][1] == "desc")
+        body = self._page(request, ids, self.work_package)
+        group_by = request.query.get("groupBy")
+        if group_by and self.grouping:
+            show_sums = request.query.get("showSums") == "true"
+            body["groups"] = self._groups(ids, group_by, show_sums)
+            if show_sums:
+                body["totalSums"] = self._sums(ids)
+        return await self._respond(request, body)
+
+    def _sums(self, ids: List[int]) -> Dict[str, str]:
+        """Sum the duration attributes of the given work packages as ISO 8601 durations"""
+        sums = {}
+        for field in ("estimatedTime", "remainingTime"):
+            minutes = 0
+            for wp_id in ids:
+                value = self._attributes(wp_id)[field]
+                if value:
+                    hours, _, rest = value[2:].partition("H")
+                    minutes += int(hours) * 60 + int(rest.rstrip("M") or 0)
+            sums[field] = f"PT{minutes // 60}H{minutes % 60}M" if minutes % 60 else f"PT{minutes // 60}H"
+        return sums
+
+    def _group_key(self, wp_id: int, group_by: str) -> Tuple[Optional[str], Optional[str]]:
+        """The (href, title) a work package is grouped under"""
+        attrs = self._attributes(wp_id)
+        collections = {"status": "statuses", "type": "types", "priority": "priorities"}
+        if group_by in collections:
+            return f"{API}/{collections[group_by]}/{attrs[group_by][0]}", attrs[group_by][1]
+        if group_by == "project":
+            return f"{API}/projects/{attrs['project']}", f"Project {attrs['project']}"
+        if group_by == "assignee" and attrs["assignee"]:
+            return f"{API}/users/{attrs['assignee']}", f"User {attrs['assignee']}"
+        return None, None
+
+    def _groups(self, ids: List[int], group_by: str, show_sums: bool) -> List[Dict[str, Any]]:
+        """Group work packages by an attribute the way OpenProject's grouped queries do"""
+        buckets: Dict[Any, List[int]] = {}
+        for wp_id in ids:
+            buckets.setdefault(self._group_key(wp_id, group_by), []).append(wp_id)
+        groups = []
+        for (href, title), members in buckets.items():
+            group = {
+                "_type": "GroupBy",
+                "value": title,
+                "count": len(members),
+                "_links": {"valueLink": [{"href": href}] if href else []}
+            }
+            if show_sums:
+                group["sums"] = self._sums(members)
+            groups.append(group)
+        return groups
+
+    def _updated_at(self, wp_id: int) -> str:
+        """Last update time of a work package, including edits"""
+        edits = self._edits.get(wp_id)
+        if edits and "updatedAt" in edits:
+            return edits["updatedAt"]
+        return self._attributes(wp_id)["updatedAt"]
+
+    def _relations_of(self, wp_id: int) -> List[Dict[str, Any]]:
+        """Every work package relates to its successor and follows the one ten before it"""
+        relations = []
+        for source, target, kind, reverse in (
+            (wp_id, wp_id + 1, "relates", "relates"),
+            (wp_id - 10, wp_id, "precedes", "follows")
+        ):
+            if 1 <= source and target <= self.work_package_count:
+                relations.append({
+                    "_type": "Relation",
+                    "id": source * 2 + (kind == "precedes"),
+                    "name": kind,
+                    "type": kind,
+                    "reverseType": reverse,
+                    "_links": {
+                        "self": {"href": f"{API}/relations/{source * 2 + (kind == 'precedes')}"},
+                        "from": {"href": f"{API}/work_packages/{source}", "title": f"Work package {source}"},
+                        "to": {"href": f"{API}/work_packages/{target}", "title": f"Work package {target}"}
+                    }
+                })
+        return relations
+
+    async def relations(self, request: web.Request) -> web.Response:
+        filters = json.loads(request.query.get("filters", "[]"))
+        involved = []
+        for condition in filters:
+            if "involved" in condition:
+                involved = [int(value) for value in condition["involved"]["values"]]
+        seen = {}
+        for wp_id in involved:
+            for relation in self._relations_of(wp_id):
+                seen[relation["id"]] = relation
+        elements = sorted(seen.values(), key=lambda relation: relation["id"])
+        return await self._respond(request, self._page(request, elements, lambda relation: relation))
+
+    async def work_package_detail(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        if not 1 <= wp_id <= self.work_package_count and wp_id not in self._created:
+            return await self._respond(request, {"_type": "Error", "message": "Not found"}, status=404)
+        return await self._respond(request, self.work_package(wp_id))
+
+    async def activities(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        elements = [
+            {
+                "_type": "Activity::Comment",
+                "id": wp_id * 10 + version,
+                "version": version,
+                "createdAt": _timestamp(EPOCH + timedelta(minutes=wp_id, seconds=version)),
+                "comment": {"format": "markdown", "raw": f"Comment {version} on work package {wp_id}"},
+                "details": [{"format": "custom", "raw": "Status changed from New to In progress"}] if version == 2 else [],
+                "_links": {
+                    "self": {"href": f"{API}/activities/{wp_id * 10 + version}"},
+                    "workPackage": {"href": f"{API}/work_packages/{wp_id}"},
+                    # Activity user links carry no title, like OpenProject's
+                    "user": {"href": f"{API}/users/{(wp_id + version) % USERS + 1}"}
+                }
+            }
+            for version in range(1, 4)
+        ]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    async def watchers(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        elements = [self.user(user_id) for user_id in sorted({wp_id % USERS + 1, (wp_id * 7) % USERS + 1})]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    async def attachments(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        elements = [
+            {
+                "_type": "Attachment",
+                "id": wp_id * 4 + index,
+                "fileName": f"attachment-{wp_id}-{index}.pdf",
+                "fileSize": 1024 * (wp_id % 97 + index),
+                "contentType": "application/pdf",
+                "_links": {
+                    "self": {"href": f"{API}/attachments/{wp_id * 4 + index}"},
+                    "downloadLocation": {"href": f"{API}/attachments/{wp_id * 4 + index}/content"}
+                }
+            }
+            for index in range(wp_id % 3)
+        ]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    def _attachment_size(self, attachment_id: int) -> Optional[int]:
+        """Size of a generated attachment, or None if there is no such attachment"""
+        if attachment_id == LARGE_ATTACHMENT_ID:
+            return self.large_attachment
+        wp_id, index = divmod(attachment_id, 4)
+        if 1 <= wp_id <= self.work_package_count and index < wp_id % 3:
+            return 1024 * (wp_id % 97 + index)
+        return None
+
+    @staticmethod
+    def _content_block(attachment_id: int) -> bytes:
+        """Pseudo-random block the content of a generated attachment repeats"""
+        seed = attachment_id.to_bytes(8, "big")
+        return b"".join(
+            hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
+            for counter in range(CONTENT_BLOCK // 32)
+        )
+
+    def _content(self, attachment_id: int, size: int):
+        """Yield the content of a generated attachment block by block"""
+        block = self._content_block(attachment_id)
+        for offset in range(0, size, CONTENT_BLOCK):
+            yield block[:min(CONTENT_BLOCK, size - offset)]
+
+    def _attachment(self, attachment_id: int, size: int, file_name: str, md5: str,
+                    content_type: str = "application/pdf") -> Dict[str, Any]:
+        """Build the HAL representation of an attachment"""
+        return {
+            "_type": "Attachment",
+            "id": attachment_id,
+            "fileName": file_name,
+            "fileSize": size,
+            "contentType": content_type,
+            "digest": {"_type": "Digest", "algorithm": "md5", "hash": md5},
+            "_links": {
+                "self": {"href": f"{API}/attachments/{attachment_id}"},
+                "downloadLocation": {"href": f"{API}/attachments/{attachment_id}/content"}
+            }
+        }
+
+    async def attachment_detail(self, request: web.Request) -> web.Response:
+        attachment_id = int(request.match_info["attachment_id"])
+        if attachment_id in self._uploads:
+            return await self._respond(request, self._uploads[attachment_id])
+        size = self._attachment_size(attachment_id)
+        if size is None:
+            return await self._respond(request, {"_type": "Error", "message": "Not found"}, status=404)
+        if attachment_id not in self._digests:
+            md5 = hashlib.md5()
+            for block in self._content(attachment_id, size):
+                md5.update(block)
+            self._digests[attachment_id] = md5.hexdigest()
+        wp_id, index = divmod(attachment_id, 4)
+        file_name = "large.bin" if attachment_id == LARGE_ATTACHMENT_ID else f"attachment-{wp_id}-{index}.pdf"
+        return await self._respond(
+            request, self._attachment(attachment_id, size, file_name, self._digests[attachment_id])
+        )
+
+    async def attachment_content(self, request: web.Request) -> web.StreamResponse:
+        attachment_id = int(request.match_info["attachment_id"])
+        size = self._attachment_size(attachment_id)
+        if size is None:
+            return await self._respond(request, {"_type": "Error", "message": "Not found"}, status=404)
+        await self._delay(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        response.content_length = size
+        await response.prepare(request)
+        for block in self._content(attachment_id, size):
+            await response.write(block)
+        await response.write_eof()
+        return response
+
+    async def upload(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        reader = await request.multipart()
+        metadata: Dict[str, Any] = {}
+        md5 = hashlib.md5()
+        size = 0
+        content_type = "application/octet-stream"
+        while True:
+            part = await reader.next()
+            if part is None:
+                break
+            if part.name == "metadata":
+                metadata = await part.json() or {}
+            elif part.name == "file":
+                content_type = part.headers.get("Content-Type", content_type)
+                metadata.setdefault("fileName", part.filename)
+                while True:
+                    chunk = await part.read_chunk(CONTENT_BLOCK)
+                    if not chunk:
+                        break
+                    md5.update(chunk)
+                    size += len(chunk)
+        if not metadata.get("fileName"):
+            return await self._respond(request, {
+                "_type": "Error",
+                "errorIdentifier": "urn:openproject-org:api:v3:errors:InvalidRequestBody",
+                "message": "The request body did not contain a file."
+            }, status=400)
+        attachment_id = next(self._next_attachment_id)
+        attachment = self._attachment(attachment_id, size, metadata["fileName"], md5.hexdigest(), content_type)
+        attachment["_links"]["container"] = {"href": f"{API}/work_packages/{wp_id}"}
+        # Content is not kept; only the metadata stays readable
+        attachment["_links"].pop("downloadLocation")
+        self._uploads[attachment_id] = attachment
+        return await self._respond(request, attachment, status=201)
+
+    async def delete_attachment(self, request: web.Request) -> web.Response:
+        attachment_id = int(request.match_info["attachment_id"])
+        if self._uploads.pop(attachment_id, None) is None:
+            return await self._respond(request, {"_type": "Error", "message": "Not found"}, status=404)
+        await self._delay(request)
+        return web.Response(status=204)
+
+    def user(self, user_id: int) -> Dict[str, Any]:
+        """Build the HAL representation of a user"""
+        return {
+            "_type": "User",
+            "id": user_id,
+            "name": f"User {user_id}",
+            "login": f"user{user_id}",
+            "_links": {"self": {"href": f"{API}/users/{user_id}", "title": f"User {user_id}"}}
+        }
+
+    async def user_detail(self, request: web.Request) -> web.Response:
+        return await self._respond(request, self.user(int(request.match_info["user_id"])))
+
+    async def types(self, request: web.Request) -> web.Response:
+        elements = [
+            {
+                "_type": "Type", "id": type_id, "name": name, "color": "#1A67A3",
+                "position": type_id, "isDefault": is_default, "isMilestone": is_milestone,
+                "_links": {"self": {"href": f"{API}/types/{type_id}", "title": name}}
+            }
+            for type_id, name, is_default, is_milestone in TYPES
+        ]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    async def statuses(self, request: web.Request) -> web.Response:
+        elements = [
+            {"_type": "Status", "id": status_id, "name": name, "isClosed": is_closed}
+            for status_id, name, is_closed in STATUSES
+        ]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    async def priorities(self, request: web.Request) -> web.Response:
+        elements = [
+            {"_type": "Priority", "id": priority_id, "name": name}
+            for priority_id, name in PRIORITIES
+        ]
+        return await self._respond(request, {
+            "_type": "Collection", "total": len(elements), "count": len(elements),
+            "_embedded": {"elements": elements}
+        })
+
+    async def form(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        payload.setdefault("_links", {})
+        payload["_links"].setdefault("status", {"href": f"{API}/statuses/1"})
+        payload["_links"].setdefault("priority", {"href": f"{API}/priorities/8"})
+        payload.setdefault("subject", None)
+        payload["lockVersion"] = 0
+        return await self._respond(request, {
+            "_type": "Form",
+            "_embedded": {"payload": payload, "validationErrors": {}},
+            "payload": payload
+        })
+
+    async def create(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if not payload.get("subject"):
+            return await self._respond(request, {
+                "_type": "Error",
+                "errorIdentifier": "urn:openproject-org:api:v3:errors:PropertyConstraintViolation",
+                "message": "Subject can't be blank."
+            }, status=422)
+        wp_id = next(self._next_id)
+        work_package = self.work_package(1)
+        work_package = dict(work_package, id=wp_id, subject=payload["subject"])
+        self._created[wp_id] = work_package
+        return await self._respond(request, work_package, status=201)
+
+    @staticmethod
+    def _link_title(href: Optional[str]) -> Optional[str]:
+        """Title of the resource a link points to"""
+        if not href:
+            return None
+        collection, _, resource_id = href.rpartition("/")
+        names = {
+            f"{API}/statuses": {status_id: name for status_id, name, _ in STATUSES},
+            f"{API}/types": {type_id: name for type_id, name, _, _ in TYPES},
+            f"{API}/priorities": dict(PRIORITIES)
+        }
+        if collection == f"{API}/users":
+            return f"User {resource_id}"
+        return names.get(collection, {}).get(int(resource_id))
+
+    async def update(self, request: web.Request) -> web.Response:
+        wp_id = int(request.match_info["wp_id"])
+        if not 1 <= wp_id <= self.work_package_count and wp_id not in self._created:
+            return await self._respond(request, {"_type": "Error", "message": "Not found"}, status=404)
+        payload = await request.json()
+        edits = self._edits.setdefault(wp_id, {"lockVersion": 0})
+        self._updates += 1
+        if self.conflict_every and self._updates % self.conflict_every == 0:
+            edits["lockVersion"] += 1
+        if payload.get("lockVersion") != edits["lockVersion"]:
+            return await self._respond(request, {
+                "_type": "Error",
+                "errorIdentifier": "urn:openproject-org:api:v3:errors:UpdateConflict",
+                "message": "Your changes could not be saved, because the resource was changed in the meantime."
+            }, status=409)
+        for key, value in payload.items():
+            if key == "_links":
+                for link, target in value.items():
+                    href = target.get("href")
+                    edits.setdefault("_links", {})[link] = {"href": href, "title": self._link_title(href)}
+            elif key != "lockVersion":
+                edits[key] = value
+        edits["lockVersion"] += 1
+        edits["updatedAt"] = _timestamp(datetime.now(timezone.utc).replace(microsecond=0))
+        return await self._respond(request, self.work_package(wp_id))
+
+    # Lifecycle
+
+    def build_app(self) -> web.Application:
+        """Create the aiohttp application"""
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_get(API, self.root)
+        app.router.add_get(f"{API}/", self.root)
+        app.router.add_get(f"{API}/projects", self.projects)
+        app.router.add_get(f"{API}/projects/{{project_id}}/work_packages", self.work_packages)
+        app.router.add_get(f"{API}/projects/{{project_id}}/types", self.types)
+        app.router.add_get(f"{API}/work_packages", self.work_packages)
+        app.router.add_get(f"{API}/work_packages/{{wp_id:\\d+}}", self.work_package_detail)
+        app.router.add_patch(f"{API}/work_packages/{{wp_id:\\d+}}", self.update)
+        app.router.add_get(f"{API}/work_packages/{{wp_id:\\d+}}/activities", self.activities)
+        app.router.add_get(f"{API}/work_packages/{{wp_id:\\d+}}/watchers", self.watchers)
+        app.router.add_get(f"{API}/work_packages/{{wp_id:\\d+}}/attachments", self.attachments)
+        app.router.add_post(f"{API}/work_packages/{{wp_id:\\d+}}/attachments", self.upload)
+        app.router.add_get(f"{API}/attachments/{{attachment_id:\\d+}}", self.attachment_detail)
+        app.router.add_delete(f"{API}/attachments/{{attachment_id:\\d+}}", self.delete_attachment)
+        app.router.add_get(f"{API}/attachments/{{attachment_id:\\d+}}/content", self.attachment_content)
+        app.router.add_get(f"{API}/relations", self.relations)
+        app.router.add_get(f"{API}/users/{{user_id:\\d+}}", self.user_detail)
+        app.router.add_post(f"{API}/work_packages/form", self.form)
+        app.router.add_post(f"{API}/work_packages", self.create)
+        app.router.add_get(f"{API}/types", self.types)
+        app.router.add_get(f"{API}/statuses", self.statuses)
+        app.router.add_get(f"{API}/priorities", self.priorities)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving in the running event loop.
+
+        Args:
+            host: Address to bind to
+            port: Port to bind to, 0 picks a free one
+
+        Returns:
+            str: Base URL of the stub instance
+        """
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self):
+        """Stop serving"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the dataset options shared with the benchmark runner"""
+    parser.add_argument("--work-packages", type=int, default=10000,
+                        help="Work packages in the synthetic dataset (default: 10000)")
+    parser.add_argument("--projects", type=int, default=20,
+                        help="Projects in the synthetic dataset (default: 20)")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Simulated API latency per response in milliseconds (default: 20)")
+    parser.add_argument("--max-page-size", type=int, default=1000,
+                        help="Largest page the stub returns (default: 1000)")
+    parser.add_argument("--no-grouping", action="store_true",
+                        help="Ignore groupBy like instances without grouped queries")
+    parser.add_argument("--conflict-every", type=int, default=0,
+                        help="Make every Nth work package update fail with 409 (default: never)")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0,
+                        help="Extra delay of the first response on each new connection (default: 0)")
+    parser.add_argument("--attachment-mb", type=float, default=64.0,
+                        help=f"Size of attachment {LARGE_ATTACHMENT_ID} in MiB (default: 64)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    stub = StubOpenProject(
+        work_packages=args.work_packages,
+        projects=args.projects,
+        latency=args.latency_ms / 1000,
+        max_page_size=args.max_page_size,
+        grouping=not args.no_grouping,
+        conflict_every=args.conflict_every,
+        connect_latency=args.connect_latency_ms / 1000,
+        large_attachment=int(args.attachment_mb * 1024 * 1024)
+    )
+    print(f"Serving {args.work_packages} work packages on http://{args.host}:{args.port}")
+    web.run_app(stub.build_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
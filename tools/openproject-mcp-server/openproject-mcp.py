@@ -8,22 +8,79 @@ standardized interface.
 """
 
 import os
+import re
+import copy
 import json
+import time
+import random
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import mimetypes
+import tempfile
+import importlib
+import weakref
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple, Callable, Iterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import asyncio
-import aiohttp
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
 import base64
 import ssl
 from dotenv import load_dotenv
 
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.types import (
     Tool,
     TextContent,
+    Resource,
+    ResourceTemplate,
+    SubscribeRequest,
 )
+from pydantic import AnyUrl
+
+# Optional faster JSON backend and incremental parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class _LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+    
+    Keeps heavy imports off the startup path of a freshly spawned server;
+    ``OpenProjectMCPServer`` loads them in the background while the MCP
+    handshake runs.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def load(self) -> Any:
+        """Import the module (once) and return it"""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+
+# Only needed once the first request is sent or the mirror is opened
+aiohttp = _LazyModule("aiohttp")
+sqlite3 = _LazyModule("sqlite3")
 
 # Load environment variables
 load_dotenv()
@@ -41,10 +98,1090 @@ __author__ = "Your Name"
 __license__ = "MIT"
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back on bad values"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid integer for {name}: {value!r}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back on bad values"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid number for {name}: {value!r}")
+        return default
+
+
+# (connect, read) timeouts for the API requests of the running tool call, set by ToolLimiter
+_request_timeouts: "contextvars.ContextVar[Optional[Tuple[Optional[float], Optional[float]]]]" = (
+    contextvars.ContextVar("request_timeouts", default=None)
+)
+
+# Set inside the prefetch scheduler's tasks, whose cache lookups are not counted as hits or misses
+_prefetching: "contextvars.ContextVar[bool]" = contextvars.ContextVar("prefetching", default=False)
+
+# Callbacks run when the MCP session whose requests registered them ends, set by _MCPServer.run
+_session_closers: "contextvars.ContextVar[Optional[List[Callable[[], None]]]]" = (
+    contextvars.ContextVar("session_closers", default=None)
+)
+
+
+def _select_json_backend() -> Tuple[str, Callable[[bytes], Any], Callable[[Any], bytes]]:
+    """
+    Pick the JSON implementation used for API bodies.
+    
+    OPENPROJECT_JSON_BACKEND is "auto" (orjson when installed), "orjson" or
+    "json". Both backends parse straight from the response bytes.
+    
+    Returns:
+        Tuple[str, Callable, Callable]: Backend name, loads and dumps functions
+    """
+    backend = os.getenv("OPENPROJECT_JSON_BACKEND", "auto").lower()
+    if backend not in ("auto", "orjson", "json"):
+        logger.warning(f"Ignoring unknown OPENPROJECT_JSON_BACKEND: {backend!r}")
+        backend = "auto"
+    if backend == "orjson" and orjson is None:
+        logger.warning("OPENPROJECT_JSON_BACKEND=orjson but orjson is not installed, using json")
+    if backend != "json" and orjson is not None:
+        return "orjson", orjson.loads, orjson.dumps
+    return "json", json.loads, lambda value: json.dumps(value).encode()
+
+
+JSON_BACKEND, _json_loads, _json_dumps = _select_json_backend()
+
+
+class OpenProjectAPIError(Exception):
+    """An OpenProject API request failed"""
+    
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
+        """
+        Initialize the error.
+        
+        Args:
+            message: Human readable error message
+            status: HTTP status code, or None for network errors
+            retry_after: Seconds the server asked us to wait, if any
+        """
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(OpenProjectAPIError):
+    """The circuit breaker is open and the request was not sent"""
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient API failures"""
+    
+    RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    # POSTs to these endpoints only validate input and never change state
+    SAFE_POST_ENDPOINTS = ("/work_packages/form",)
+    
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        retry_after_max: float = 60.0
+    ):
+        """
+        Initialize the retry policy.
+        
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base: Backoff ceiling for the first retry in seconds
+            backoff_max: Upper bound for the backoff ceiling in seconds
+            retry_after_max: Longest Retry-After delay that is honoured
+        """
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+    
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a retry policy from OPENPROJECT_RETRY_* environment variables"""
+        return cls(
+            max_retries=_env_int("OPENPROJECT_RETRY_MAX", 3),
+            backoff_base=_env_float("OPENPROJECT_RETRY_BACKOFF_BASE", 0.5),
+            backoff_max=_env_float("OPENPROJECT_RETRY_BACKOFF_MAX", 10.0),
+            retry_after_max=_env_float("OPENPROJECT_RETRY_AFTER_MAX", 60.0)
+        )
+    
+    def is_retryable_request(self, method: str, endpoint: str) -> bool:
+        """Whether repeating the request cannot duplicate a side effect"""
+        if method in self.IDEMPOTENT_METHODS:
+            return True
+        return method == "POST" and endpoint.split("?", 1)[0] in self.SAFE_POST_ENDPOINTS
+    
+    def is_retryable_error(self, error: OpenProjectAPIError) -> bool:
+        """Whether the failure is transient (network error, 429 or 5xx)"""
+        if isinstance(error, CircuitOpenError):
+            return False
+        return error.status is None or error.status in self.RETRYABLE_STATUSES
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the given retry.
+        
+        Args:
+            attempt: Zero-based retry number
+            retry_after: Delay requested by the server via Retry-After
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.retry_after_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the OpenProject host is down.
+    
+    After ``failure_threshold`` consecutive transient failures the breaker
+    opens and requests are rejected without touching the network. Once
+    ``reset_timeout`` has passed a single probe request is let through:
+    success closes the breaker, failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the breaker (0 disables it)
+            reset_timeout: Seconds to stay open before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+    
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a circuit breaker from OPENPROJECT_BREAKER_* environment variables"""
+        return cls(
+            failure_threshold=_env_int("OPENPROJECT_BREAKER_THRESHOLD", 5),
+            reset_timeout=_env_float("OPENPROJECT_BREAKER_RESET", 30.0)
+        )
+    
+    def before_request(self) -> bool:
+        """
+        Check whether a request may be sent.
+        
+        Returns:
+            bool: True if the request is the half-open probe
+        
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        if self.failure_threshold <= 0 or self.state == self.CLOSED:
+            return False
+        
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+            self._probing = False
+            logger.info("Circuit breaker half-open, probing OpenProject")
+        
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        
+        self.rejected += 1
+        raise CircuitOpenError(
+            "OpenProject is unavailable (circuit breaker open after "
+            f"{self.failures} consecutive failures). "
+            f"Retry in {max(remaining, 0.0):.0f}s.",
+            retry_after=max(remaining, 0.0)
+        )
+    
+    def record_success(self) -> None:
+        """Record a request that reached a healthy server"""
+        if self.state != self.CLOSED:
+            logger.info("Circuit breaker closed, OpenProject is reachable again")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+    
+    def record_failure(self) -> None:
+        """Record a transient failure (network error, 429 or 5xx)"""
+        self.failures += 1
+        self._probing = False
+        if self.failure_threshold <= 0:
+            return
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(
+                f"Circuit breaker opened after {self.failures} consecutive failures; "
+                f"failing fast for {self.reset_timeout:.0f}s"
+            )
+    
+    def record_cancelled(self, probe: bool) -> None:
+        """
+        Record a request abandoned by its caller; it says nothing about the server.
+        
+        Args:
+            probe: Whether the cancelled request was the half-open probe
+        """
+        # Only the probe's own cancellation frees the slot for another probe
+        if probe:
+            self._probing = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+    
+    __slots__ = ("bounds", "counts", "sum", "count")
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, in_bucket in zip(self.bounds, self.counts):
+            if in_bucket and seen + in_bucket >= rank:
+                return lower + (bound - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = bound
+        return self.bounds[-1]
+
+
+class Metrics:
+    """
+    In-process metrics registry with Prometheus text exposition.
+    
+    Counters and histograms are keyed by metric name plus label values.
+    Collectors are callables polled at export time for values owned by
+    other components (cache, coalescing, retries, circuit breaker).
+    """
+    
+    LATENCY_BUCKETS = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+    )
+    SIZE_BUCKETS = (
+        256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216
+    )
+    
+    HELP = {
+        "openproject_mcp_tool_calls_total": ("counter", "MCP tool calls by tool and outcome"),
+        "openproject_mcp_tool_duration_seconds": ("histogram", "Total MCP tool call latency"),
+        "openproject_mcp_render_seconds": ("histogram", "Time spent rendering tool output"),
+        "openproject_mcp_http_requests_total": ("counter", "OpenProject API requests by endpoint and status"),
+        "openproject_mcp_http_request_duration_seconds": ("histogram", "OpenProject API request latency"),
+        "openproject_mcp_http_response_bytes": ("histogram", "OpenProject API response body size"),
+        "openproject_mcp_json_decode_seconds": ("histogram", "Time spent decoding API response JSON"),
+        "openproject_mcp_update_conflicts_total": ("counter", "Work package updates retried after a lock version conflict"),
+        "openproject_mcp_attachment_bytes_total": ("counter", "Attachment bytes streamed by direction"),
+        "openproject_mcp_prefetch_requests_total": ("counter", "Speculative metadata prefetches by resource and outcome"),
+        "openproject_mcp_feed_polls_total": ("counter", "Change feed polls by outcome"),
+        "openproject_mcp_feed_changes_total": ("counter", "Work package changes published by the change feed"),
+        "openproject_mcp_session_throttled_total": ("counter", "Tool calls that waited for a free per-session slot"),
+        "openproject_mcp_sessions": ("gauge", "Connected MCP sessions that have called a tool"),
+        "openproject_mcp_tool_queue_seconds": ("histogram", "Time tool calls waited for a concurrency slot"),
+        "openproject_mcp_tool_calls_queued": ("gauge", "Tool calls waiting for a concurrency slot"),
+        "openproject_mcp_tool_calls_running": ("gauge", "Tool calls holding a concurrency slot")
+    }
+    
+    _ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+    
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Histogram] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, Dict[str, str], float]]]] = []
+        self.started_at = time.time()
+    
+    @classmethod
+    def endpoint_label(cls, endpoint: str) -> str:
+        """Collapse an endpoint to a low-cardinality label (/projects/5/types -> /projects/{id}/types)"""
+        return cls._ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0]) or "/"
+    
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increase a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0.0) + value
+    
+    def observe(self, name: str, value: float, buckets: Optional[Tuple[float, ...]] = None, **labels: str) -> None:
+        """Record a histogram observation"""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = _Histogram(buckets or self.LATENCY_BUCKETS)
+        histogram.observe(value)
+    
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, Dict[str, str], float]]]) -> None:
+        """
+        Register a callable polled at export time.
+        
+        The callable returns (name, type, labels, value) tuples, where type is
+        "counter" or "gauge".
+        """
+        self._collectors.append(collector)
+    
+    def histograms(self, name: str) -> Dict[Tuple[Tuple[str, str], ...], _Histogram]:
+        """Return all histograms of a metric keyed by their labels"""
+        return {labels: h for (metric, labels), h in self._histograms.items() if metric == name}
+    
+    def counters(self, name: str) -> Dict[Tuple[Tuple[str, str], ...], float]:
+        """Return all counter values of a metric keyed by their labels"""
+        return {labels: v for (metric, labels), v in self._counters.items() if metric == name}
+    
+    def collected(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Poll every collector"""
+        samples = []
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+        return samples
+    
+    @staticmethod
+    def _labels(labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = []
+        for key, value in pairs:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{key}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+    
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        described = set()
+        
+        def describe(name: str, kind: str, help_text: str) -> None:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+        
+        for (name, labels), value in sorted(self._counters.items()):
+            kind, help_text = self.HELP.get(name, ("counter", name))
+            describe(name, kind, help_text)
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+        
+        for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+            kind, help_text = self.HELP.get(name, ("histogram", name))
+            describe(name, kind, help_text)
+            cumulative = 0
+            for bound, in_bucket in zip(histogram.bounds, histogram.counts):
+                cumulative += in_bucket
+                lines.append(f"{name}_bucket{self._labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+            lines.append(f"{name}_bucket{self._labels(labels, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"{name}_sum{self._labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram.count}")
+        
+        for name, kind, labels, value in self.collected():
+            describe(name, kind, name.replace("_", " "))
+            lines.append(f"{name}{self._labels(sorted(labels.items()))} {value:g}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus_file(self, path: str) -> None:
+        """Atomically write the Prometheus exposition to a file (for node_exporter's textfile collector)"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+
+class ConnectionPoolConfig:
+    """Connection pool settings for the shared aiohttp session"""
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 60.0,
+        dns_cache_ttl: int = 300,
+        timeout: float = 30.0,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 30.0
+    ):
+        """
+        Initialize the pool settings.
+        
+        Args:
+            limit: Maximum number of open connections across all hosts
+            limit_per_host: Maximum number of open connections per host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Seconds resolved host addresses are cached
+            timeout: Total timeout for a single request in seconds
+            connect_timeout: Seconds to establish a connection, None for no limit
+            read_timeout: Seconds to wait for the next chunk of a response, None for no limit
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+    
+    @classmethod
+    def from_env(cls) -> "ConnectionPoolConfig":
+        """Build pool settings from OPENPROJECT_POOL_* environment variables"""
+        return cls(
+            limit=_env_int("OPENPROJECT_POOL_LIMIT", 100),
+            limit_per_host=_env_int("OPENPROJECT_POOL_LIMIT_PER_HOST", 20),
+            keepalive_timeout=_env_float("OPENPROJECT_POOL_KEEPALIVE", 60.0),
+            dns_cache_ttl=_env_int("OPENPROJECT_DNS_CACHE_TTL", 300),
+            timeout=_env_float("OPENPROJECT_TIMEOUT", 30.0),
+            connect_timeout=_env_float("OPENPROJECT_CONNECT_TIMEOUT", 10.0) or None,
+            read_timeout=_env_float("OPENPROJECT_READ_TIMEOUT", 30.0) or None
+        )
+    
+    def client_timeout(
+        self,
+        connect: Optional[float] = None,
+        read: Optional[float] = None,
+        transfer: bool = False
+    ) -> "aiohttp.ClientTimeout":
+        """
+        Build the aiohttp timeout of a request.
+        
+        Args:
+            connect: Connect timeout overriding ``connect_timeout``
+            read: Read timeout overriding ``read_timeout``
+            transfer: Drop the total timeout for a file transfer, which is
+                bounded by the read timeout and the tool deadline instead
+            
+        Returns:
+            aiohttp.ClientTimeout: Total, connect and socket read timeouts
+        """
+        return aiohttp.ClientTimeout(
+            total=None if transfer else self.timeout,
+            sock_connect=connect or self.connect_timeout,
+            sock_read=read or self.read_timeout
+        )
+
+
+class _CacheEntry:
+    """A cached response body together with its validator and expiry"""
+    
+    __slots__ = ("resource", "value", "etag", "expires_at", "prefetched")
+    
+    def __init__(
+        self,
+        resource: str,
+        value: Dict,
+        etag: Optional[str],
+        expires_at: float,
+        prefetched: bool = False
+    ):
+        self.resource = resource
+        self.value = value
+        self.etag = etag
+        self.expires_at = expires_at
+        # Stored by the prefetch scheduler and not used by a tool call yet
+        self.prefetched = prefetched
+    
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class MetadataCache:
+    """
+    In-process cache for slow-changing API resources.
+    
+    Entries are keyed by endpoint including its query string, expire after a
+    per-resource TTL and are evicted least-recently-used once the cache is
+    full. Expired entries are kept while they carry an ETag so they can be
+    revalidated with ``If-None-Match`` instead of being downloaded again.
+    Cached bodies are shared between callers and must be treated as read-only.
+    """
+    
+    DEFAULT_TTLS = {
+        "types": 3600.0,
+        "priorities": 3600.0,
+        "statuses": 3600.0,
+        "projects": 300.0,
+        "forms": 3600.0
+    }
+    
+    _RESOURCE_PATTERNS = [
+        (re.compile(r"^/(?:projects/\d+/)?types(?:/\d+)?$"), "types"),
+        (re.compile(r"^/priorities(?:/\d+)?$"), "priorities"),
+        (re.compile(r"^/statuses(?:/\d+)?$"), "statuses"),
+        (re.compile(r"^/projects(?:/\d+)?$"), "projects")
+    ]
+    
+    def __init__(self, max_entries: int = 256, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+            ttls: Optional per-resource TTLs in seconds overriding the defaults
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.prefetched = 0
+        self.prefetch_hits = 0
+    
+    @classmethod
+    def from_env(cls) -> "MetadataCache":
+        """Build a cache from OPENPROJECT_CACHE_* environment variables"""
+        ttls = {
+            resource: _env_float(f"OPENPROJECT_CACHE_TTL_{resource.upper()}", ttl)
+            for resource, ttl in cls.DEFAULT_TTLS.items()
+        }
+        return cls(max_entries=_env_int("OPENPROJECT_CACHE_MAX_ENTRIES", 256), ttls=ttls)
+    
+    def resource_for(self, endpoint: str) -> Optional[str]:
+        """Return the cacheable resource name for an endpoint, if any"""
+        path = endpoint.split("?", 1)[0].rstrip("/")
+        for pattern, resource in self._RESOURCE_PATTERNS:
+            if pattern.match(path):
+                return resource
+        return None
+    
+    def lookup(self, key: str) -> Optional[_CacheEntry]:
+        """Return the entry for a key (fresh or stale) and mark it recently used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def record_hit(self, entry: _CacheEntry) -> None:
+        """Count a hit, and the first use of an entry the prefetch scheduler stored"""
+        self.hits += 1
+        if entry.prefetched:
+            entry.prefetched = False
+            self.prefetch_hits += 1
+    
+    def store(self, key: str, resource: str, value: Dict, etag: Optional[str], prefetched: bool = False) -> None:
+        """Store a response body, evicting the least recently used entries"""
+        expires_at = time.monotonic() + self.ttls.get(resource, 0.0)
+        self._entries[key] = _CacheEntry(resource, value, etag, expires_at, prefetched)
+        self._entries.move_to_end(key)
+        if prefetched:
+            self.prefetched += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def refresh(self, entry: _CacheEntry, prefetched: bool = False) -> None:
+        """Extend the lifetime of an entry confirmed by a 304 response"""
+        entry.expires_at = time.monotonic() + self.ttls.get(entry.resource, 0.0)
+        if prefetched and not entry.prefetched:
+            entry.prefetched = True
+            self.prefetched += 1
+    
+    def invalidate(self, resource: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+        
+        Args:
+            resource: Only drop entries of this resource (default: everything)
+            
+        Returns:
+            int: Number of dropped entries
+        """
+        if resource is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [key for key, entry in self._entries.items() if entry.resource == resource]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+        self.invalidations += removed
+        return removed
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export the entries so a later process can start with them.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Entries by key, least recently used
+            first, with resource, body, ETag and seconds left to live
+        """
+        now = time.monotonic()
+        return {
+            key: {
+                "resource": entry.resource,
+                "value": entry.value,
+                "etag": entry.etag,
+                "ttl": entry.expires_at - now
+            }
+            for key, entry in self._entries.items()
+        }
+    
+    def restore(self, entries: Dict[str, Dict[str, Any]], age: float = 0.0) -> int:
+        """
+        Load entries exported by ``snapshot``.
+        
+        Entries that are still fresh are served without a request. Expired
+        ones are kept if they carry an ETag, so their first use is a cheap
+        revalidation instead of a full download. Keys already cached win.
+        
+        Args:
+            entries: Output of ``snapshot``
+            age: Seconds since the snapshot was taken
+            
+        Returns:
+            int: Number of restored entries
+        """
+        now = time.monotonic()
+        restored = 0
+        for key, entry in entries.items():
+            if key in self._entries:
+                continue
+            ttl = min(entry["ttl"], self.ttls.get(entry["resource"], 0.0)) - age
+            if ttl <= 0 and not entry.get("etag"):
+                continue
+            self._entries[key] = _CacheEntry(entry["resource"], entry["value"], entry.get("etag"), now + ttl)
+            self._entries.move_to_end(key, last=False)
+            restored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return restored
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "prefetched": self.prefetched,
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_hit_rate": round(self.prefetch_hits / self.prefetched, 4) if self.prefetched else 0.0
+        }
+
+
+class _Flight:
+    """An in-flight GET shared by every caller asking for the same endpoint"""
+    
+    __slots__ = ("task", "waiters", "foreground")
+    
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+        # Whether a caller outside the prefetch scheduler waits on the flight
+        self.foreground = False
+
+
+class _CountingReader:
+    """Async file-like view of a response stream that counts bytes read"""
+    
+    HEAD_SIZE = 4096
+    
+    def __init__(self, stream: "aiohttp.StreamReader"):
+        self.stream = stream
+        self.size = 0
+        self.head = b""
+    
+    async def read(self, n: int = -1) -> bytes:
+        chunk = await self.stream.read(n)
+        if self.size < self.HEAD_SIZE:
+            self.head += chunk[:self.HEAD_SIZE - self.size]
+        self.size += len(chunk)
+        return chunk
+
+
+class _ByteCounter:
+    """Digest-like sink that only counts the bytes fed to it"""
+    
+    __slots__ = ("size",)
+    
+    def __init__(self):
+        self.size = 0
+    
+    def update(self, data: bytes) -> None:
+        self.size += len(data)
+
+
+class CollectionPaginator:
+    """
+    Async iterator over every element of a paginated HAL collection.
+    
+    The first page is fetched on its own to learn ``total`` and the page
+    size the server actually applied. The remaining ``offset`` pages are
+    then fetched concurrently through a sliding window of at most
+    ``concurrency`` requests. Elements are yielded in collection order, so
+    an iteration can be resumed later from ``start``. Only the pages inside
+    the window are held in memory. A collection that reports no ``total``
+    is walked page by page until a short page.
+    
+    When the client streams pages, each page is parsed incrementally
+    instead. The next pages are still requested ahead of time, but their
+    bodies wait in the socket buffers, so memory stays proportional to one
+    element rather than to the window of pages.
+    """
+    
+    def __init__(
+        self,
+        client: "OpenProjectClient",
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        concurrency: int = 4,
+        start: int = 0
+    ):
+        """
+        Initialize the paginator.
+        
+        Args:
+            client: Client used to fetch the pages
+            path: Collection endpoint path without query string
+            params: Optional query parameters (filters, sortBy, ...)
+            page_size: Requested page size (the server may cap it)
+            max_results: Stop after this many elements
+            concurrency: Maximum number of pages fetched at once
+            start: Number of leading elements to skip; requires ``page_size``
+                and starts fetching at the page that holds that element
+        """
+        self.client = client
+        self.path = path
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.max_results = max_results
+        self.concurrency = max(1, concurrency)
+        self.start = start if page_size else 0
+        self.total: Optional[int] = None
+        self.fetched = 0
+        self._server_page_size: Optional[int] = None
+        self._iterator = None
+    
+    @property
+    def effective_page_size(self) -> Optional[int]:
+        """Page size the server applied, or the requested one"""
+        return self._server_page_size or self.page_size
+    
+    def __aiter__(self) -> AsyncIterator[Dict]:
+        if self.client.stream_pages:
+            self._iterator = self._iterate_streamed()
+        else:
+            self._iterator = self._iterate()
+        return self._iterator
+    
+    async def aclose(self) -> None:
+        """Stop an iteration early, cancelling the pages still in flight"""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+    
+    def _page_endpoint(self, offset: int) -> str:
+        """Build the endpoint of a single page"""
+        params = dict(self.params)
+        params["offset"] = offset
+        if self.page_size:
+            params["pageSize"] = self.page_size
+        return self.client._build_endpoint(self.path, params)
+    
+    def _remaining_pages(self, first_offset: int, first_count: int) -> range:
+        """Offsets still to fetch once the first page told us the total"""
+        page_size = self._server_page_size or first_count
+        end = self.total or 0
+        if self.max_results is not None:
+            end = min(end, self.start + self.max_results)
+        if not page_size or end <= first_offset * page_size:
+            return range(0)
+        return range(first_offset + 1, -(-end // page_size) + 1)
+    
+    def _take(self) -> bool:
+        """Count one more yielded element, or report that the limit is reached"""
+        if self.max_results is not None and self.fetched >= self.max_results:
+            return False
+        self.fetched += 1
+        return True
+    
+    async def _fetch_page(self, offset: int) -> List[Dict]:
+        """Fetch the elements of a single page"""
+        result = await self.client._request("GET", self._page_endpoint(offset))
+        if self.total is None:
+            self.total = result.get("total")
+            self._server_page_size = result.get("pageSize")
+        return result.get("_embedded", {}).get("elements", [])
+    
+    async def _iterate(self) -> AsyncIterator[Dict]:
+        first_offset = self.start // self.page_size + 1 if self.start else 1
+        skip = self.start - (first_offset - 1) * (self.page_size or 0)
+        elements = await self._fetch_page(first_offset)
+        for element in elements[skip:]:
+            if not self._take():
+                return
+            yield element
+        
+        if self.total is None:
+            # Without a total the end is only known from a short page
+            page_size = self._server_page_size or len(elements)
+            offset = first_offset
+            while page_size and len(elements) >= page_size:
+                offset += 1
+                elements = await self._fetch_page(offset)
+                for element in elements:
+                    if not self._take():
+                        return
+                    yield element
+            return
+        
+        offsets = iter(self._remaining_pages(first_offset, len(elements)))
+        pending: List[asyncio.Future] = []
+        try:
+            for offset in offsets:
+                pending.append(asyncio.ensure_future(self._fetch_page(offset)))
+                if len(pending) < self.concurrency:
+                    continue
+                for element in await pending.pop(0):
+                    if not self._take():
+                        return
+                    yield element
+            while pending:
+                for element in await pending.pop(0):
+                    if not self._take():
+                        return
+                    yield element
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _open_page(self, offset: int) -> Any:
+        """Request a page; returns its unread response, or its decoded body when that was shared"""
+        return await self.client._stream_get(self._page_endpoint(offset))
+    
+    async def _page_elements(self, page: Any, envelope: Dict[str, Any]) -> AsyncIterator[Dict]:
+        """Elements of an opened page, parsed from the stream or read from a shared body"""
+        if isinstance(page, dict):
+            for field in ("total", "count", "pageSize", "offset"):
+                if field in page:
+                    envelope[field] = page[field]
+            for element in page.get("_embedded", {}).get("elements", []):
+                yield element
+            return
+        async for element in self.client._stream_elements(self.path, page, envelope):
+            yield element
+    
+    @staticmethod
+    def _release(page: Any) -> None:
+        """Return a streamed page's connection to the pool; shared bodies need nothing"""
+        if isinstance(page, aiohttp.ClientResponse):
+            page.release()
+    
+    async def _iterate_streamed(self) -> AsyncIterator[Dict]:
+        first_offset = self.start // self.page_size + 1 if self.start else 1
+        skip = self.start - (first_offset - 1) * (self.page_size or 0)
+        envelope: Dict[str, Any] = {}
+        pending: List[asyncio.Future] = []
+        page = await self._open_page(first_offset)
+        try:
+            page_count = 0
+            async for element in self._page_elements(page, envelope):
+                page_count += 1
+                if page_count <= skip:
+                    continue
+                if not self._take():
+                    return
+                yield element
+            self._release(page)
+            
+            self.total = envelope.get("total")
+            self._server_page_size = envelope.get("pageSize")
+            if self.total is None:
+                # Without a total the pages are walked one by one until a short one
+                page_size = self._server_page_size or page_count
+                offset = first_offset
+                while page_count == page_size and page_size:
+                    offset += 1
+                    page = await self._open_page(offset)
+                    page_count = 0
+                    async for element in self._page_elements(page, {}):
+                        page_count += 1
+                        if not self._take():
+                            return
+                        yield element
+                    self._release(page)
+                return
+            
+            for offset in self._remaining_pages(first_offset, page_count):
+                pending.append(asyncio.ensure_future(self._open_page(offset)))
+                if len(pending) < self.concurrency:
+                    continue
+                page = await pending.pop(0)
+                async for element in self._page_elements(page, {}):
+                    if not self._take():
+                        return
+                    yield element
+                self._release(page)
+            while pending:
+                page = await pending.pop(0)
+                async for element in self._page_elements(page, {}):
+                    if not self._take():
+                        return
+                    yield element
+                self._release(page)
+        finally:
+            self._release(page)
+            for task in pending:
+                task.cancel()
+            for outcome in await asyncio.gather(*pending, return_exceptions=True):
+                self._release(outcome)
+
+
 class OpenProjectClient:
     """Client for the OpenProject API v3 with optional proxy support"""
     
-    def __init__(self, base_url: str, api_key: str, proxy: Optional[str] = None):
+    # Fields the work package renderers read; everything else is left out of
+    # list responses via OpenProject's sparse fieldsets (``select=``)
+    WORK_PACKAGE_FIELDS = (
+        "id", "subject", "percentageDone", "type", "status", "project", "assignee"
+    )
+    
+    # Top-level collection numbers, read from the head of a streamed page
+    _ENVELOPE_FIELD = re.compile(rb'"(total|count|pageSize|offset)"\s*:\s*(\d+)')
+    
+    # Attributes summarize_work_packages can group by
+    GROUP_BY_FIELDS = ("status", "type", "assignee", "priority", "project", "responsible")
+    
+    # Duration attributes summed locally when the server cannot group
+    SUM_FIELDS = ("estimatedTime", "remainingTime")
+    
+    # Update fields sent as links: argument -> (link name, resource collection)
+    UPDATE_LINKS = {
+        "status_id": ("status", "statuses"),
+        "type_id": ("type", "types"),
+        "priority_id": ("priority", "priorities"),
+        "assignee_id": ("assignee", "users"),
+        "responsible_id": ("responsible", "users")
+    }
+    
+    # Update fields sent as plain attributes: argument -> attribute name
+    UPDATE_ATTRIBUTES = {
+        "subject": "subject",
+        "percentage_done": "percentageDone",
+        "start_date": "startDate",
+        "due_date": "dueDate"
+    }
+    
+    # Per-work-package collections fetched by get_work_package_details
+    DETAIL_SECTIONS = ("relations", "activities", "watchers", "attachments")
+    
+    SORT_FIELDS = (
+        "id", "subject", "updatedAt", "createdAt", "startDate", "dueDate",
+        "priority", "status", "type", "assignee"
+    )
+    
+    # Piece size of streamed attachment uploads and downloads
+    TRANSFER_CHUNK_BYTES = 1024 * 1024
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        proxy: Optional[str] = None,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+        page_concurrency: int = 4,
+        cache: Optional[MetadataCache] = None,
+        coalesce: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[Metrics] = None,
+        stream_pages: bool = False
+    ):
         """
         Initialize the OpenProject client.
         
@@ -52,10 +1189,37 @@ class OpenProjectClient:
             base_url: The base URL of the OpenProject instance
             api_key: API key for authentication
             proxy: Optional HTTP proxy URL
+            pool_config: Optional connection pool settings
+            page_concurrency: Maximum collection pages fetched in parallel
+            cache: Optional metadata cache for types, projects, priorities and statuses
+            coalesce: Share one in-flight request between identical concurrent GETs
+            retry_policy: Optional retry policy for transient failures
+            circuit_breaker: Optional circuit breaker for this host
+            metrics: Optional metrics registry for request instrumentation
+            stream_pages: Parse collection pages incrementally (requires ijson)
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.proxy = proxy
+        self.pool_config = pool_config or ConnectionPoolConfig()
+        self._session: "Optional[aiohttp.ClientSession]" = None
+        self._warming: Optional[asyncio.Future] = None
+        self.page_concurrency = page_concurrency
+        self.cache = cache
+        self.coalesce = coalesce
+        self._inflight: Dict[str, _Flight] = {}
+        self.coalesced = 0
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.retries = 0
+        self.retries_exhausted = 0
+        self.metrics = metrics or Metrics()
+        # Extra labels on every metric sample, e.g. the instance name
+        self.labels: Dict[str, str] = {}
+        if stream_pages and ijson is None:
+            logger.warning("Streaming page parsing needs the ijson package, reading whole pages instead")
+            stream_pages = False
+        self.stream_pages = stream_pages
         
         # Setup headers with Basic Auth
         self.headers = {
@@ -69,11 +1233,89 @@ class OpenProjectClient:
         if self.proxy:
             logger.info(f"Using proxy: {self.proxy}")
         
+    @classmethod
+    def from_env(
+        cls,
+        base_url: str,
+        api_key: str,
+        proxy: Optional[str] = None,
+        metrics: Optional[Metrics] = None
+    ) -> "OpenProjectClient":
+        """
+        Build a client tuned by the OPENPROJECT_* environment variables.
+        
+        Args:
+            base_url: The base URL of the OpenProject instance
+            api_key: API key for authentication
+            proxy: Optional HTTP proxy URL
+            metrics: Optional metrics registry for request instrumentation
+            
+        Returns:
+            OpenProjectClient: Client with pool, cache, retry and breaker settings applied
+        """
+        return cls(
+            base_url,
+            api_key,
+            proxy,
+            pool_config=ConnectionPoolConfig.from_env(),
+            page_concurrency=_env_int("OPENPROJECT_PAGE_CONCURRENCY", 4),
+            cache=(
+                MetadataCache.from_env()
+                if os.getenv("OPENPROJECT_CACHE_ENABLED", "true").lower() == "true"
+                else None
+            ),
+            coalesce=os.getenv("OPENPROJECT_COALESCE_REQUESTS", "true").lower() == "true",
+            retry_policy=RetryPolicy.from_env(),
+            circuit_breaker=CircuitBreaker.from_env(),
+            metrics=metrics,
+            stream_pages=os.getenv("OPENPROJECT_STREAM_PAGES", "false").lower() == "true"
+        )
+    
     def _encode_api_key(self) -> str:
         """Encode API key for Basic Auth"""
         credentials = f"apikey:{self.api_key}"
         return base64.b64encode(credentials.encode()).decode()
     
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the shared session, creating the connection pool on first use"""
+        if self._session is None or self._session.closed:
+            ssl_context = ssl.create_default_context()
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                limit=self.pool_config.limit,
+                limit_per_host=self.pool_config.limit_per_host,
+                keepalive_timeout=self.pool_config.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.pool_config.dns_cache_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.pool_config.client_timeout()
+            )
+            logger.debug(
+                f"Connection pool opened (limit={self.pool_config.limit}, "
+                f"per host={self.pool_config.limit_per_host})"
+            )
+        return self._session
+    
+    async def open(self) -> None:
+        """Create the connection pool ahead of the first request"""
+        self._get_session()
+    
+    async def close(self) -> None:
+        """Close the connection pool and release all pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.debug("Connection pool closed")
+        self._session = None
+    
+    async def __aenter__(self) -> "OpenProjectClient":
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
     async def _request(
         self, 
         method: str, 
@@ -83,6 +1325,9 @@ class OpenProjectClient:
         """
         Execute an API request.
         
+        GET requests for slow-changing resources are answered from the
+        metadata cache when possible; writes to those resources invalidate it.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
@@ -92,61 +1337,490 @@ class OpenProjectClient:
             Dict: Response data from the API
             
         Raises:
-            Exception: If the request fails
+            OpenProjectAPIError: If the request fails
         """
-        url = f"{self.base_url}/api/v3{endpoint}"
+        resource = self.cache.resource_for(endpoint) if self.cache else None
+        if method == "GET":
+            if resource:
+                return await self._cached_get(endpoint, resource)
+            return await self._single_flight(endpoint, self._get, endpoint)
         
-        logger.debug(f"API Request: {method} {url}")
-        if data:
-            logger.debug(f"Request body: {json.dumps(data, indent=2)}")
+        _, response_json, _ = await self._send(method, endpoint, data)
         
-        # Configure SSL and timeout
-        ssl_context = ssl.create_default_context()
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        timeout = aiohttp.ClientTimeout(total=30)
+        if resource:
+            self.cache.invalidate(resource)
         
-        async with aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout
-        ) as session:
-            try:
-                # Build request parameters
-                request_params = {
-                    "method": method,
-                    "url": url,
-                    "headers": self.headers,
-                    "json": data
-                }
-                
-                # Add proxy if configured
-                if self.proxy:
-                    request_params["proxy"] = self.proxy
-                
-                async with session.request(**request_params) as response:
-                    response_text = await response.text()
-                    
-                    logger.debug(f"Response status: {response.status}")
-                    
-                    # Parse response
-                    try:
-                        response_json = json.loads(response_text) if response_text else {}
-                    except json.JSONDecodeError:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        response_json = {}
-                    
-                    # Handle errors
-                    if response.status >= 400:
-                        error_msg = self._format_error_message(
-                            response.status, 
-                            response_text
-                        )
-                        raise Exception(error_msg)
-                    
-                    return response_json
-                    
-            except aiohttp.ClientError as e:
-                logger.error(f"Network error: {str(e)}")
-                raise Exception(f"Network error accessing {url}: {str(e)}")
+        return response_json
+    
+    async def _get(self, endpoint: str) -> Dict:
+        """Plain GET returning only the decoded body"""
+        _, response_json, _ = await self._send("GET", endpoint)
+        return response_json
+    
+    async def _cached_get(self, endpoint: str, resource: str) -> Dict:
+        """GET through the metadata cache, revalidating stale entries by ETag"""
+        entry = self.cache.lookup(endpoint)
+        foreground = not _prefetching.get()
+        if entry is not None and entry.fresh:
+            if foreground:
+                self.cache.record_hit(entry)
+            return entry.value
+        
+        if foreground:
+            self.cache.misses += 1
+        return await self._single_flight(endpoint, self._revalidate, endpoint, resource)
+    
+    async def _revalidate(self, endpoint: str, resource: str) -> Dict:
+        """Fetch a cacheable endpoint, sending the stored ETag if there is one"""
+        entry = self.cache.lookup(endpoint)
+        headers = None
+        if entry is not None and entry.etag:
+            headers = {"If-None-Match": entry.etag}
+        
+        status, response_json, response_headers = await self._send(
+            "GET",
+            endpoint,
+            headers=headers
+        )
+        
+        if status == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.refresh(entry, self._prefetch_only(endpoint))
+            return entry.value
+        
+        self.cache.store(endpoint, resource, response_json, response_headers.get("ETag"), self._prefetch_only(endpoint))
+        return response_json
+    
+    def _prefetch_only(self, key: str) -> bool:
+        """
+        Whether a response is fetched for the prefetch scheduler alone.
+        
+        A flight started by a prefetch may be joined by a tool call; its
+        response then counts as a regular fetch, not as prefetched.
+        """
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return not flight.foreground
+        return _prefetching.get()
+    
+    async def _single_flight(self, key: str, fetch, *args) -> Dict:
+        """
+        Run ``fetch(*args)`` once for all concurrent callers with the same key.
+        
+        Callers that arrive while a request for ``key`` is in flight await the
+        same task and receive the same decoded body (or exception). Cancelling
+        one caller does not affect the others; the shared request is only
+        cancelled once every caller waiting on it has gone away.
+        """
+        if not self.coalesce:
+            return await fetch(*args)
+        
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fetch(*args)))
+            self._inflight[key] = flight
+            
+            def forget(_task, key=key, flight=flight):
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            
+            flight.task.add_done_callback(forget)
+        else:
+            self.coalesced += 1
+        
+        if not _prefetching.get():
+            flight.foreground = True
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+    
+    async def _stream_get(self, endpoint: str) -> Any:
+        """
+        Open a GET for incremental parsing, unless its body can be shared.
+        
+        A streamed body can only be read once, so it is never shared. To keep
+        the metadata cache and request coalescing in effect, a cacheable
+        endpoint takes the cached path, and a page that a buffered request is
+        already fetching joins that request. Streaming therefore bounds
+        memory only for pages nobody else is loading at the same time.
+        
+        Args:
+            endpoint: API endpoint path
+            
+        Returns:
+            The decoded body when it was shared, otherwise the unread response
+            for ``_stream_elements``
+        """
+        resource = self.cache.resource_for(endpoint) if self.cache else None
+        if resource:
+            return await self._cached_get(endpoint, resource)
+        if self.coalesce and endpoint in self._inflight:
+            return await self._single_flight(endpoint, self._get, endpoint)
+        _, response, _ = await self._send("GET", endpoint, stream=True)
+        return response
+    
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Return how many GETs were served by an already in-flight request"""
+        return {
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        body: Any = None,
+        transfer: bool = False
+    ) -> Tuple[int, Any, Any]:
+        """
+        Send an HTTP request, retrying transient failures.
+        
+        Network errors, 429 and 5xx responses are retried with jittered
+        exponential backoff (or the server's Retry-After) as long as the
+        request is safe to repeat. Every attempt passes the circuit breaker.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Optional request body data
+            headers: Optional extra request headers
+            stream: Return a successful response unread instead of its decoded body
+            body: Request body sent as is instead of JSON-encoded ``data``,
+                e.g. a streamed multipart upload
+            transfer: File transfer without a total timeout
+            
+        Returns:
+            Tuple[int, Any, Any]: Status code, decoded body (or unread response) and response headers
+            
+        Raises:
+            OpenProjectAPIError: If the request fails
+        """
+        if self._warming is not None:
+            # Reuse the connection the prewarm is opening rather than racing it with a second one
+            await asyncio.wait([self._warming])
+        
+        policy = self.retry_policy
+        retryable = policy.is_retryable_request(method, endpoint)
+        attempt = 0
+        while True:
+            probe = self.circuit_breaker.before_request()
+            try:
+                result = await self._send_once(method, endpoint, data, headers, stream, body, transfer)
+            except asyncio.CancelledError:
+                self.circuit_breaker.record_cancelled(probe)
+                raise
+            except OpenProjectAPIError as e:
+                if not policy.is_retryable_error(e):
+                    # The server answered, so it is up even if it said no
+                    self.circuit_breaker.record_success()
+                    raise
+                self.circuit_breaker.record_failure()
+                if not retryable or attempt >= policy.max_retries:
+                    if retryable and policy.max_retries:
+                        self.retries_exhausted += 1
+                    raise
+                delay = policy.delay(attempt, e.retry_after)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    f"{method} {endpoint} failed ({e.status or 'network error'}), "
+                    f"retry {attempt}/{policy.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            self.circuit_breaker.record_success()
+            return result
+    
+    async def _send_once(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        body: Any = None,
+        transfer: bool = False
+    ) -> Tuple[int, Any, Any]:
+        """
+        Send a single HTTP request over the pooled session.
+        
+        The body is read as bytes and parsed directly, without an
+        intermediate str copy. With ``stream`` a successful response is
+        returned unread, and the caller must release it. A ``body`` is
+        passed to aiohttp unchanged, so payloads backed by files or async
+        generators are streamed rather than buffered.
+        """
+        url = f"{self.base_url}/api/v3{endpoint}"
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"API Request: {method} {url}")
+            if data:
+                logger.debug(f"Request body: {json.dumps(data, indent=2)}")
+        
+        session = self._get_session()
+        metrics = self.metrics
+        endpoint_label = Metrics.endpoint_label(endpoint)
+        started = time.perf_counter()
+        status_label = "error"
+        
+        try:
+            # Build request parameters
+            request_params = {
+                "method": method,
+                "url": url,
+                "headers": {**self.headers, **headers} if headers else self.headers
+            }
+            if body is not None:
+                request_params["data"] = body
+            elif data is not None:
+                request_params["data"] = _json_dumps(data)
+            
+            # Add proxy if configured
+            if self.proxy:
+                request_params["proxy"] = self.proxy
+            
+            # Connect and read timeouts of the tool call this request belongs to
+            timeouts = _request_timeouts.get()
+            if timeouts or transfer:
+                request_params["timeout"] = self.pool_config.client_timeout(
+                    *(timeouts or (None, None)),
+                    transfer=transfer
+                )
+            
+            response = await session.request(**request_params)
+            try:
+                status_label = str(response.status)
+                logger.debug("Response status: %s", response.status)
+                
+                if stream and response.status < 400:
+                    returned = response
+                    response = None
+                    return returned.status, returned, returned.headers
+                
+                body = await response.read()
+                metrics.observe(
+                    "openproject_mcp_http_response_bytes",
+                    len(body),
+                    buckets=Metrics.SIZE_BUCKETS,
+                    endpoint=endpoint_label,
+                    **self.labels
+                )
+                
+                # Handle errors
+                if response.status >= 400:
+                    error_msg = self._format_error_message(
+                        response.status, 
+                        self._decode_text(response, body)
+                    )
+                    raise OpenProjectAPIError(
+                        error_msg,
+                        status=response.status,
+                        retry_after=RetryPolicy.parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                    )
+                
+                # Parse response
+                decode_started = time.perf_counter()
+                response_json = self._decode_json(response, body)
+                metrics.observe(
+                    "openproject_mcp_json_decode_seconds",
+                    time.perf_counter() - decode_started,
+                    endpoint=endpoint_label,
+                    **self.labels
+                )
+                
+                return response.status, response_json, response.headers
+            finally:
+                if response is not None:
+                    response.release()
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error: {str(e) or type(e).__name__}")
+            raise OpenProjectAPIError(
+                f"Network error accessing {url}: {str(e) or type(e).__name__}"
+            )
+        except asyncio.CancelledError:
+            status_label = "cancelled"
+            raise
+        finally:
+            metrics.inc(
+                "openproject_mcp_http_requests_total",
+                method=method,
+                endpoint=endpoint_label,
+                status=status_label,
+                **self.labels
+            )
+            metrics.observe(
+                "openproject_mcp_http_request_duration_seconds",
+                time.perf_counter() - started,
+                method=method,
+                endpoint=endpoint_label,
+                **self.labels
+            )
+    
+    @staticmethod
+    def _decode_text(response: "aiohttp.ClientResponse", body: bytes) -> str:
+        """Decode a response body for error messages and logs"""
+        try:
+            return body.decode(response.get_encoding(), errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
+    
+    def _decode_json(self, response: "aiohttp.ClientResponse", body: bytes) -> Any:
+        """Parse a JSON response body straight from bytes"""
+        if not body:
+            return {}
+        charset = response.charset
+        if charset and charset.lower().replace("-", "") != "utf8":
+            # Both backends only take UTF-8 bytes, anything else is transcoded
+            body = self._decode_text(response, body).encode()
+        try:
+            return _json_loads(body)
+        except ValueError:
+            logger.error(f"Invalid JSON response: {self._decode_text(response, body[:200])}...")
+            return {}
+    
+    async def _stream_elements(
+        self,
+        endpoint: str,
+        response: "aiohttp.ClientResponse",
+        envelope: Dict[str, Any]
+    ) -> AsyncIterator[Dict]:
+        """
+        Incrementally parse a collection response, yielding its elements.
+        
+        Only the element being parsed is held in memory. Once the stream is
+        consumed, the top-level ``total``, ``count``, ``pageSize`` and
+        ``offset`` numbers are stored in ``envelope``. OpenProject writes them
+        ahead of ``_embedded``, so they are read from the head of the body;
+        fields that appear elsewhere are left out. The caller releases the
+        response.
+        
+        Args:
+            endpoint: API endpoint the response belongs to
+            response: Unread collection response from ``_send(stream=True)``
+            envelope: Dict receiving the collection's top-level numbers
+            
+        Yields:
+            Dict: Collection elements in document order
+        """
+        reader = _CountingReader(response.content)
+        try:
+            async for element in ijson.items_async(reader, "_embedded.elements.item", use_float=True):
+                yield element
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise OpenProjectAPIError(
+                f"Network error reading {endpoint}: {str(e) or type(e).__name__}"
+            )
+        except ijson.JSONError as e:
+            raise OpenProjectAPIError(f"Invalid JSON response from {endpoint}: {e}")
+        finally:
+            self.metrics.observe(
+                "openproject_mcp_http_response_bytes",
+                reader.size,
+                buckets=Metrics.SIZE_BUCKETS,
+                endpoint=Metrics.endpoint_label(endpoint),
+                **self.labels
+            )
+            embedded_at = reader.head.find(b'"_embedded"')
+            if embedded_at >= 0:
+                for field, value in self._ENVELOPE_FIELD.findall(reader.head[:embedded_at]):
+                    envelope[field.decode()] = int(value)
+    
+    def collect_metrics(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Export cache, coalescing, retry and breaker state as metric samples"""
+        labels = dict(self.labels)
+        samples = [
+            ("openproject_mcp_coalesced_requests_total", "counter", labels, self.coalesced),
+            ("openproject_mcp_retries_total", "counter", labels, self.retries),
+            ("openproject_mcp_retries_exhausted_total", "counter", labels, self.retries_exhausted),
+            ("openproject_mcp_circuit_breaker_open", "gauge", labels,
+             0 if self.circuit_breaker.state == CircuitBreaker.CLOSED else 1),
+            ("openproject_mcp_circuit_breaker_rejected_total", "counter", labels, self.circuit_breaker.rejected)
+        ]
+        if self.cache:
+            stats = self.cache.stats()
+            samples.extend([
+                ("openproject_mcp_cache_hits_total", "counter", labels, stats["hits"]),
+                ("openproject_mcp_cache_misses_total", "counter", labels, stats["misses"]),
+                ("openproject_mcp_cache_revalidated_total", "counter", labels, stats["revalidated"]),
+                ("openproject_mcp_cache_evictions_total", "counter", labels, stats["evictions"]),
+                ("openproject_mcp_cache_entries", "gauge", labels, stats["entries"]),
+                ("openproject_mcp_prefetch_warmed_total", "counter", labels, stats["prefetched"]),
+                ("openproject_mcp_prefetch_hits_total", "counter", labels, stats["prefetch_hits"])
+            ])
+        return samples
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Return retry counters and the circuit breaker state"""
+        return {
+            "retries": self.retries,
+            "retries_exhausted": self.retries_exhausted,
+            "circuit_breaker": self.circuit_breaker.stats()
+        }
+    
+    @staticmethod
+    def _build_endpoint(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Append URL-encoded query parameters to an endpoint path"""
+        if not params:
+            return path
+        query = urlencode(
+            {key: value for key, value in params.items() if value is not None},
+            quote_via=quote
+        )
+        return f"{path}?{query}" if query else path
+    
+    def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        start: int = 0
+    ) -> CollectionPaginator:
+        """
+        Iterate over all elements of a collection endpoint.
+        
+        Args:
+            path: Collection endpoint path without query string
+            params: Optional query parameters
+            page_size: Requested page size
+            max_results: Stop after this many elements
+            start: Number of leading elements to skip (requires page_size)
+            
+        Returns:
+            CollectionPaginator: Async iterator yielding collection elements
+        """
+        return CollectionPaginator(
+            self,
+            path,
+            params,
+            page_size=page_size,
+            max_results=max_results,
+            concurrency=self.page_concurrency,
+            start=start
+        )
+    
+    async def _collect(self, paginator: CollectionPaginator) -> Dict:
+        """Drain a paginator into a collection-shaped response"""
+        elements = [element async for element in paginator]
+        return {
+            "_type": "Collection",
+            "total": paginator.total if paginator.total is not None else len(elements),
+            "count": len(elements),
+            "_embedded": {"elements": elements}
+        }
     
     def _format_error_message(self, status: int, response_text: str) -> str:
         """Format error message based on HTTP status code"""
@@ -157,9 +1831,12 @@ class OpenProjectClient:
             403: "Access denied. The user lacks required permissions.",
             404: "Resource not found. Please verify the URL and resource exists.",
             407: "Proxy authentication required.",
+            409: "Conflict. The resource was modified by someone else; fetch it again and retry.",
+            429: "Rate limit exceeded. Please slow down and try again later.",
             500: "Internal server error. Please try again later.",
             502: "Bad gateway. The server or proxy is not responding correctly.",
-            503: "Service unavailable. The server might be under maintenance."
+            503: "Service unavailable. The server might be under maintenance.",
+            504: "Gateway timeout. The server took too long to respond."
         }
         
         if status in error_hints:
@@ -167,99 +1844,465 @@ class OpenProjectClient:
             
         return base_msg
     
+    async def prewarm(self) -> None:
+        """
+        Open a pooled connection before the first tool call needs one.
+        
+        Pays for DNS resolution and the TCP and TLS handshakes with a small
+        request to the API root, bypassing retries and the circuit breaker.
+        Failures are only logged; the first real request reports them.
+        """
+        self._warming = asyncio.ensure_future(self._send_once("GET", ""))
+        try:
+            await self._warming
+        except OpenProjectAPIError as e:
+            logger.debug(f"Connection prewarm for {self.base_url} failed: {e}")
+        finally:
+            self._warming = None
+    
+    @property
+    def snapshot_key(self) -> str:
+        """Identifies this instance and API key in a cache snapshot without revealing the key"""
+        return hashlib.sha256(f"{self.base_url}\n{self.api_key}".encode()).hexdigest()[:16]
+    
     async def test_connection(self) -> Dict:
         """Test the API connection and authentication"""
         logger.info("Testing API connection...")
         return await self._request("GET", "")
     
-    async def get_projects(self, filters: Optional[str] = None) -> Dict:
+    async def get_projects(
+        self,
+        filters: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> Dict:
         """
-        Retrieve all projects.
+        Retrieve all projects, following every page of the collection.
         
         Args:
             filters: Optional JSON-encoded filter string
+            max_results: Optional limit on the number of projects
             
         Returns:
             Dict: API response containing projects
         """
-        endpoint = "/projects"
-        if filters:
-            encoded_filters = quote(filters)
-            endpoint += f"?filters={encoded_filters}"
+        return await self._collect(self.iter_projects(filters, max_results=max_results))
+    
+    def iter_projects(
+        self,
+        filters: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        start: int = 0
+    ) -> CollectionPaginator:
+        """
+        Stream projects page by page.
+        
+        Args:
+            filters: Optional JSON-encoded filter string
+            page_size: Requested page size
+            max_results: Optional limit on the number of projects
+            start: Number of leading projects to skip (requires page_size)
             
-        result = await self._request("GET", endpoint)
+        Returns:
+            CollectionPaginator: Async iterator yielding projects
+        """
+        return self.paginate(
+            "/projects",
+            {"filters": filters},
+            page_size=page_size,
+            max_results=max_results,
+            start=start
+        )
+    
+    @staticmethod
+    def work_package_filters(
+        status: Optional[str] = None,
+        assignee_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        priority_id: Optional[int] = None,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        subject_contains: Optional[str] = None
+    ) -> str:
+        """
+        Build a JSON-encoded work package filter for the API.
         
-        # Ensure proper response structure
-        if "_embedded" not in result:
-            result["_embedded"] = {"elements": []}
-        elif "elements" not in result.get("_embedded", {}):
-            result["_embedded"]["elements"] = []
+        Args:
+            status: "open", "closed" or "all"
+            assignee_id: Only work packages assigned to this user
+            type_id: Only work packages of this type
+            priority_id: Only work packages with this priority
+            updated_after: Only work packages updated at or after this ISO timestamp
+            updated_before: Only work packages updated at or before this ISO timestamp
+            subject_contains: Only work packages whose subject contains this text
             
-        return result
+        Returns:
+            str: JSON filter string (an empty list matches every status)
+        """
+        filters: List[Dict] = []
+        if status == "open":
+            filters.append({"status": {"operator": "o", "values": []}})
+        elif status == "closed":
+            filters.append({"status": {"operator": "c", "values": []}})
+        for name, value in (
+            ("assignee", assignee_id),
+            ("type", type_id),
+            ("priority", priority_id)
+        ):
+            if value is not None:
+                filters.append({name: {"operator": "=", "values": [str(value)]}})
+        if updated_after or updated_before:
+            filters.append({
+                "updatedAt": {
+                    "operator": "<>d",
+                    "values": [updated_after or "", updated_before or ""]
+                }
+            })
+        if subject_contains:
+            filters.append({"subject": {"operator": "~", "values": [subject_contains]}})
+        return json.dumps(filters)
+    
+    @staticmethod
+    def _select(fields: Optional[List[str]]) -> Optional[str]:
+        """Sparse fieldset parameter keeping pagination metadata plus the given element fields"""
+        if not fields:
+            return None
+        return ",".join(
+            ["total", "count", "pageSize", "offset"] + [f"elements/{field}" for field in fields]
+        )
     
     async def get_work_packages(
         self, 
         project_id: Optional[int] = None, 
-        filters: Optional[str] = None
+        filters: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        sort_by: Optional[List[List[str]]] = None,
+        fields: Optional[List[str]] = None
     ) -> Dict:
         """
-        Retrieve work packages.
+        Retrieve work packages, following every page of the collection.
         
         Args:
             project_id: Optional project ID to filter by
             filters: Optional JSON-encoded filter string
+            page_size: Requested page size
+            max_results: Optional limit on the number of work packages
+            sort_by: Optional [[field, "asc"|"desc"], ...] sort criteria
+            fields: Optional element fields to request (sparse fieldset)
             
         Returns:
             Dict: API response containing work packages
         """
+        return await self._collect(
+            self.iter_work_packages(project_id, filters, page_size, max_results, sort_by, fields)
+        )
+    
+    def iter_work_packages(
+        self,
+        project_id: Optional[int] = None,
+        filters: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        sort_by: Optional[List[List[str]]] = None,
+        fields: Optional[List[str]] = None,
+        start: int = 0
+    ) -> CollectionPaginator:
+        """
+        Stream work packages page by page.
+        
+        Filtering, sorting and field selection all happen on the server, so
+        only the requested fields of matching work packages are transferred.
+        Without ``fields`` the full HAL representation is returned.
+        
+        Args:
+            project_id: Optional project ID to filter by
+            filters: Optional JSON-encoded filter string
+            page_size: Requested page size
+            max_results: Optional limit on the number of work packages
+            sort_by: Optional [[field, "asc"|"desc"], ...] sort criteria
+            fields: Optional element fields to request (sparse fieldset)
+            start: Number of leading work packages to skip (requires page_size)
+            
+        Returns:
+            CollectionPaginator: Async iterator yielding work packages
+        """
         if project_id:
-            endpoint = f"/projects/{project_id}/work_packages"
+            path = f"/projects/{project_id}/work_packages"
         else:
-            endpoint = "/work_packages"
+            path = "/work_packages"
             
-        if filters:
-            encoded_filters = quote(filters)
-            endpoint += f"?filters={encoded_filters}"
-            
-        result = await self._request("GET", endpoint)
+        return self.paginate(
+            path,
+            {
+                "filters": filters,
+                "sortBy": json.dumps(sort_by) if sort_by else None,
+                "select": self._select(fields)
+            },
+            page_size=page_size,
+            max_results=max_results,
+            start=start
+        )
+    
+    async def get_work_package_details(
+        self,
+        wp_ids: List[int],
+        sections: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch work packages together with their related collections.
         
-        # Ensure proper response structure
-        if "_embedded" not in result:
-            result["_embedded"] = {"elements": []}
-        elif "elements" not in result.get("_embedded", {}):
-            result["_embedded"]["elements"] = []
+        Everything is requested concurrently: the work packages themselves
+        with one ``id`` filtered collection request, the relations of all of
+        them with one ``involved`` filtered request, and activities, watchers
+        and attachments per work package. Users referenced by activities
+        without a link title are then resolved once per distinct user across
+        the whole batch, so a batch costs about two round trips.
+        
+        The work package and relation collections are paginated and walked
+        with ``paginate``. Activities, watchers and attachments are not: API
+        v3 returns them as plain collections that always hold every element
+        and ignore ``offset``/``pageSize``, so one request per endpoint
+        fetches them completely.
+        
+        Args:
+            wp_ids: Work package IDs
+            sections: Subset of DETAIL_SECTIONS to fetch (default: all)
             
-        return result
+        Returns:
+            Dict: ``work_packages`` maps each ID to its resource (or None when
+            not found), its sections and an ``errors`` dict of sections that
+            could not be fetched; ``linked`` maps user hrefs to names
+        """
+        sections = [section for section in (sections or self.DETAIL_SECTIONS) if section in self.DETAIL_SECTIONS]
+        wp_ids = list(dict.fromkeys(wp_ids))
+        id_values = [str(wp_id) for wp_id in wp_ids]
+        details: Dict[int, Dict[str, Any]] = {
+            wp_id: {"work_package": None, "errors": {}, **{section: [] for section in sections}}
+            for wp_id in wp_ids
+        }
+        
+        async def elements(endpoint: str) -> List[Dict]:
+            # Unpaginated in API v3: the single response holds every element
+            result = await self._request("GET", endpoint)
+            return result.get("_embedded", {}).get("elements", [])
+        
+        requests: List[Tuple[Optional[int], str, Any]] = [(
+            None,
+            "work_packages",
+            self._collect(self.paginate(
+                "/work_packages",
+                {"filters": json.dumps([{"id": {"operator": "=", "values": id_values}}])},
+                page_size=len(wp_ids)
+            ))
+        )]
+        if "relations" in sections:
+            requests.append((None, "relations", self._collect(self.paginate(
+                "/relations",
+                {"filters": json.dumps([{"involved": {"operator": "=", "values": id_values}}])},
+                page_size=max(len(wp_ids), 100)
+            ))))
+        for wp_id in wp_ids:
+            for section in ("activities", "watchers", "attachments"):
+                if section in sections:
+                    requests.append((wp_id, section, elements(f"/work_packages/{wp_id}/{section}")))
+        
+        results = await asyncio.gather(
+            *(request for _, _, request in requests),
+            return_exceptions=True
+        )
+        
+        for (wp_id, section, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                if not isinstance(result, OpenProjectAPIError):
+                    raise result
+                targets = [wp_id] if wp_id is not None else wp_ids
+                for target in targets:
+                    details[target]["errors"][section] = str(result).split("\n", 1)[0]
+                continue
+            if section == "work_packages":
+                for wp in result["_embedded"]["elements"]:
+                    if wp.get("id") in details:
+                        details[wp["id"]]["work_package"] = wp
+            elif section == "relations":
+                for relation in result["_embedded"]["elements"]:
+                    links = relation.get("_links", {})
+                    for side in ("from", "to"):
+                        involved = _href_id(links.get(side))
+                        if involved in details:
+                            details[involved]["relations"].append(relation)
+            else:
+                details[wp_id][section] = result
+        
+        # Resolve each untitled user link once for the whole batch
+        hrefs = {
+            activity["_links"]["user"]["href"]
+            for detail in details.values()
+            for activity in detail.get("activities", [])
+            if (activity.get("_links", {}).get("user") or {}).get("href")
+            and not activity["_links"]["user"].get("title")
+        }
+        linked: Dict[str, str] = {}
+        if hrefs:
+            hrefs = sorted(hrefs)
+            users = await asyncio.gather(
+                *(self._request("GET", href.split("/api/v3", 1)[-1]) for href in hrefs),
+                return_exceptions=True
+            )
+            for href, user in zip(hrefs, users):
+                if isinstance(user, dict) and user.get("name"):
+                    linked[href] = user["name"]
+        
+        return {"work_packages": details, "linked": linked}
     
-    async def create_work_package(self, data: Dict) -> Dict:
+    async def summarize_work_packages(
+        self,
+        group_by: str,
+        project_id: Optional[int] = None,
+        filters: Optional[str] = None,
+        show_sums: bool = False
+    ) -> Dict[str, Any]:
         """
-        Create a new work package.
+        Count (and optionally sum) matching work packages per group.
+        
+        OpenProject groups the collection itself when asked for ``groupBy``,
+        so a single request with a one-element page returns every group's
+        count and sums. If the server rejects the grouping or omits the
+        groups, the work packages are streamed with only the grouped
+        attribute selected and counted locally.
         
         Args:
-            data: Work package data including project, subject, type, etc.
+            group_by: One of GROUP_BY_FIELDS
+            project_id: Optional project ID to filter by
+            filters: Optional JSON-encoded filter string
+            show_sums: Include sums of summable attributes
             
         Returns:
-            Dict: Created work package data
+            Dict: ``groups`` (value, id, count, sums) ordered by count,
+            ``total``, ``total_sums`` and ``source`` ("server" or "local")
         """
-        # Prepare initial payload for form
-        form_payload = {"_links": {}}
+        if group_by not in self.GROUP_BY_FIELDS:
+            raise ValueError(f"Cannot group by {group_by!r}; use one of {', '.join(self.GROUP_BY_FIELDS)}")
+        path = f"/projects/{project_id}/work_packages" if project_id else "/work_packages"
         
-        # Set required links
-        if "project" in data:
-            form_payload["_links"]["project"] = {"href": f"/api/v3/projects/{data['project']}"}
-        if "type" in data:
-            form_payload["_links"]["type"] = {"href": f"/api/v3/types/{data['type']}"}
-            
-        # Set subject if provided
-        if "subject" in data:
-            form_payload["subject"] = data["subject"]
+        try:
+            result = await self._request("GET", self._build_endpoint(path, {
+                "filters": filters,
+                "groupBy": group_by,
+                "showSums": "true" if show_sums else None,
+                "pageSize": 1
+            }))
+        except OpenProjectAPIError as e:
+            if e.status not in (400, 422):
+                raise
+            logger.info(f"Server-side grouping by {group_by} unavailable ({e.status}), aggregating locally")
+            result = {}
+        
+        if "groups" in result:
+            groups = []
+            for group in result["groups"]:
+                value_links = (group.get("_links") or {}).get("valueLink") or [{}]
+                groups.append({
+                    "value": group.get("value") or "(none)",
+                    "id": _href_id(value_links[0]),
+                    "count": group.get("count", 0),
+                    "sums": _sum_values(group.get("sums"))
+                })
+            groups.sort(key=lambda group: -group["count"])
+            return {
+                "groups": groups,
+                "total": result.get("total", sum(group["count"] for group in groups)),
+                "total_sums": _sum_values(result.get("totalSums")),
+                "source": "server"
+            }
+        
+        # Local fallback: stream only the grouped attribute and count
+        fields = [group_by] + (list(self.SUM_FIELDS) if show_sums else [])
+        buckets: Dict[Any, Dict[str, Any]] = {}
+        total_sums = {field: 0.0 for field in self.SUM_FIELDS} if show_sums else {}
+        async for wp in self.iter_work_packages(project_id, filters, page_size=1000, fields=fields):
+            link = (wp.get("_links") or {}).get(group_by)
+            key = _href_id(link)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    "value": _related_name(wp, group_by) or "(none)",
+                    "id": key,
+                    "count": 0,
+                    "sums": {field: 0.0 for field in self.SUM_FIELDS} if show_sums else {}
+                }
+            bucket["count"] += 1
+            for field in total_sums:
+                hours = _duration_hours(wp.get(field))
+                bucket["sums"][field] += hours
+                total_sums[field] += hours
+        
+        groups = sorted(buckets.values(), key=lambda group: -group["count"])
+        return {
+            "groups": groups,
+            "total": sum(group["count"] for group in groups),
+            "total_sums": total_sums,
+            "source": "local"
+        }
+    
+    async def get_form_template(self, project_id: int, type_id: int) -> Dict:
+        """
+        Retrieve the create-form payload for a (project, type) pair.
+        
+        The payload carries the defaults OpenProject fills in for new work
+        packages (status, priority, ...). It is cached as a "forms" resource
+        so repeated creations skip the form round trip. The returned dict is
+        shared and must be copied before it is modified.
+        
+        Args:
+            project_id: Project ID
+            type_id: Type ID
             
-        # Get form with initial payload
+        Returns:
+            Dict: Form payload without subject or lock version
+        """
+        key = self.form_template_key(project_id, type_id)
+        foreground = not _prefetching.get()
+        if self.cache:
+            entry = self.cache.lookup(key)
+            if entry is not None and entry.fresh:
+                if foreground:
+                    self.cache.record_hit(entry)
+                return entry.value
+            if foreground:
+                self.cache.misses += 1
+        
+        form_payload = {
+            "_links": {
+                "project": {"href": f"/api/v3/projects/{project_id}"},
+                "type": {"href": f"/api/v3/types/{type_id}"}
+            }
+        }
         form = await self._request("POST", "/work_packages/form", form_payload)
         
-        # Use form payload and add additional fields
-        payload = form.get("payload", form_payload)
-        payload["lockVersion"] = form.get("lockVersion", 0)
+        # A new dict, so the response is never modified
+        template = {
+            field: value for field, value in form.get("payload", form_payload).items()
+            if field not in ("subject", "lockVersion")
+        }
+        
+        if self.cache:
+            self.cache.store(key, "forms", template, None, not foreground)
+        return template
+    
+    @staticmethod
+    def form_template_key(project_id: int, type_id: int) -> str:
+        """Metadata cache key of the form template for a (project, type) pair"""
+        return f"/work_packages/form?project={project_id}&type={type_id}"
+    
+    @staticmethod
+    def _build_create_payload(template: Dict, data: Dict) -> Dict:
+        """Fill a copy of a form template with the fields of one work package"""
+        payload = copy.deepcopy(template)
+        payload["lockVersion"] = 0
+        
+        if "subject" in data:
+            payload["subject"] = data["subject"]
         
         # Add optional fields
         if "description" in data:
@@ -272,142 +2315,3402 @@ class OpenProjectClient:
             if "_links" not in payload:
                 payload["_links"] = {}
             payload["_links"]["assignee"] = {"href": f"/api/v3/users/{data['assignee_id']}"}
-                
+        
+        return payload
+    
+    async def create_work_package(self, data: Dict) -> Dict:
+        """
+        Create a new work package.
+        
+        Args:
+            data: Work package data including project, subject, type, etc.
+            
+        Returns:
+            Dict: Created work package data
+        """
+        template = await self.get_form_template(data["project"], data["type"])
+        payload = self._build_create_payload(template, data)
+        
         # Create work package
         return await self._request("POST", "/work_packages", payload)
     
-    async def get_types(self, project_id: Optional[int] = None) -> Dict:
+    async def create_work_packages(
+        self,
+        items: List[Dict],
+        concurrency: int = 8
+    ) -> List[Dict]:
         """
-        Retrieve available work package types.
+        Create many work packages concurrently.
+        
+        One form template is fetched per distinct (project, type) pair, then
+        the creations run with at most ``concurrency`` requests in flight. A
+        failing item does not abort the batch.
         
         Args:
-            project_id: Optional project ID to filter types by
+            items: Work package data dicts as accepted by create_work_package
+            concurrency: Maximum number of creations in flight
             
         Returns:
-            Dict: API response containing types
+            List[Dict]: One result per item, in input order, with "ok" and
+            either "work_package" or "error"
         """
-        if project_id:
-            endpoint = f"/projects/{project_id}/types"
-        else:
-            endpoint = "/types"
+        pairs = list({(item["project"], item["type"]) for item in items})
+        templates = await asyncio.gather(
+            *(self.get_form_template(project, type_id) for project, type_id in pairs),
+            return_exceptions=True
+        )
+        template_by_pair = dict(zip(pairs, templates))
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def create(item: Dict) -> Dict:
+            template = template_by_pair[(item["project"], item["type"])]
+            if isinstance(template, BaseException):
+                return {"ok": False, "error": f"Form request failed: {template}"}
+            payload = self._build_create_payload(template, item)
+            async with semaphore:
+                try:
+                    result = await self._request("POST", "/work_packages", payload)
+                except Exception as e:
+                    return {"ok": False, "error": str(e)}
+            return {"ok": True, "work_package": result}
+        
+        return await asyncio.gather(*(create(item) for item in items))
+    
+    @classmethod
+    def _build_update_payload(cls, lock_version: int, changes: Dict) -> Dict:
+        """Build a PATCH body from update fields; a None link value clears the link"""
+        payload: Dict[str, Any] = {"lockVersion": lock_version}
+        for field, attribute in cls.UPDATE_ATTRIBUTES.items():
+            if field in changes:
+                payload[attribute] = changes[field]
+        if "description" in changes:
+            payload["description"] = {"raw": changes["description"]}
+        for field, (link, collection) in cls.UPDATE_LINKS.items():
+            if field in changes:
+                value = changes[field]
+                payload.setdefault("_links", {})[link] = {
+                    "href": f"/api/v3/{collection}/{value}" if value is not None else None
+                }
+        return payload
+    
+    async def update_work_packages(
+        self,
+        updates: List[Dict],
+        concurrency: int = 8,
+        conflict_retries: int = 3
+    ) -> List[Dict]:
+        """
+        Update many work packages concurrently with optimistic locking.
+        
+        The current lock versions are fetched with one id-filtered collection
+        request. Each PATCH carries the version it was based on; when
+        OpenProject answers 409 because the work package changed in the
+        meantime, the version is fetched again and the update re-sent, up to
+        ``conflict_retries`` times. Several updates of the same work package
+        are applied one after another in input order. At most
+        ``concurrency`` requests are in flight, all on the client's session.
+        
+        Args:
+            updates: Dicts with "id" and the fields to change (see
+                UPDATE_ATTRIBUTES, UPDATE_LINKS and "description")
+            concurrency: Maximum number of requests in flight
+            conflict_retries: Re-sends allowed per update after a conflict
             
-        result = await self._request("GET", endpoint)
+        Returns:
+            List[Dict]: One result per update, in input order, with "ok",
+            "conflicts" and either "work_package" or "error"
+        """
+        wp_ids = list(dict.fromkeys(update["id"] for update in updates))
+        lock_versions: Dict[int, int] = {}
+        try:
+            collection = await self._collect(self.paginate(
+                "/work_packages",
+                {
+                    "filters": json.dumps([{"id": {"operator": "=", "values": [str(wp_id) for wp_id in wp_ids]}}]),
+                    "select": self._select(["id", "lockVersion"])
+                },
+                page_size=len(wp_ids)
+            ))
+            for wp in collection["_embedded"]["elements"]:
+                if wp.get("lockVersion") is not None:
+                    lock_versions[wp.get("id")] = wp["lockVersion"]
+        except OpenProjectAPIError as e:
+            # Every update then reads its own version below
+            logger.warning(f"Bulk lock version lookup failed, fetching per work package: {e}")
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results: List[Optional[Dict]] = [None] * len(updates)
+        indexes_by_id: Dict[int, List[int]] = {}
+        for index, update in enumerate(updates):
+            indexes_by_id.setdefault(update["id"], []).append(index)
+        
+        async def apply(wp_id: int, indexes: List[int]) -> None:
+            lock_version = lock_versions.get(wp_id)
+            for index in indexes:
+                conflicts = 0
+                while True:
+                    async with semaphore:
+                        try:
+                            if lock_version is None:
+                                current = await self._request("GET", f"/work_packages/{wp_id}")
+                                lock_version = current.get("lockVersion", 0)
+                            wp = await self._request(
+                                "PATCH",
+                                f"/work_packages/{wp_id}",
+                                self._build_update_payload(lock_version, updates[index])
+                            )
+                        except OpenProjectAPIError as e:
+                            if e.status == 409 and conflicts < conflict_retries:
+                                conflicts += 1
+                                self.metrics.inc("openproject_mcp_update_conflicts_total", **self.labels)
+                                lock_version = None
+                                continue
+                            results[index] = {"ok": False, "error": str(e), "conflicts": conflicts}
+                            # The version is unknown after a failure; re-read it for the next update
+                            lock_version = None
+                            break
+                    lock_version = wp.get("lockVersion")
+                    results[index] = {"ok": True, "work_package": wp, "conflicts": conflicts}
+                    break
+        
+        await asyncio.gather(*(apply(wp_id, indexes) for wp_id, indexes in indexes_by_id.items()))
+        return results
+    
+    @staticmethod
+    def _read_and_hash(handle, size: int, digests: List[Any]) -> bytes:
+        """Read the next chunk of a file and feed it to the digests (runs in a thread)"""
+        chunk = handle.read(size)
+        for digest in digests:
+            digest.update(chunk)
+        return chunk
+    
+    @staticmethod
+    def _write_and_hash(handle, chunk: bytes, digests: List[Any]) -> None:
+        """Write a downloaded chunk and feed it to the digests (runs in a thread)"""
+        handle.write(chunk)
+        for digest in digests:
+            digest.update(chunk)
+    
+    async def _file_chunks(self, path: str, digests: List[Any]) -> AsyncIterator[bytes]:
+        """Yield a file in TRANSFER_CHUNK_BYTES pieces, hashing them on the way"""
+        handle = await asyncio.to_thread(open, path, "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(
+                    self._read_and_hash, handle, self.TRANSFER_CHUNK_BYTES, digests
+                )
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            handle.close()
+    
+    async def upload_attachment(
+        self,
+        wp_id: int,
+        path: str,
+        description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Attach a file to a work package, streaming it from disk.
+        
+        The file is sent as the "file" part of a multipart request built
+        from an async generator, so only one TRANSFER_CHUNK_BYTES chunk is
+        in memory at a time whatever the file size. MD5 and SHA-256 are
+        computed while sending; the MD5 is compared with the digest
+        OpenProject reports for the stored attachment. If the digests
+        differ, or the file changed size while it was sent, the stored
+        attachment is deleted again so retries do not pile up bad copies.
         
-        # Ensure proper response structure
-        if "_embedded" not in result:
-            result["_embedded"] = {"elements": []}
-        elif "elements" not in result.get("_embedded", {}):
-            result["_embedded"]["elements"] = []
+        Args:
+            wp_id: Work package ID
+            path: File to upload
+            description: Optional attachment description
             
-        return result
-
-
-class OpenProjectMCPServer:
-    """MCP Server for OpenProject integration"""
+        Returns:
+            Dict: ``attachment`` (the created resource), ``size``, ``md5``,
+            ``sha256``, ``verified`` (None when the server sent no digest)
+            and ``seconds``
+            
+        Raises:
+            OpenProjectAPIError: If the upload fails, the digests differ or the
+                file changed while it was sent
+        """
+        file_name = os.path.basename(path)
+        size = (await asyncio.to_thread(os.stat, path)).st_size
+        md5, sha256, sent = hashlib.md5(), hashlib.sha256(), _ByteCounter()
+        metadata: Dict[str, Any] = {"fileName": file_name}
+        if description:
+            metadata["description"] = {"raw": description}
+        
+        writer = aiohttp.MultipartWriter("form-data")
+        writer.append_json(metadata).set_content_disposition("form-data", name="metadata")
+        writer.append(
+            self._file_chunks(path, [md5, sha256, sent]),
+            {"Content-Type": mimetypes.guess_type(file_name)[0] or "application/octet-stream"}
+        ).set_content_disposition("form-data", name="file", filename=file_name)
+        
+        started = time.perf_counter()
+        _, attachment, _ = await self._send(
+            "POST",
+            f"/work_packages/{wp_id}/attachments",
+            headers={"Content-Type": writer.content_type},
+            body=writer,
+            transfer=True
+        )
+        self.metrics.inc("openproject_mcp_attachment_bytes_total", sent.size, direction="upload", **self.labels)
+        
+        if sent.size != size:
+            raise OpenProjectAPIError(
+                f"{file_name} changed while it was uploaded: expected {size} bytes, sent {sent.size}"
+                + await self._discard_attachment(attachment.get("id"))
+            )
+        expected = attachment.get("digest") or {}
+        verified = None
+        if expected.get("algorithm", "").lower() == "md5" and expected.get("hash"):
+            verified = expected["hash"].lower() == md5.hexdigest()
+            if not verified:
+                raise OpenProjectAPIError(
+                    f"Checksum mismatch for {file_name}: uploaded MD5 {md5.hexdigest()}, "
+                    f"server stored {expected['hash']}"
+                    + await self._discard_attachment(attachment.get("id"))
+                )
+        return {
+            "attachment": attachment,
+            "size": size,
+            "md5": md5.hexdigest(),
+            "sha256": sha256.hexdigest(),
+            "verified": verified,
+            "seconds": time.perf_counter() - started
+        }
     
-    def __init__(self):
-        self.server = Server("openproject-mcp")
-        self.client: Optional[OpenProjectClient] = None
-        self._setup_handlers()
+    async def _discard_attachment(self, attachment_id: Optional[int]) -> str:
+        """
+        Delete an attachment whose upload failed verification.
         
-    def _setup_handlers(self):
-        """Register all MCP handlers"""
+        Returns:
+            str: Sentence for the error message saying whether the bad copy is gone
+        """
+        if attachment_id is None:
+            return ""
+        try:
+            await self._send("DELETE", f"/attachments/{attachment_id}")
+        except OpenProjectAPIError as e:
+            logger.warning(f"Could not delete unverified attachment {attachment_id}: {e}")
+            return f". The bad copy (attachment {attachment_id}) could not be removed: {e}"
+        return f". The bad copy (attachment {attachment_id}) was removed."
+    
+    async def download_attachment(
+        self,
+        attachment_id: int,
+        directory: str,
+        overwrite: bool = False,
+        claimed: Optional[set] = None
+    ) -> Dict[str, Any]:
+        """
+        Download an attachment into a directory, streaming it to disk.
         
-        @self.server.list_tools()
-        async def list_tools() -> List[Tool]:
-            """List available tools"""
-            return [
-                Tool(
-                    name="test_connection",
-                    description="Test the connection to the OpenProject API",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                Tool(
-                    name="list_projects",
-                    description="List all OpenProject projects",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "active_only": {
-                                "type": "boolean",
-                                "description": "Show only active projects",
-                                "default": True
-                            }
+        The content is written to a uniquely named part file in the target
+        directory chunk by chunk while its MD5 and SHA-256 are computed, so
+        memory use does not depend on the file size. The part file is only
+        published under the attachment's name once the size and MD5 match
+        the attachment's metadata; otherwise it is deleted. Without
+        ``overwrite`` it is hard-linked into place, so a file created by
+        someone else in the meantime is never replaced.
+        
+        Args:
+            attachment_id: Attachment ID
+            directory: Existing directory to save the file in
+            overwrite: Replace an existing file of the same name
+            claimed: File names already taken by other downloads of the same
+                batch; a repeated name gets a " (2)", " (3)", ... suffix
+            
+        Returns:
+            Dict: ``attachment`` (the metadata), ``path``, ``size``, ``md5``,
+            ``sha256``, ``verified`` (None when the server sent no digest)
+            and ``seconds``
+            
+        Raises:
+            OpenProjectAPIError: If the download fails or the digests differ
+            FileExistsError: If the target exists and ``overwrite`` is False
+        """
+        attachment = await self._request("GET", f"/attachments/{attachment_id}")
+        # Never let a server-provided name escape the target directory
+        file_name = os.path.basename(attachment.get("fileName") or "") or f"attachment-{attachment_id}"
+        if claimed is not None:
+            stem, extension = os.path.splitext(file_name)
+            candidate, number = file_name, 1
+            while candidate in claimed:
+                number += 1
+                candidate = f"{stem} ({number}){extension}"
+            claimed.add(candidate)
+            file_name = candidate
+        target = os.path.join(directory, file_name)
+        if not overwrite and os.path.lexists(target):
+            raise FileExistsError(f"{target} already exists; pass overwrite to replace it")
+        
+        started = time.perf_counter()
+        md5, sha256 = hashlib.md5(), hashlib.sha256()
+        size = 0
+        part_path = None
+        _, response, _ = await self._send(
+            "GET", f"/attachments/{attachment_id}/content", stream=True, transfer=True
+        )
+        try:
+            descriptor, part_path = await asyncio.to_thread(
+                tempfile.mkstemp, prefix=f".{file_name}.", suffix=".part", dir=directory
+            )
+            handle = await asyncio.to_thread(os.fdopen, descriptor, "wb")
+            try:
+                async for chunk in response.content.iter_chunked(self.TRANSFER_CHUNK_BYTES):
+                    await asyncio.to_thread(self._write_and_hash, handle, chunk, [md5, sha256])
+                    size += len(chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+        except BaseException as e:
+            if part_path:
+                self._remove_quietly(part_path)
+            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                raise OpenProjectAPIError(
+                    f"Network error downloading attachment {attachment_id}: {str(e) or type(e).__name__}"
+                )
+            raise
+        finally:
+            response.release()
+            self.metrics.inc("openproject_mcp_attachment_bytes_total", size, direction="download", **self.labels)
+        
+        expected = attachment.get("digest") or {}
+        problem = None
+        if attachment.get("fileSize") is not None and attachment["fileSize"] != size:
+            problem = f"expected {attachment['fileSize']} bytes, received {size}"
+        verified = None
+        if expected.get("algorithm", "").lower() == "md5" and expected.get("hash"):
+            verified = expected["hash"].lower() == md5.hexdigest()
+            if not verified:
+                problem = f"expected MD5 {expected['hash']}, received {md5.hexdigest()}"
+        if problem:
+            self._remove_quietly(part_path)
+            raise OpenProjectAPIError(f"Checksum mismatch for attachment {attachment_id}: {problem}")
+        
+        try:
+            await asyncio.to_thread(self._publish, part_path, target, overwrite)
+        except BaseException:
+            self._remove_quietly(part_path)
+            raise
+        return {
+            "attachment": attachment,
+            "path": target,
+            "size": size,
+            "md5": md5.hexdigest(),
+            "sha256": sha256.hexdigest(),
+            "verified": verified,
+            "seconds": time.perf_counter() - started
+        }
+    
+    @staticmethod
+    def _publish(part_path: str, target: str, overwrite: bool) -> None:
+        """
+        Move a verified download to its final name (runs in a thread).
+        
+        Without ``overwrite`` the name is taken atomically: a hard link
+        fails if the target appeared meanwhile, where a check followed by
+        a rename would silently replace it.
+        
+        Raises:
+            FileExistsError: If the target exists and ``overwrite`` is False
+        """
+        if overwrite:
+            os.replace(part_path, target)
+            return
+        try:
+            os.link(part_path, target)
+        except FileExistsError:
+            raise FileExistsError(f"{target} already exists; pass overwrite to replace it")
+        except OSError:
+            # No hard links on this file system: reserve the name exclusively instead
+            try:
+                os.close(os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                raise FileExistsError(f"{target} already exists; pass overwrite to replace it")
+            os.replace(part_path, target)
+            return
+        os.remove(part_path)
+    
+    @staticmethod
+    def _remove_quietly(path: str) -> None:
+        """Delete a partial download, ignoring files that are already gone"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    async def transfer_attachments(
+        self,
+        transfers: List[Callable[[], Any]],
+        concurrency: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several uploads or downloads with at most ``concurrency`` in flight.
+        
+        A failing transfer does not abort the others.
+        
+        Args:
+            transfers: Zero-argument callables returning the transfer coroutine
+            concurrency: Maximum transfers in flight
+            
+        Returns:
+            List[Dict]: One result per transfer, in input order, with "ok" and
+            either the transfer's result fields or "error"
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(transfer: Callable[[], Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {"ok": True, **(await transfer())}
+                except (OpenProjectAPIError, OSError) as e:
+                    return {"ok": False, "error": str(e)}
+        
+        return await asyncio.gather(*(run(transfer) for transfer in transfers))
+    
+    async def get_types(self, project_id: Optional[int] = None) -> Dict:
+        """
+        Retrieve available work package types.
+        
+        Args:
+            project_id: Optional project ID to filter types by
+            
+        Returns:
+            Dict: API response containing types
+        """
+        if project_id:
+            endpoint = f"/projects/{project_id}/types"
+        else:
+            endpoint = "/types"
+            
+        result = await self._request("GET", endpoint)
+        return self._with_elements(result)
+    
+    async def get_priorities(self) -> Dict:
+        """
+        Retrieve available work package priorities.
+        
+        Returns:
+            Dict: API response containing priorities
+        """
+        result = await self._request("GET", "/priorities")
+        return self._with_elements(result)
+    
+    async def get_statuses(self) -> Dict:
+        """
+        Retrieve available work package statuses.
+        
+        Returns:
+            Dict: API response containing statuses
+        """
+        result = await self._request("GET", "/statuses")
+        return self._with_elements(result)
+    
+    @staticmethod
+    def _with_elements(result: Dict) -> Dict:
+        """
+        Ensure a collection response has ``_embedded.elements``.
+        
+        The response may be the metadata cache's entry or a body shared by
+        coalesced callers, so a missing list goes into a new dict and the
+        response itself is never modified.
+        """
+        embedded = result.get("_embedded") or {}
+        if "elements" in embedded:
+            return result
+        return {**result, "_embedded": {**embedded, "elements": []}}
+
+
+@contextmanager
+def _environment(overrides: Dict[str, Any]) -> Iterator[None]:
+    """Temporarily apply environment variable overrides, e.g. while building a client"""
+    saved = {name: os.environ.get(name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            os.environ[name] = str(value)
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class InstanceRegistry:
+    """
+    Named OpenProject instances served by one MCP server.
+    
+    Every instance gets its own client, so connection pools, metadata
+    caches, retry budgets and circuit breakers are never shared: a slow or
+    failing instance cannot starve or trip the others. Instances are read
+    from the JSON file named by OPENPROJECT_INSTANCES_FILE::
+    
+        {
+          "default": "production",
+          "instances": {
+            "production": {"url": "https://op.example.com", "api_key_env": "PROD_OPENPROJECT_API_KEY"},
+            "staging": {
+              "url": "https://staging.example.com",
+              "api_key": "...",
+              "proxy": "http://proxy:8080",
+              "settings": {"OPENPROJECT_POOL_LIMIT_PER_HOST": 4}
+            }
+          }
+        }
+    
+    ``settings`` override the OPENPROJECT_* tuning variables for one
+    instance. Without a file the instance from OPENPROJECT_URL is registered
+    under OPENPROJECT_INSTANCE_NAME.
+    """
+    
+    def __init__(self, clients: Dict[str, OpenProjectClient], default: str):
+        """
+        Initialize the registry.
+        
+        Args:
+            clients: Clients by instance name
+            default: Name of the instance used when a call names none
+        """
+        if default not in clients:
+            raise ValueError(f"Default instance {default!r} is not configured")
+        self.clients = clients
+        self.default = default
+    
+    @classmethod
+    def from_env(cls, metrics: Optional[Metrics] = None) -> Optional["InstanceRegistry"]:
+        """
+        Build the registry from OPENPROJECT_INSTANCES_FILE or OPENPROJECT_URL.
+        
+        Args:
+            metrics: Optional metrics registry shared by all clients
+            
+        Returns:
+            Optional[InstanceRegistry]: Registry, or None if nothing is configured
+            
+        Raises:
+            ValueError: If the instances file is unreadable or invalid
+        """
+        path = os.getenv("OPENPROJECT_INSTANCES_FILE")
+        if path:
+            return cls.from_file(path, metrics)
+        
+        base_url = os.getenv("OPENPROJECT_URL")
+        api_key = os.getenv("OPENPROJECT_API_KEY")
+        if not base_url or not api_key:
+            return None
+        name = os.getenv("OPENPROJECT_INSTANCE_NAME", "default")
+        client = OpenProjectClient.from_env(base_url, api_key, os.getenv("OPENPROJECT_PROXY"), metrics=metrics)
+        return cls({name: client}, name)
+    
+    @classmethod
+    def from_file(cls, path: str, metrics: Optional[Metrics] = None) -> "InstanceRegistry":
+        """
+        Build the registry from an instances file.
+        
+        Args:
+            path: Path to the JSON instances file
+            metrics: Optional metrics registry shared by all clients
+            
+        Returns:
+            InstanceRegistry: One client per configured instance
+            
+        Raises:
+            ValueError: If the file is unreadable, malformed or lacks a URL or key
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read instances file {path}: {e}")
+        
+        instances = config.get("instances") if isinstance(config, dict) else None
+        if not instances or not isinstance(instances, dict):
+            raise ValueError(f"Instances file {path} defines no instances")
+        
+        clients = {}
+        for name, instance in instances.items():
+            api_key = instance.get("api_key") or os.getenv(instance.get("api_key_env") or "")
+            if not instance.get("url") or not api_key:
+                raise ValueError(f"Instance {name!r} needs a url and an api_key or api_key_env")
+            with _environment(instance.get("settings") or {}):
+                client = OpenProjectClient.from_env(
+                    instance["url"], api_key, instance.get("proxy"), metrics=metrics
+                )
+            client.labels = {"instance": name}
+            clients[name] = client
+        return cls(clients, config.get("default") or next(iter(clients)))
+    
+    def __len__(self) -> int:
+        return len(self.clients)
+    
+    @property
+    def names(self) -> List[str]:
+        """Instance names in configuration order"""
+        return list(self.clients)
+    
+    def get(self, name: Optional[str] = None) -> OpenProjectClient:
+        """
+        Look up an instance's client.
+        
+        Args:
+            name: Instance name, or None for the default instance
+            
+        Returns:
+            OpenProjectClient: The instance's client
+            
+        Raises:
+            ValueError: If no instance has that name
+        """
+        client = self.clients.get(name or self.default)
+        if client is None:
+            raise ValueError(f"Unknown instance {name!r}; configured instances: {', '.join(self.clients)}")
+        return client
+    
+    async def open(self) -> None:
+        """Create every instance's connection pool"""
+        for client in self.clients.values():
+            await client.open()
+    
+    async def close(self) -> None:
+        """Close every instance's connection pool"""
+        for client in self.clients.values():
+            await client.close()
+    
+    def load_snapshot(self, path: str) -> int:
+        """
+        Restore the instances' metadata caches from a snapshot file.
+        
+        Args:
+            path: Snapshot file written by ``save_snapshot``
+            
+        Returns:
+            int: Number of restored cache entries
+        """
+        try:
+            with open(path, "rb") as f:
+                snapshot = _json_loads(f.read())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache snapshot {path}: {e}")
+            return 0
+        
+        restored = 0
+        saved_instances = snapshot.get("instances") if isinstance(snapshot, dict) else None
+        for name, client in self.clients.items():
+            saved = (saved_instances or {}).get(client.snapshot_key)
+            if not client.cache or not saved:
+                continue
+            try:
+                restored += client.cache.restore(saved["entries"], time.time() - saved["saved_at"])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Ignoring malformed cache snapshot of {name}: {e}")
+        return restored
+    
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the instances' metadata caches to a snapshot file.
+        
+        Entries of instances or API keys this server does not use are kept,
+        so servers with different configurations can share one file. The
+        file is replaced atomically and only readable by its owner.
+        
+        Args:
+            path: Snapshot file to write
+        """
+        try:
+            with open(path, "rb") as f:
+                snapshot = _json_loads(f.read())
+            instances = snapshot["instances"]
+        except (OSError, ValueError, KeyError, TypeError):
+            instances = {}
+        if not isinstance(instances, dict):
+            instances = {}
+        
+        for client in self.clients.values():
+            if client.cache:
+                instances[client.snapshot_key] = {"saved_at": time.time(), "entries": client.cache.snapshot()}
+        
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            f.write(_json_dumps({"version": 1, "instances": instances}))
+        os.replace(temporary, path)
+    
+    def collect_metrics(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Export every client's cache, retry and breaker state, labelled by instance"""
+        samples = []
+        for client in self.clients.values():
+            samples.extend(client.collect_metrics())
+        return samples
+
+
+class InstanceFanOut:
+    """
+    Merge collections fetched from several instances as they arrive.
+    
+    Each instance's paginator is drained by its own task into a shared
+    queue, so elements are yielded in arrival order and a slow instance never
+    holds back the ones that already answered. Every instance gets at most
+    ``timeout`` seconds; one that fails or runs out of time is recorded in
+    ``status`` while the others carry on. Closing the iteration early cancels
+    the fetches still running.
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, sources: Dict[str, CollectionPaginator], timeout: float = 30.0):
+        """
+        Initialize the fan-out.
+        
+        Args:
+            sources: Paginators by instance name
+            timeout: Seconds each instance may take to deliver its elements
+        """
+        self.sources = sources
+        self.timeout = timeout
+        self.status: Dict[str, Dict[str, Any]] = {
+            name: {"state": "pending", "total": None, "error": None}
+            for name in sources
+        }
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._iterator = None
+    
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Dict]]:
+        self._iterator = self._iterate()
+        return self._iterator
+    
+    async def aclose(self) -> None:
+        """Stop early, cancelling the instances still being fetched"""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+    
+    async def _drain(self, name: str, paginator: CollectionPaginator) -> None:
+        """Move one instance's elements into the queue"""
+        try:
+            async for element in paginator:
+                self.status[name]["total"] = paginator.total
+                await self._queue.put((name, element))
+        finally:
+            await paginator.aclose()
+    
+    async def _pump(self, name: str, paginator: CollectionPaginator) -> None:
+        """Drain one instance within its deadline and record how it ended"""
+        status = self.status[name]
+        try:
+            await asyncio.wait_for(self._drain(name, paginator), self.timeout)
+            status["state"] = "ok"
+            status["total"] = paginator.total
+        except asyncio.TimeoutError:
+            status["state"] = "timeout"
+        except asyncio.CancelledError:
+            status["state"] = "stopped"
+            raise
+        except Exception as e:
+            status["state"] = "error"
+            status["error"] = str(e)
+        finally:
+            self._queue.put_nowait((name, self._DONE))
+    
+    async def _iterate(self) -> AsyncIterator[Tuple[str, Dict]]:
+        tasks = [
+            asyncio.ensure_future(self._pump(name, paginator))
+            for name, paginator in self.sources.items()
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                name, element = await self._queue.get()
+                if element is self._DONE:
+                    remaining -= 1
+                    continue
+                yield name, element
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _href_id(link: Optional[Dict]) -> Optional[int]:
+    """Extract the numeric ID from a HAL link such as /api/v3/statuses/7"""
+    href = (link or {}).get("href")
+    if not href:
+        return None
+    tail = href.rstrip("/").rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+_DURATION = re.compile(
+    r"P(?:(?P<days>\d+(?:\.\d+)?)D)?"
+    r"(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?(?:(?P<minutes>\d+(?:\.\d+)?)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$"
+)
+
+
+def _duration_hours(value: Optional[str]) -> float:
+    """Hours in an ISO 8601 duration such as PT5H30M, 0 for missing or unparsable values"""
+    match = _DURATION.match(value or "")
+    if not match:
+        return 0.0
+    parts = {key: float(amount) for key, amount in match.groupdict().items() if amount}
+    return (
+        parts.get("days", 0) * 24
+        + parts.get("hours", 0)
+        + parts.get("minutes", 0) / 60
+        + parts.get("seconds", 0) / 3600
+    )
+
+
+def _sum_values(sums: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Server-side sums with durations converted to hours; other values are kept as sent"""
+    return {
+        field: _duration_hours(value) if isinstance(value, str) and value.startswith("P") else value
+        for field, value in (sums or {}).items()
+        if not field.startswith("_")
+    }
+
+
+def _related_name(wp: Dict, relation: str) -> Optional[str]:
+    """Name of a related resource, from _embedded if present, else the link title"""
+    embedded = (wp.get("_embedded") or {}).get(relation)
+    if embedded:
+        return embedded.get("name")
+    return ((wp.get("_links") or {}).get(relation) or {}).get("title")
+
+
+class OutputBuilder:
+    """
+    Assemble a tool response in linear time within a size budget.
+    
+    Rendered items are collected in a list and joined once at the end. An
+    item that would exceed the character or item budget is refused, so the
+    caller can stop fetching and hand out a continuation cursor instead.
+    """
+    
+    def __init__(self, max_chars: int = 50000, max_items: int = 500):
+        """
+        Initialize the builder.
+        
+        Args:
+            max_chars: Character budget for all items (the first item is always kept)
+            max_items: Item budget, 0 for no limit
+        """
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.parts: List[str] = []
+        self.chars = 0
+        self.items = 0
+        self.truncated = False
+    
+    @classmethod
+    def from_env(cls) -> "OutputBuilder":
+        """Build a builder from OPENPROJECT_OUTPUT_* environment variables"""
+        return cls(
+            max_chars=_env_int("OPENPROJECT_OUTPUT_MAX_CHARS", 50000),
+            max_items=_env_int("OPENPROJECT_OUTPUT_MAX_ITEMS", 500)
+        )
+    
+    def item_limit(self, requested: Optional[int] = None) -> Optional[int]:
+        """Smaller of a requested result count and the item budget"""
+        limits = [limit for limit in (requested, self.max_items) if limit and limit > 0]
+        return min(limits) if limits else None
+    
+    def add_item(self, text: str) -> bool:
+        """
+        Append a rendered item if it fits the budget.
+        
+        Args:
+            text: Rendered item
+            
+        Returns:
+            bool: False if the item was refused because the budget is spent
+        """
+        if 0 < self.max_items <= self.items or (
+            self.items and self.chars + len(text) > self.max_chars
+        ):
+            self.truncated = True
+            return False
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars] + "…\n\n"
+        self.parts.append(text)
+        self.chars += len(text)
+        self.items += 1
+        return True
+    
+    def render(self, header: str, footer: str = "") -> str:
+        """Join header, items and footer into the response text"""
+        return "".join([header, *self.parts, footer])
+
+
+# Arguments that may change between the calls of a continued listing
+_CURSOR_VOLATILE_ARGUMENTS = ("cursor", "max_results", "page_size", "limit", "refresh")
+
+
+def _query_fingerprint(tool: str, arguments: Dict[str, Any]) -> str:
+    """Short hash identifying a tool query independently of its slice"""
+    query = {k: v for k, v in arguments.items() if k not in _CURSOR_VOLATILE_ARGUMENTS}
+    digest = hashlib.sha1(json.dumps([tool, query], sort_keys=True).encode()).hexdigest()
+    return digest[:12]
+
+
+def _encode_cursor(tool: str, arguments: Dict[str, Any], position: int, page_size: int) -> str:
+    """
+    Build an opaque continuation cursor.
+    
+    Args:
+        tool: Tool the cursor continues
+        arguments: Arguments of the call being continued
+        position: Index of the next element
+        page_size: Page size the listing was fetched with
+        
+    Returns:
+        str: URL-safe cursor string
+    """
+    state = {"q": _query_fingerprint(tool, arguments), "i": position, "p": page_size}
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(tool: str, arguments: Dict[str, Any]) -> Tuple[int, Optional[int]]:
+    """
+    Read the cursor argument of a call.
+    
+    Args:
+        tool: Tool being called
+        arguments: Call arguments, possibly with a ``cursor``
+        
+    Returns:
+        Tuple[int, Optional[int]]: Start position and page size (0 and the
+        requested page size without a cursor)
+        
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another query
+    """
+    cursor = arguments.get("cursor")
+    if not cursor:
+        return 0, arguments.get("page_size")
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position, page_size = int(state["i"]), state["p"]
+        fingerprint = state["q"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor; repeat the query without one")
+    if fingerprint != _query_fingerprint(tool, arguments):
+        raise ValueError("Cursor belongs to a different query; pass the same filters as the first call")
+    return position, page_size
+
+
+class WorkPackageMirror:
+    """
+    Local SQLite copy of work packages for fast local queries.
+    
+    Work packages are stored as projected columns (IDs, subject, progress,
+    lock version, updatedAt) with the names of statuses, types, users and
+    projects normalised into a separate lookup table, so rows stay small.
+    The mirror is kept fresh by incremental syncs that only fetch work
+    packages updated since the last high-water mark. Those cannot see
+    deletions or lost permissions, so every ``reconcile_interval`` seconds
+    a sync also fetches the IDs of all remote work packages and drops the
+    rows missing from them. All database access runs on one worker thread
+    so the event loop never blocks on SQLite.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS work_packages (
+            id INTEGER PRIMARY KEY,
+            project_id INTEGER,
+            subject TEXT NOT NULL,
+            status_id INTEGER,
+            type_id INTEGER,
+            assignee_id INTEGER,
+            priority_id INTEGER,
+            percentage_done INTEGER,
+            lock_version INTEGER,
+            updated_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS wp_project ON work_packages (project_id);
+        CREATE INDEX IF NOT EXISTS wp_status ON work_packages (status_id);
+        CREATE INDEX IF NOT EXISTS wp_type ON work_packages (type_id);
+        CREATE INDEX IF NOT EXISTS wp_assignee ON work_packages (assignee_id);
+        CREATE INDEX IF NOT EXISTS wp_updated ON work_packages (updated_at);
+        CREATE TABLE IF NOT EXISTS names (
+            kind TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            name TEXT,
+            is_closed INTEGER,
+            PRIMARY KEY (kind, id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sync_state (
+            scope TEXT PRIMARY KEY,
+            high_water TEXT,
+            synced_at REAL,
+            reconciled_at REAL
+        ) WITHOUT ROWID;
+    """
+    
+    # relation name in the HAL resource -> kind in the names table
+    RELATIONS = {
+        "project": "project",
+        "status": "status",
+        "type": "type",
+        "assignee": "user",
+        "priority": "priority"
+    }
+    
+    # Only these fields are requested from the API while syncing
+    FIELDS = [
+        "id", "subject", "percentageDone", "lockVersion", "updatedAt",
+        "project", "status", "type", "assignee", "priority"
+    ]
+    
+    def __init__(self, path: str = ":memory:", page_size: int = 1000, reconcile_interval: float = 3600.0):
+        """
+        Initialize the mirror.
+        
+        Args:
+            path: SQLite database path, or ":memory:"
+            page_size: Work packages requested per API page while syncing
+            reconcile_interval: Seconds between ID reconciliations that drop
+                deleted work packages (0 disables them)
+        """
+        self.path = path
+        self.page_size = page_size
+        self.reconcile_interval = reconcile_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wp-mirror")
+        self._db: "Optional[sqlite3.Connection]" = None
+        self._sync_lock = asyncio.Lock()
+    
+    async def _run(self, func, *args):
+        """Run a database function on the mirror's worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def open(self) -> None:
+        """Open the database and create the schema"""
+        await self._run(self._open_db)
+    
+    def _open_db(self) -> None:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(sync_state)")}
+            if "reconciled_at" not in columns:
+                # Mirrors created before reconciliation existed
+                self._db.execute("ALTER TABLE sync_state ADD COLUMN reconciled_at REAL")
+    
+    async def close(self) -> None:
+        """Close the database and stop the worker thread"""
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
+    
+    @classmethod
+    def _project(cls, wp: Dict) -> Tuple[tuple, List[tuple]]:
+        """Project a HAL work package onto a row plus (kind, id, name) tuples"""
+        links = wp.get("_links") or {}
+        ids = {}
+        names = []
+        for relation, kind in cls.RELATIONS.items():
+            related_id = _href_id(links.get(relation))
+            ids[relation] = related_id
+            if related_id is not None:
+                names.append((kind, related_id, _related_name(wp, relation)))
+        row = (
+            wp.get("id"),
+            ids["project"],
+            wp.get("subject") or "",
+            ids["status"],
+            ids["type"],
+            ids["assignee"],
+            ids["priority"],
+            wp.get("percentageDone"),
+            wp.get("lockVersion"),
+            wp.get("updatedAt")
+        )
+        return row, names
+    
+    def _upsert(self, rows: List[tuple], names: Dict[Tuple[str, int], Optional[str]]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO work_packages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.executemany(
+                "INSERT INTO names (kind, id, name) VALUES (?, ?, ?) "
+                "ON CONFLICT (kind, id) DO UPDATE SET name = excluded.name "
+                "WHERE excluded.name IS NOT NULL",
+                [(kind, related_id, name) for (kind, related_id), name in names.items()]
+            )
+    
+    def _store_statuses(self, statuses: List[Dict]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO names (kind, id, name, is_closed) VALUES ('status', ?, ?, ?) "
+                "ON CONFLICT (kind, id) DO UPDATE SET name = excluded.name, "
+                "is_closed = excluded.is_closed",
+                [
+                    (status.get("id"), status.get("name"), 1 if status.get("isClosed") else 0)
+                    for status in statuses
+                    if status.get("id") is not None
+                ]
+            )
+    
+    def _get_state(self, scope: str) -> Tuple[Optional[str], Optional[float], Optional[float]]:
+        row = self._db.execute(
+            "SELECT high_water, synced_at, reconciled_at FROM sync_state WHERE scope = ?",
+            (scope,)
+        ).fetchone()
+        return (row[0], row[1], row[2]) if row else (None, None, None)
+    
+    def _set_state(self, scope: str, high_water: Optional[str], reconciled: bool) -> None:
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (scope) DO UPDATE SET high_water = excluded.high_water, "
+                "synced_at = excluded.synced_at, "
+                "reconciled_at = COALESCE(excluded.reconciled_at, reconciled_at)",
+                (scope, high_water, now, now if reconciled else None)
+            )
+    
+    def _drop_unseen(self, project_id: Optional[int], seen: List[int]) -> int:
+        with self._db:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS seen (id INTEGER PRIMARY KEY)")
+            self._db.execute("DELETE FROM seen")
+            self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((i,) for i in seen))
+            sql = "DELETE FROM work_packages WHERE id NOT IN (SELECT id FROM seen)"
+            params: tuple = ()
+            if project_id:
+                sql += " AND project_id = ?"
+                params = (project_id,)
+            removed = self._db.execute(sql, params).rowcount
+            self._db.execute("DELETE FROM seen")
+            return removed
+    
+    async def sync(
+        self,
+        client: "OpenProjectClient",
+        project_id: Optional[int] = None,
+        full: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bring the mirror up to date with the remote instance.
+        
+        Only work packages updated at or after the stored high-water mark are
+        fetched. A full sync refetches everything and also drops work
+        packages that no longer exist remotely. An incremental sync does the
+        same with only the IDs once ``reconcile_interval`` has passed since
+        the scope was last compared with the remote instance.
+        
+        Args:
+            client: Client used to fetch work packages
+            project_id: Sync only this project (default: all work packages)
+            full: Refetch everything instead of syncing incrementally
+            
+        Returns:
+            Dict: Number of fetched and removed work packages, whether the
+            IDs were reconciled, the new high-water mark and timing
+        """
+        scope = f"project:{project_id}" if project_id else "all"
+        async with self._sync_lock:
+            started = time.monotonic()
+            high_water, _, reconciled_at = await self._run(self._get_state, scope)
+            if full or high_water is None:
+                full = True
+                high_water = None
+                filters = json.dumps([])
+            else:
+                filters = json.dumps([
+                    {"updatedAt": {"operator": "<>d", "values": [high_water, ""]}}
+                ])
+            
+            statuses = await client.get_statuses()
+            await self._run(self._store_statuses, statuses["_embedded"]["elements"])
+            
+            rows: List[tuple] = []
+            names: Dict[Tuple[str, int], Optional[str]] = {}
+            seen: List[int] = []
+            newest = high_water
+            work_packages = client.iter_work_packages(
+                project_id,
+                filters,
+                page_size=self.page_size,
+                fields=self.FIELDS
+            )
+            async for wp in work_packages:
+                row, row_names = self._project(wp)
+                if row[0] is None:
+                    continue
+                rows.append(row)
+                for kind, related_id, name in row_names:
+                    if name is not None or (kind, related_id) not in names:
+                        names[(kind, related_id)] = name
+                seen.append(row[0])
+                if row[-1] and (newest is None or row[-1] > newest):
+                    newest = row[-1]
+                if len(rows) >= 500:
+                    await self._run(self._upsert, rows, names)
+                    rows, names = [], {}
+            
+            if rows:
+                await self._run(self._upsert, rows, names)
+            reconcile = not full and self.reconcile_interval > 0 and (
+                reconciled_at is None or time.time() - reconciled_at >= self.reconcile_interval
+            )
+            removed = 0
+            if full:
+                removed = await self._run(self._drop_unseen, project_id, seen)
+            elif reconcile:
+                remote_ids = await self._remote_ids(client, project_id)
+                removed = await self._run(self._drop_unseen, project_id, remote_ids)
+            await self._run(self._set_state, scope, newest, full or reconcile)
+            
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Mirror sync ({scope}): {len(seen)} work package(s) fetched, "
+                f"{removed} removed in {elapsed:.2f}s"
+            )
+            return {
+                "scope": scope,
+                "fetched": len(seen),
+                "removed": removed,
+                "reconciled": full or reconcile,
+                "high_water": newest,
+                "seconds": elapsed
+            }
+    
+    async def _remote_ids(self, client: "OpenProjectClient", project_id: Optional[int]) -> List[int]:
+        """IDs of every work package the API still returns for a scope"""
+        ids = []
+        async for wp in client.iter_work_packages(
+            project_id,
+            json.dumps([]),
+            page_size=self.page_size,
+            fields=["id"]
+        ):
+            if wp.get("id") is not None:
+                ids.append(wp["id"])
+        return ids
+    
+    def _query(self, sql: str, params: List[Any]) -> List[tuple]:
+        return self._db.execute(sql, params).fetchall()
+    
+    async def query(
+        self,
+        project_id: Optional[int] = None,
+        status: str = "all",
+        type_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+        priority_id: Optional[int] = None,
+        subject_contains: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[Dict], int]:
+        """
+        Query mirrored work packages.
+        
+        Args:
+            project_id: Only this project
+            status: "open", "closed" or "all"
+            type_id: Only this type
+            assignee_id: Only this assignee
+            priority_id: Only this priority
+            subject_contains: Case-insensitive substring of the subject
+            updated_after: Only work packages updated after this ISO timestamp
+            limit: Maximum number of rows returned
+            offset: Number of leading rows to skip
+            
+        Returns:
+            Tuple[List[Dict], int]: Matching rows (newest first) and the total match count
+        """
+        where = []
+        params: List[Any] = []
+        for column, value in (
+            ("wp.project_id", project_id),
+            ("wp.type_id", type_id),
+            ("wp.assignee_id", assignee_id),
+            ("wp.priority_id", priority_id)
+        ):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if status == "open":
+            where.append("COALESCE(st.is_closed, 0) = 0")
+        elif status == "closed":
+            where.append("st.is_closed = 1")
+        if subject_contains:
+            where.append("wp.subject LIKE ? ESCAPE '\\'")
+            escaped = re.sub(r"([%_\\])", r"\\\1", subject_contains)
+            params.append(f"%{escaped}%")
+        if updated_after:
+            where.append("wp.updated_at > ?")
+            params.append(updated_after)
+        
+        joins = """
+            FROM work_packages wp
+            LEFT JOIN names st ON st.kind = 'status' AND st.id = wp.status_id
+        """
+        condition = f" WHERE {' AND '.join(where)}" if where else ""
+        
+        total = (await self._run(self._query, f"SELECT COUNT(*) {joins}{condition}", params))[0][0]
+        rows = await self._run(
+            self._query,
+            f"""
+            SELECT wp.id, wp.subject, wp.percentage_done, wp.updated_at,
+                   pr.name, st.name, ty.name, us.name, pi.name
+            {joins}
+            LEFT JOIN names pr ON pr.kind = 'project' AND pr.id = wp.project_id
+            LEFT JOIN names ty ON ty.kind = 'type' AND ty.id = wp.type_id
+            LEFT JOIN names us ON us.kind = 'user' AND us.id = wp.assignee_id
+            LEFT JOIN names pi ON pi.kind = 'priority' AND pi.id = wp.priority_id
+            {condition}
+            ORDER BY wp.updated_at DESC, wp.id DESC
+            LIMIT ? OFFSET ?
+            """,
+            params + [limit, offset]
+        )
+        keys = (
+            "id", "subject", "percentage_done", "updated_at",
+            "project", "status", "type", "assignee", "priority"
+        )
+        return [dict(zip(keys, row)) for row in rows], total
+    
+    async def last_synced(self, project_id: Optional[int] = None) -> Optional[float]:
+        """Wall-clock time of the last sync of a scope, or None if never synced"""
+        scope = f"project:{project_id}" if project_id else "all"
+        _, synced_at, _ = await self._run(self._get_state, scope)
+        return synced_at
+
+
+class _Watch:
+    """Polling state and recent deltas of one change feed scope"""
+    
+    def __init__(self, project_id: Optional[int], interval: float, buffer: int):
+        self.project_id = project_id
+        self.interval = interval
+        self.next_poll = 0.0
+        self.polled_at: Optional[float] = None
+        self.high_water: Optional[str] = None
+        self.ids_at_high_water: set = set()
+        self.changes: deque = deque(maxlen=buffer)
+        self.sequence = 0
+        self.pinned = False
+        self.subscribers = 0
+        self.lease_until = 0.0
+        self.lock = asyncio.Lock()
+
+
+class ChangeFeed:
+    """
+    Work package change feed behind the openproject://changes/ resources.
+    
+    Each watched scope (all work packages or one project) keeps an
+    ``updatedAt`` high-water mark. A poll asks only for work packages
+    updated at or after it, with a sparse fieldset, and appends them as
+    numbered deltas to a bounded buffer. The poll interval adapts per scope:
+    it drops to the minimum after a poll that found changes and doubles
+    after each idle poll up to the maximum, so quiet projects cost one
+    empty request every few minutes. Scopes are only polled while they are
+    pinned by configuration, subscribed to, or recently read.
+    """
+    
+    URI_PREFIX = "openproject://changes/"
+    
+    # Only these fields are requested while polling
+    FIELDS = [
+        "id", "subject", "percentageDone", "lockVersion", "createdAt", "updatedAt",
+        "project", "status", "type", "assignee", "priority"
+    ]
+    
+    def __init__(
+        self,
+        min_interval: float = 15.0,
+        max_interval: float = 600.0,
+        backoff: float = 2.0,
+        buffer: int = 200,
+        page_size: int = 200,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Initialize the change feed.
+        
+        Args:
+            min_interval: Seconds between polls of a scope that is changing
+            max_interval: Upper bound on the interval of an idle scope
+            backoff: Factor the interval grows by after an idle poll
+            buffer: Deltas kept per scope for readers
+            page_size: Work packages requested per API page while polling
+            metrics: Registry for poll counters
+        """
+        self.min_interval = max(min_interval, 0.1)
+        self.max_interval = max(max_interval, self.min_interval)
+        self.backoff = max(backoff, 1.0)
+        self.buffer = max(buffer, 1)
+        self.page_size = page_size
+        self.metrics = metrics or Metrics()
+        self.watches: Dict[Optional[int], _Watch] = {}
+        self.wakeup = asyncio.Event()
+    
+    @classmethod
+    def from_env(cls, metrics: Optional[Metrics] = None) -> "ChangeFeed":
+        """Build a change feed from OPENPROJECT_WATCH_* environment variables"""
+        feed = cls(
+            min_interval=_env_float("OPENPROJECT_WATCH_MIN_INTERVAL", 15.0),
+            max_interval=_env_float("OPENPROJECT_WATCH_MAX_INTERVAL", 600.0),
+            buffer=_env_int("OPENPROJECT_WATCH_BUFFER", 200),
+            page_size=_env_int("OPENPROJECT_WATCH_PAGE_SIZE", 200),
+            metrics=metrics
+        )
+        for scope in os.getenv("OPENPROJECT_WATCH_PROJECTS", "").split(","):
+            scope = scope.strip()
+            if scope == "all":
+                feed.watch(None).pinned = True
+            elif scope.isdigit():
+                feed.watch(int(scope)).pinned = True
+        return feed
+    
+    @classmethod
+    def uri(cls, project_id: Optional[int]) -> str:
+        """Resource URI of a scope"""
+        return f"{cls.URI_PREFIX}project/{project_id}" if project_id else f"{cls.URI_PREFIX}all"
+    
+    @classmethod
+    def parse_uri(cls, uri: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Split a change feed URI into its scope and ``since`` sequence number.
+        
+        Args:
+            uri: openproject://changes/all or openproject://changes/project/{id},
+                optionally with ?since=N
+            
+        Returns:
+            Tuple[Optional[int], Optional[int]]: Project ID (None for all) and since
+        """
+        path, _, query = uri.partition("?")
+        if not path.startswith(cls.URI_PREFIX):
+            raise ValueError(f"Unknown resource: {uri}")
+        scope = path[len(cls.URI_PREFIX):].strip("/")
+        if scope == "all":
+            project_id = None
+        elif scope.startswith("project/") and scope[len("project/"):].isdigit():
+            project_id = int(scope[len("project/"):])
+        else:
+            raise ValueError(f"Unknown resource: {uri}")
+        since = None
+        for parameter in query.split("&"):
+            name, _, value = parameter.partition("=")
+            if name == "since":
+                if not value.isdigit():
+                    raise ValueError(f"Invalid since value: {value!r}")
+                since = int(value)
+        return project_id, since
+    
+    def watch(self, project_id: Optional[int]) -> _Watch:
+        """Start watching a scope, or return its existing watch"""
+        watch = self.watches.get(project_id)
+        if watch is None:
+            watch = self.watches[project_id] = _Watch(project_id, self.min_interval, self.buffer)
+            self.wakeup.set()
+        return watch
+    
+    def release(self, project_id: Optional[int]) -> None:
+        """Stop watching a scope nobody subscribes to, reads or pinned"""
+        watch = self.watches.get(project_id)
+        if watch and not watch.pinned and not watch.subscribers and watch.lease_until <= time.monotonic():
+            del self.watches[project_id]
+    
+    def due(self) -> List[_Watch]:
+        """Watches whose next poll is due, after releasing expired ones"""
+        for project_id in list(self.watches):
+            self.release(project_id)
+        now = time.monotonic()
+        return [watch for watch in self.watches.values() if watch.next_poll <= now]
+    
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next poll is due, None when nothing is watched"""
+        if not self.watches:
+            return None
+        return max(min(watch.next_poll for watch in self.watches.values()) - time.monotonic(), 0.0)
+    
+    async def poll(self, client: "OpenProjectClient", watch: _Watch) -> int:
+        """
+        Fetch the work packages of a scope changed since its high-water mark.
+        
+        The first poll of a scope only records the newest ``updatedAt`` as the
+        starting point. The filter is inclusive, so work packages already seen
+        at exactly the high-water mark are skipped.
+        
+        Args:
+            client: Client used to fetch work packages
+            watch: Scope to poll
+            
+        Returns:
+            int: Number of new deltas
+        """
+        async with watch.lock:
+            return await self._poll(client, watch)
+    
+    async def start(self, client: "OpenProjectClient", watch: _Watch) -> None:
+        """Record the starting point of a scope unless a poll already did"""
+        async with watch.lock:
+            if watch.high_water is None:
+                await self._poll(client, watch)
+    
+    def nudge(self) -> None:
+        """Poll every scope now, e.g. after this server changed work packages"""
+        for watch in self.watches.values():
+            watch.next_poll = 0.0
+        self.wakeup.set()
+    
+    async def _poll(self, client: "OpenProjectClient", watch: _Watch) -> int:
+        baseline = watch.high_water is None
+        try:
+            if baseline:
+                newest = [
+                    wp async for wp in client.iter_work_packages(
+                        watch.project_id, json.dumps([]), page_size=1, max_results=1,
+                        sort_by=[["updatedAt", "desc"]], fields=["id", "updatedAt"]
+                    )
+                ]
+                watch.high_water = (newest[0].get("updatedAt") or "") if newest else ""
+                watch.ids_at_high_water = {newest[0].get("id")} if newest else set()
+                found = 0
+            else:
+                found = await self._fetch_changes(client, watch)
+        except Exception:
+            self._schedule(watch, changed=False)
+            self.metrics.inc("openproject_mcp_feed_polls_total", outcome="error")
+            raise
+        # The first poll starts at the short interval like a poll that found changes
+        self._schedule(watch, changed=bool(found) or baseline)
+        self.metrics.inc("openproject_mcp_feed_polls_total", outcome="changed" if found else "idle")
+        if found:
+            self.metrics.inc("openproject_mcp_feed_changes_total", found)
+        return found
+    
+    async def _fetch_changes(self, client: "OpenProjectClient", watch: _Watch) -> int:
+        previous = watch.high_water
+        filters = []
+        if previous:
+            filters.append({"updatedAt": {"operator": "<>d", "values": [previous, ""]}})
+        newest, ids_at_newest = previous, set(watch.ids_at_high_water)
+        found = 0
+        async for wp in client.iter_work_packages(
+            watch.project_id,
+            json.dumps(filters),
+            page_size=self.page_size,
+            sort_by=[["updatedAt", "asc"]],
+            fields=self.FIELDS
+        ):
+            updated_at = wp.get("updatedAt") or ""
+            if updated_at == previous and wp.get("id") in watch.ids_at_high_water:
+                continue
+            if updated_at > (newest or ""):
+                newest, ids_at_newest = updated_at, set()
+            if updated_at == newest:
+                ids_at_newest.add(wp.get("id"))
+            watch.sequence += 1
+            found += 1
+            created_at = wp.get("createdAt")
+            watch.changes.append({
+                "sequence": watch.sequence,
+                "change": "created" if created_at and previous and created_at >= previous else "updated",
+                "id": wp.get("id"),
+                "subject": wp.get("subject"),
+                "lockVersion": wp.get("lockVersion"),
+                "updatedAt": wp.get("updatedAt"),
+                "percentageDone": wp.get("percentageDone"),
+                **{relation: _related_name(wp, relation) for relation in ("project", "status", "type", "assignee", "priority")}
+            })
+        watch.high_water, watch.ids_at_high_water = newest, ids_at_newest
+        return found
+    
+    def _schedule(self, watch: _Watch, changed: bool) -> None:
+        """Adapt the interval of a scope to whether its last poll found changes"""
+        if changed:
+            watch.interval = self.min_interval
+        else:
+            watch.interval = min(watch.interval * self.backoff, self.max_interval)
+        watch.polled_at = time.time()
+        watch.next_poll = time.monotonic() + watch.interval
+    
+    def read(self, project_id: Optional[int], since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Snapshot of a scope's buffered deltas.
+        
+        Args:
+            project_id: Scope to read (None for all work packages)
+            since: Only deltas with a higher sequence number
+            
+        Returns:
+            Dict: Scope state and its deltas, oldest first; ``truncated`` is
+            set when deltas after ``since`` were already dropped from the buffer
+        """
+        watch = self.watches[project_id]
+        changes = [change for change in watch.changes if since is None or change["sequence"] > since]
+        oldest = watch.changes[0]["sequence"] if watch.changes else watch.sequence + 1
+        return {
+            "uri": self.uri(project_id),
+            "project_id": project_id,
+            "sequence": watch.sequence,
+            "high_water": watch.high_water or None,
+            "polled_at": (
+                datetime.fromtimestamp(watch.polled_at, timezone.utc).isoformat()
+                if watch.polled_at else None
+            ),
+            "poll_interval_seconds": round(watch.interval, 1),
+            "truncated": since is not None and since + 1 < oldest,
+            "changes": changes
+        }
+
+
+class PrefetchScheduler:
+    """
+    Speculative background warming of the metadata a listing usually leads to.
+    
+    Agents typically follow list_projects with list_types for one of the
+    projects, and then create_work_package, which needs the create form of a
+    type. After a project or work package listing, the scheduler fetches the
+    types of the first listed projects, the form template of each project's
+    default type, and the priorities and statuses into the metadata cache.
+    
+    Prefetching runs at low priority. It sends one request at a time, and
+    only while no tool call is running. Each listing gets a budget of
+    requests and seconds. Once ``yield_at`` tool calls run at once, the
+    prefetch is cancelled so it does not compete with them for pooled
+    connections. A request a tool call is already waiting for is shared
+    through request coalescing and is not cancelled. A newer listing on the
+    same instance replaces the pending prefetch. Cache entries stored by a
+    prefetch count as prefetch hits the first time a tool call uses them.
+    """
+    
+    def __init__(
+        self,
+        max_projects: int = 3,
+        max_requests: int = 12,
+        budget: float = 10.0,
+        yield_at: int = 2,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_projects: Listed projects whose types and form are warmed
+            max_requests: Requests one listing may trigger
+            budget: Seconds one listing's prefetch may take, waiting included
+            yield_at: Concurrent tool calls that cancel a running prefetch
+            metrics: Optional metrics registry for prefetch outcomes
+        """
+        self.max_projects = max(1, max_projects)
+        self.max_requests = max(1, max_requests)
+        self.budget = budget
+        self.yield_at = max(1, yield_at)
+        self.metrics = metrics or Metrics()
+        self.foreground = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: Dict[OpenProjectClient, asyncio.Task] = {}
+    
+    @classmethod
+    def from_env(cls, metrics: Optional[Metrics] = None) -> Optional["PrefetchScheduler"]:
+        """Build a scheduler if OPENPROJECT_PREFETCH is true"""
+        if os.getenv("OPENPROJECT_PREFETCH", "false").lower() != "true":
+            return None
+        return cls(
+            max_projects=_env_int("OPENPROJECT_PREFETCH_PROJECTS", 3),
+            max_requests=_env_int("OPENPROJECT_PREFETCH_MAX_REQUESTS", 12),
+            budget=_env_float("OPENPROJECT_PREFETCH_BUDGET", 10.0),
+            yield_at=_env_int("OPENPROJECT_PREFETCH_YIELD_AT", 2),
+            metrics=metrics
+        )
+    
+    @contextmanager
+    def foreground_call(self) -> Iterator[None]:
+        """Mark a tool call as running; prefetching pauses and may be cancelled meanwhile"""
+        self.foreground += 1
+        self._idle.clear()
+        if self.foreground >= self.yield_at:
+            self.cancel()
+        try:
+            yield
+        finally:
+            self.foreground -= 1
+            if not self.foreground:
+                self._idle.set()
+    
+    def schedule(self, client: OpenProjectClient, project_ids: List[Optional[int]]) -> None:
+        """
+        Start warming the metadata related to a listing.
+        
+        Args:
+            client: Client of the instance that was listed
+            project_ids: Projects in the order they were listed, duplicates allowed
+        """
+        if not client.cache:
+            return
+        selected: List[int] = []
+        for project_id in project_ids:
+            if project_id and project_id not in selected:
+                selected.append(project_id)
+                if len(selected) == self.max_projects:
+                    break
+        if not selected:
+            return
+        previous = self._tasks.get(client)
+        if previous and not previous.done():
+            previous.cancel()
+        self._tasks[client] = asyncio.create_task(self._run(client, selected))
+    
+    def cancel(self) -> None:
+        """Cancel every running prefetch"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+    
+    async def close(self) -> None:
+        """Cancel running prefetches and wait for them to finish"""
+        self.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+    
+    async def _run(self, client: OpenProjectClient, project_ids: List[int]) -> None:
+        """Warm one listing's metadata within the request and time budget"""
+        # The task was started inside a tool call; its per-tool timeouts do not apply
+        _request_timeouts.set(None)
+        _prefetching.set(True)
+        state = {"resource": "types", "requests": 0}
+        try:
+            await asyncio.wait_for(self._warm(client, project_ids, state), self.budget)
+        except asyncio.TimeoutError:
+            self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=state["resource"], outcome="budget")
+        except asyncio.CancelledError:
+            self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=state["resource"], outcome="cancelled")
+            raise
+        finally:
+            if self._tasks.get(client) is asyncio.current_task():
+                del self._tasks[client]
+    
+    async def _warm(self, client: OpenProjectClient, project_ids: List[int], state: Dict[str, Any]) -> None:
+        """Fetch types and default-type forms of the projects, then priorities and statuses"""
+        for project_id in project_ids:
+            types = await self._fetch(
+                client, state, "types", f"/projects/{project_id}/types",
+                lambda project_id=project_id: client.get_types(project_id)
+            )
+            elements = ((types or {}).get("_embedded") or {}).get("elements") or []
+            default = next((item for item in elements if item.get("isDefault")), elements[0] if elements else None)
+            if default and default.get("id"):
+                await self._fetch(
+                    client, state, "forms", client.form_template_key(project_id, default["id"]),
+                    lambda project_id=project_id, type_id=default["id"]: client.get_form_template(project_id, type_id)
+                )
+        await self._fetch(client, state, "priorities", "/priorities", client.get_priorities)
+        await self._fetch(client, state, "statuses", "/statuses", client.get_statuses)
+    
+    async def _fetch(
+        self,
+        client: OpenProjectClient,
+        state: Dict[str, Any],
+        resource: str,
+        key: str,
+        fetch: Callable[[], Any]
+    ) -> Optional[Dict]:
+        """
+        Fetch one resource unless it is cached and fresh.
+        
+        Args:
+            client: Client to fetch with
+            state: Current resource and requests spent by this prefetch
+            resource: Resource name, for metrics
+            key: Metadata cache key of the resource
+            fetch: Sends the request through the client's cache
+            
+        Returns:
+            Optional[Dict]: The resource, or None if it failed or the request budget is spent
+        """
+        state["resource"] = resource
+        entry = client.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=resource, outcome="cached")
+            return entry.value
+        if state["requests"] >= self.max_requests:
+            self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=resource, outcome="budget")
+            return None
+        
+        await self._idle.wait()
+        state["requests"] += 1
+        try:
+            result = await fetch()
+        except OpenProjectAPIError as e:
+            logger.debug(f"Prefetch of {key} failed: {e}")
+            self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=resource, outcome="error")
+            return None
+        self.metrics.inc("openproject_mcp_prefetch_requests_total", resource=resource, outcome="fetched")
+        return result
+
+
+class _MCPServer(Server):
+    """
+    Low-level MCP server that also advertises resource subscriptions.
+    
+    Every session of every transport is one ``run`` call, whose request
+    handlers inherit its context; ``on_session_close`` lets them clean up
+    per-session state when the client disconnects.
+    """
+    
+    async def run(self, *args, **kwargs):
+        """Serve one session, then run the callbacks its requests registered"""
+        closers: List[Callable[[], None]] = []
+        token = _session_closers.set(closers)
+        try:
+            await super().run(*args, **kwargs)
+        finally:
+            _session_closers.reset(token)
+            for close in closers:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Session cleanup failed: {e}")
+    
+    @staticmethod
+    def on_session_close(callback: Callable[[], None]) -> None:
+        """Run ``callback`` when the session of the current request ends"""
+        closers = _session_closers.get()
+        if closers is not None:
+            closers.append(callback)
+    
+    def get_capabilities(self, notification_options, experimental_capabilities):
+        # The SDK always reports subscribe=False, even with a subscribe handler
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources and SubscribeRequest in self.request_handlers:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+
+class _StreamableHTTPApp:
+    """ASGI app handing every request of the Streamable HTTP endpoint to the session manager"""
+    
+    __slots__ = ("manager",)
+    
+    def __init__(self, manager):
+        self.manager = manager
+    
+    async def __call__(self, scope, receive, send) -> None:
+        await self.manager.handle_request(scope, receive, send)
+
+
+class ToolDeadlineExceeded(Exception):
+    """A tool call was cancelled because its deadline passed"""
+    
+    def __init__(self, deadline: float):
+        """
+        Initialize the error.
+        
+        Args:
+            deadline: The deadline that passed, in seconds
+        """
+        super().__init__(f"Tool call exceeded its {deadline:g}s deadline")
+        self.deadline = deadline
+
+
+class ToolLimiter:
+    """
+    Concurrency limits and deadlines for MCP tool calls.
+    
+    A call first takes a slot of its own tool, then one of the global slots,
+    so calls queued behind a busy expensive tool hold no global slot and
+    cheap tools keep running. Each call also gets a deadline covering the
+    wait and the work. The connect and read timeouts of the API requests it
+    makes can be tuned per tool.
+    
+    Per-tool settings use the tool name in upper case as suffix, e.g.
+    OPENPROJECT_TOOL_CONCURRENCY_LIST_WORK_PACKAGES=4 or
+    OPENPROJECT_READ_TIMEOUT_SUMMARIZE_WORK_PACKAGES=120.
+    """
+    
+    # Default per-tool limits by cost class: "light" calls make a request or
+    # two, "paged" ones walk a collection, "fanout" ones run many requests
+    # concurrently and "bulk" ones write or transfer many items
+    COST_LIMITS = {
+        "light": 0,
+        "paged": 8,
+        "fanout": 4,
+        "bulk": 2
+    }
+    
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        tool_limits: Optional[Dict[str, int]] = None,
+        default_limits: Optional[Dict[str, int]] = None,
+        deadline: float = 120.0,
+        tool_deadlines: Optional[Dict[str, float]] = None,
+        request_timeouts: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_concurrent: Tool calls running at once across all tools, 0 for no limit
+            tool_limits: Calls of one tool running at once, overriding ``default_limits`` (0 for no limit)
+            default_limits: Per-tool limits implied by the tools' cost classes
+            deadline: Seconds a tool call may take including its wait, 0 for none
+            tool_deadlines: Per-tool deadlines overriding ``deadline``
+            request_timeouts: Per-tool (connect, read) timeouts for API requests,
+                None keeping the client's setting
+            metrics: Optional metrics registry for queueing metrics
+        """
+        self.max_concurrent = max_concurrent
+        self.tool_limits = dict(default_limits or {})
+        self.tool_limits.update(tool_limits or {})
+        self.deadline = deadline
+        self.tool_deadlines = dict(tool_deadlines or {})
+        self.request_timeouts = dict(request_timeouts or {})
+        self.metrics = metrics or Metrics()
+        self._global = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        self._tools: Dict[str, asyncio.Semaphore] = {}
+        self.queued: Dict[str, int] = {}
+        self.running: Dict[str, int] = {}
+    
+    @staticmethod
+    def _per_tool(prefix: str, parse: Callable[[str], Any]) -> Dict[str, Any]:
+        """Collect the per-tool settings of one OPENPROJECT_*_<TOOL> family"""
+        settings = {}
+        for name, value in os.environ.items():
+            if name.startswith(prefix) and value:
+                try:
+                    settings[name[len(prefix):].lower()] = parse(value)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid number for {name}: {value!r}")
+        return settings
+    
+    @classmethod
+    def from_env(
+        cls,
+        metrics: Optional[Metrics] = None,
+        default_limits: Optional[Dict[str, int]] = None
+    ) -> "ToolLimiter":
+        """Build a limiter from OPENPROJECT_MAX_CONCURRENT_TOOLS and the per-tool settings"""
+        connect = cls._per_tool("OPENPROJECT_CONNECT_TIMEOUT_", float)
+        read = cls._per_tool("OPENPROJECT_READ_TIMEOUT_", float)
+        return cls(
+            max_concurrent=_env_int("OPENPROJECT_MAX_CONCURRENT_TOOLS", 32),
+            tool_limits=cls._per_tool("OPENPROJECT_TOOL_CONCURRENCY_", int),
+            default_limits=default_limits,
+            deadline=_env_float("OPENPROJECT_TOOL_TIMEOUT", 120.0),
+            tool_deadlines=cls._per_tool("OPENPROJECT_TOOL_TIMEOUT_", float),
+            request_timeouts={
+                tool: (connect.get(tool), read.get(tool)) for tool in set(connect) | set(read)
+            },
+            metrics=metrics
+        )
+    
+    def deadline_for(self, tool: str) -> Optional[float]:
+        """Deadline of a tool call in seconds, or None for no deadline"""
+        deadline = self.tool_deadlines.get(tool, self.deadline)
+        return deadline if deadline > 0 else None
+    
+    async def within_deadline(self, tool: str, awaitable: Any) -> Any:
+        """
+        Await a tool call, cancelling it once the tool's deadline passes.
+        
+        The call runs as its own task and only the deadline itself is
+        reported as ToolDeadlineExceeded. A TimeoutError raised inside the
+        call, such as an API read timeout, propagates unchanged.
+        
+        Raises:
+            ToolDeadlineExceeded: If the deadline passed before the call finished
+        """
+        deadline = self.deadline_for(tool)
+        if deadline is None:
+            return await awaitable
+        task = asyncio.ensure_future(awaitable)
+        try:
+            done, _ = await asyncio.wait((task,), timeout=deadline)
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if not done:
+            raise ToolDeadlineExceeded(deadline)
+        return task.result()
+    
+    def _semaphore(self, tool: str) -> Optional[asyncio.Semaphore]:
+        """The tool's own semaphore, or None if the tool is not limited"""
+        limit = self.tool_limits.get(tool, 0)
+        if limit <= 0:
+            return None
+        semaphore = self._tools.get(tool)
+        if semaphore is None:
+            semaphore = self._tools[tool] = asyncio.Semaphore(limit)
+        return semaphore
+    
+    @asynccontextmanager
+    async def slot(self, tool: str):
+        """
+        Wait for a tool slot and a global slot, then hold both.
+        
+        The time spent waiting is recorded in openproject_mcp_tool_queue_seconds.
+        API requests made while the slot is held use the tool's connect and
+        read timeouts.
+        """
+        semaphores = [s for s in (self._semaphore(tool), self._global) if s is not None]
+        started = time.perf_counter()
+        acquired: List[asyncio.Semaphore] = []
+        self.queued[tool] = self.queued.get(tool, 0) + 1
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            self.queued[tool] -= 1
+            self.metrics.observe("openproject_mcp_tool_queue_seconds", time.perf_counter() - started, tool=tool)
+        
+        self.running[tool] = self.running.get(tool, 0) + 1
+        token = _request_timeouts.set(self.request_timeouts.get(tool))
+        try:
+            yield
+        finally:
+            _request_timeouts.reset(token)
+            self.running[tool] -= 1
+            for semaphore in acquired:
+                semaphore.release()
+    
+    def collect_metrics(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Gauges of queued and running calls per tool"""
+        samples = []
+        for tool, count in self.queued.items():
+            samples.append(("openproject_mcp_tool_calls_queued", "gauge", {"tool": tool}, float(count)))
+        for tool, count in self.running.items():
+            samples.append(("openproject_mcp_tool_calls_running", "gauge", {"tool": tool}, float(count)))
+        return samples
+
+
+class ToolInputError(ValueError):
+    """Tool arguments were rejected before any API request was made"""
+
+
+# Type tests of the JSON Schema types; bool is an int in Python but not in JSON
+_JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None
+}
+
+
+def _json_type(value: Any) -> str:
+    """JSON type name of a value, for error messages"""
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _JSON_TYPES[name](value):
+            return name
+    return type(value).__name__
+
+
+def _compile_schema(schema: Dict[str, Any]) -> Callable[[Any, str], Optional[str]]:
+    """
+    Compile a JSON Schema into a function returning the first violation.
+    
+    Covers the keywords the tool schemas use: type, enum, minimum, maximum,
+    minItems, maxItems, items, properties and required. Other keywords
+    (description, default) carry no constraint and are skipped. Each
+    keyword becomes one closure, so validating a call costs a few
+    isinstance checks instead of walking the schema again.
+    
+    Args:
+        schema: JSON Schema of a value
+        
+    Returns:
+        Callable: ``validate(value, path)`` returning an error message, or
+        None when the value is valid
+    """
+    checks: List[Callable[[Any, str], Optional[str]]] = []
+    
+    types = schema.get("type")
+    if types:
+        names = [types] if isinstance(types, str) else list(types)
+        tests = tuple(_JSON_TYPES[name] for name in names)
+        expected = " or ".join(names)
+        
+        def check_type(value: Any, path: str) -> Optional[str]:
+            for test in tests:
+                if test(value):
+                    return None
+            return f"{path or 'arguments'}: expected {expected}, got {_json_type(value)}"
+        checks.append(check_type)
+    
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        
+        def check_enum(value: Any, path: str) -> Optional[str]:
+            if value in allowed:
+                return None
+            return f"{path or 'arguments'}: must be one of {', '.join(map(str, allowed))}, got {value!r}"
+        checks.append(check_enum)
+    
+    for keyword, compare, relation in (
+        ("minimum", lambda value, bound: value >= bound, "at least"),
+        ("maximum", lambda value, bound: value <= bound, "at most")
+    ):
+        if keyword in schema:
+            def check_bound(value: Any, path: str, bound=schema[keyword], compare=compare, relation=relation) -> Optional[str]:
+                if _JSON_TYPES["number"](value) and not compare(value, bound):
+                    return f"{path or 'arguments'}: must be {relation} {bound}, got {value}"
+                return None
+            checks.append(check_bound)
+    
+    for keyword, compare, relation in (
+        ("minItems", lambda size, bound: size >= bound, "at least"),
+        ("maxItems", lambda size, bound: size <= bound, "at most")
+    ):
+        if keyword in schema:
+            def check_items(value: Any, path: str, bound=schema[keyword], compare=compare, relation=relation) -> Optional[str]:
+                if isinstance(value, list) and not compare(len(value), bound):
+                    return f"{path or 'arguments'}: must have {relation} {bound} item(s), got {len(value)}"
+                return None
+            checks.append(check_items)
+    
+    if "items" in schema:
+        validate_item = _compile_schema(schema["items"])
+        
+        def check_each(value: Any, path: str) -> Optional[str]:
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    error = validate_item(item, f"{path}[{index}]")
+                    if error:
+                        return error
+            return None
+        checks.append(check_each)
+    
+    required = tuple(schema.get("required", ()))
+    if required:
+        def check_required(value: Any, path: str) -> Optional[str]:
+            if isinstance(value, dict):
+                missing = [key for key in required if key not in value]
+                if missing:
+                    return f"{path or 'arguments'}: missing required {', '.join(missing)}"
+            return None
+        checks.append(check_required)
+    
+    properties = tuple(
+        (key, _compile_schema(property_schema))
+        for key, property_schema in (schema.get("properties") or {}).items()
+    )
+    if properties:
+        def check_properties(value: Any, path: str) -> Optional[str]:
+            if isinstance(value, dict):
+                for key, validate_property in properties:
+                    if key in value:
+                        error = validate_property(value[key], f"{path}.{key}" if path else key)
+                        if error:
+                            return error
+            return None
+        checks.append(check_properties)
+    
+    def validate(value: Any, path: str = "") -> Optional[str]:
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+        return None
+    
+    return validate
+
+
+class ToolSpec:
+    """
+    Declaration of one MCP tool.
+    
+    ``handler(arguments, client)`` does the work and returns either
+    finished text or a result that ``render(result, arguments)`` turns into
+    text; rendering is timed in openproject_mcp_render_seconds. ``check``
+    runs after schema validation for constraints a schema cannot express,
+    e.g. that a directory exists, and raises ToolInputError. ``cost``
+    selects the tool's default concurrency limit (see ToolLimiter.COST_LIMITS).
+    ``scope`` is "instance" for tools that act on one instance and take an
+    ``instance`` argument, "server" for tools that do not, and "fan_out"
+    for tools that query every instance and are only offered with several.
+    """
+    
+    __slots__ = ("name", "description", "input_schema", "handler", "render", "check", "cost", "scope")
+    
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        handler: Callable[[Dict[str, Any], "OpenProjectClient"], Any],
+        render: Optional[Callable[[Any, Dict[str, Any]], str]] = None,
+        check: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cost: str = "light",
+        scope: str = "instance"
+    ):
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler = handler
+        self.render = render
+        self.check = check
+        self.cost = cost
+        self.scope = scope
+
+
+class ToolRegistry:
+    """
+    Tools by name, with their MCP definitions and argument validators.
+    
+    ``publish`` builds the Tool objects and compiles the schemas once per
+    instance configuration, so ``list_tools`` returns a prebuilt list and a
+    call is dispatched with one dict lookup.
+    """
+    
+    def __init__(self, specs: List[ToolSpec]):
+        self.specs: Dict[str, ToolSpec] = {spec.name: spec for spec in specs}
+        self.tools: List[Tool] = []
+        self._dispatch: Dict[str, Tuple[ToolSpec, Callable[[Any, str], Optional[str]]]] = {}
+        self.publish()
+    
+    def publish(self, instances: Optional[List[str]] = None, default: Optional[str] = None) -> None:
+        """
+        Build the tool list and validators for the configured instances.
+        
+        With several instances, every instance-scoped tool gets an
+        ``instance`` argument and the fan-out tools are offered.
+        
+        Args:
+            instances: Names of the configured instances
+            default: Instance used when a call names none
+        """
+        multi = bool(instances) and len(instances) > 1
+        tools: List[Tool] = []
+        dispatch = {}
+        for spec in self.specs.values():
+            if spec.scope == "fan_out" and not multi:
+                continue
+            schema = copy.deepcopy(spec.input_schema)
+            if multi:
+                if spec.scope == "instance":
+                    schema["properties"]["instance"] = {
+                        "type": "string",
+                        "description": f"OpenProject instance (default: {default})",
+                        "enum": list(instances)
+                    }
+                elif spec.scope == "fan_out":
+                    schema["properties"]["instances"] = {
+                        "type": "array",
+                        "description": "Only query these instances (default: all)",
+                        "items": {"type": "string", "enum": list(instances)}
+                    }
+            tools.append(Tool(name=spec.name, description=spec.description, inputSchema=schema))
+            dispatch[spec.name] = (spec, _compile_schema(schema))
+        self.tools = tools
+        self._dispatch = dispatch
+    
+    def resolve(self, name: str, arguments: Dict[str, Any]) -> ToolSpec:
+        """
+        Look up a tool and validate a call's arguments.
+        
+        Raises:
+            ToolInputError: If the tool is unknown or the arguments are invalid
+        """
+        entry = self._dispatch.get(name)
+        if entry is None:
+            raise ToolInputError(f"Unknown tool: {name}")
+        spec, validate = entry
+        error = validate(arguments, "")
+        if error:
+            raise ToolInputError(f"Invalid arguments for '{name}': {error}")
+        if spec.check:
+            spec.check(arguments)
+        return spec
+    
+    def default_limits(self) -> Dict[str, int]:
+        """Per-tool concurrency limits implied by the tools' cost classes"""
+        return {name: ToolLimiter.COST_LIMITS[spec.cost] for name, spec in self.specs.items()}
+
+
+# Fields update_work_packages accepts, shared by the "changes" and "updates" schemas
+UPDATE_FIELDS_SCHEMA = {
+    "subject": {"type": "string"},
+    "description": {"type": "string", "description": "Markdown description"},
+    "status_id": {"type": "integer"},
+    "type_id": {"type": "integer"},
+    "priority_id": {"type": "integer"},
+    "assignee_id": {"type": ["integer", "null"], "description": "null unassigns"},
+    "responsible_id": {"type": ["integer", "null"], "description": "null clears the accountable user"},
+    "percentage_done": {"type": "integer", "minimum": 0, "maximum": 100},
+    "start_date": {"type": ["string", "null"], "description": "YYYY-MM-DD"},
+    "due_date": {"type": ["string", "null"], "description": "YYYY-MM-DD"}
+}
+
+
+class OpenProjectMCPServer:
+    """MCP Server for OpenProject integration"""
+    
+    def __init__(self):
+        self.server = _MCPServer("openproject-mcp")
+        self.client: Optional[OpenProjectClient] = None
+        self.instances: Optional[InstanceRegistry] = None
+        self.instance_timeout = _env_float("OPENPROJECT_INSTANCE_TIMEOUT", 30.0)
+        self.cache_snapshot = os.getenv("OPENPROJECT_CACHE_SNAPSHOT")
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self.metrics = Metrics()
+        self.prefetch = PrefetchScheduler.from_env(self.metrics)
+        self._metrics_tasks: List[asyncio.Task] = []
+        self._metrics_runner = None
+        self.bulk_concurrency = _env_int("OPENPROJECT_BULK_CONCURRENCY", 8)
+        self.transfer_concurrency = _env_int("OPENPROJECT_TRANSFER_CONCURRENCY", 2)
+        self.attachment_root = self._attachment_root_from_env()
+        self.mirror: Optional[WorkPackageMirror] = None
+        self.mirror_projects: List[Optional[int]] = [None]
+        self._mirror_task: Optional[asyncio.Task] = None
+        self.feed: Optional[ChangeFeed] = None
+        self._feed_sessions: Dict[Optional[int], set] = {}
+        self._feed_task: Optional[asyncio.Task] = None
+        self.session_concurrency = _env_int("OPENPROJECT_SESSION_CONCURRENCY", 4)
+        self._session_limits: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.metrics.add_collector(self._collect_session_metrics)
+        self.tools = ToolRegistry(self._tool_specs())
+        self.limiter = ToolLimiter.from_env(self.metrics, self.tools.default_limits())
+        self.metrics.add_collector(self.limiter.collect_metrics)
+        self._setup_handlers()
+    
+    @staticmethod
+    def _work_package_data(arguments: Dict[str, Any]) -> Dict:
+        """Map create tool arguments to client work package data"""
+        data = {
+            "project": arguments["project_id"],
+            "subject": arguments["subject"],
+            "type": arguments["type_id"]
+        }
+        
+        # Add optional fields
+        for field in ["description", "priority_id", "assignee_id"]:
+            if field in arguments:
+                data[field] = arguments[field]
+        
+        return data
+        
+    @staticmethod
+    def _work_package_updates(arguments: Dict[str, Any]) -> List[Dict]:
+        """Map update tool arguments to client update dicts, shared changes first"""
+        fields = set(UPDATE_FIELDS_SCHEMA)
+        changes = {
+            field: value for field, value in (arguments.get("changes") or {}).items()
+            if field in fields
+        }
+        updates = []
+        if changes:
+            updates.extend({"id": wp_id, **changes} for wp_id in arguments.get("work_package_ids") or [])
+        for item in arguments.get("updates") or []:
+            update = {field: value for field, value in item.items() if field in fields}
+            if update:
+                updates.append({"id": item["work_package_id"], **update})
+        return updates
+    
+    @staticmethod
+    def _attachment_root_from_env() -> Optional[str]:
+        """Resolve OPENPROJECT_ATTACHMENT_ROOT, or None if the attachment tools stay off"""
+        root = os.getenv("OPENPROJECT_ATTACHMENT_ROOT")
+        if not root:
+            logger.info("Attachment tools disabled: OPENPROJECT_ATTACHMENT_ROOT is not set")
+            return None
+        resolved = os.path.realpath(root)
+        if not os.path.isdir(resolved):
+            logger.warning(f"Attachment tools disabled: {root} is not a directory")
+            return None
+        return resolved
+    
+    def _confined_path(self, path: str) -> str:
+        """
+        Resolve a tool's file path inside the attachment root.
+        
+        Relative paths are taken relative to the root. Symlinks and ``..``
+        are resolved before the check, so neither can leave the root.
+        
+        Raises:
+            ToolInputError: If the path resolves outside the root
+        """
+        root = self.attachment_root
+        resolved = os.path.realpath(os.path.join(root, path))
+        try:
+            inside = os.path.commonpath([root, resolved]) == root
+        except ValueError:
+            inside = False
+        if not inside:
+            raise ToolInputError(f"{path} is outside the attachment root {root}")
+        return resolved
+    
+    def _tool_specs(self) -> List[ToolSpec]:
+        """Declare every tool with its schema, handler, renderer and cost class"""
+        specs = [
+            ToolSpec(
+                name="test_connection",
+                description="Test the connection to the OpenProject API",
+                input_schema={
+                    "type": "object",
+                    "properties": {}
+                },
+                handler=self._tool_test_connection
+            ),
+            ToolSpec(
+                name="list_projects",
+                description="List all OpenProject projects",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "active_only": {
+                            "type": "boolean",
+                            "description": "Show only active projects",
+                            "default": True
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Continuation cursor from a previous call with the same filters"
+                        }
+                    }
+                },
+                handler=self._tool_list_projects
+            ),
+            ToolSpec(
+                name="list_work_packages",
+                description="List work packages",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "project_id": {
+                            "type": "integer",
+                            "description": "Project ID (optional, for project-specific work packages)"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Status filter (open, closed, all)",
+                            "enum": ["open", "closed", "all"],
+                            "default": "open"
+                        },
+                        "assignee_id": {
+                            "type": "integer",
+                            "description": "Assignee user ID (optional)"
+                        },
+                        "type_id": {
+                            "type": "integer",
+                            "description": "Type ID (optional)"
+                        },
+                        "priority_id": {
+                            "type": "integer",
+                            "description": "Priority ID (optional)"
+                        },
+                        "updated_after": {
+                            "type": "string",
+                            "description": "Only work packages updated at or after this ISO 8601 timestamp (optional)"
+                        },
+                        "updated_before": {
+                            "type": "string",
+                            "description": "Only work packages updated at or before this ISO 8601 timestamp (optional)"
+                        },
+                        "subject_contains": {
+                            "type": "string",
+                            "description": "Text the subject must contain (optional)"
+                        },
+                        "sort_by": {
+                            "type": "string",
+                            "description": "Sort field (optional)",
+                            "enum": list(OpenProjectClient.SORT_FIELDS)
+                        },
+                        "sort_order": {
+                            "type": "string",
+                            "description": "Sort direction",
+                            "enum": ["asc", "desc"],
+                            "default": "asc"
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": "Maximum number of work packages to return (default: all)",
+                            "minimum": 1
+                        },
+                        "page_size": {
+                            "type": "integer",
+                            "description": "Work packages requested per API page",
+                            "minimum": 1
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Continuation cursor from a previous call with the same filters"
+                        }
+                    }
+                },
+                handler=self._tool_list_work_packages,
+                cost="paged"
+            ),
+            ToolSpec(
+                name="list_types",
+                description="List available work package types",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "project_id": {
+                            "type": "integer",
+                            "description": "Project ID (optional, for project-specific types)"
+                        }
+                    }
+                },
+                handler=self._tool_list_types,
+                render=self._render_types
+            ),
+            ToolSpec(
+                name="get_work_package_details",
+                description="Get a work package with its relations, activities, watchers and attachments",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "work_package_id": {
+                            "type": "integer",
+                            "description": "Work package ID"
+                        },
+                        "include": {
+                            "type": "array",
+                            "description": "Related collections to fetch (default: all)",
+                            "items": {
+                                "type": "string",
+                                "enum": list(OpenProjectClient.DETAIL_SECTIONS)
+                            }
+                        }
+                    },
+                    "required": ["work_package_id"]
+                },
+                handler=self._tool_work_package_details,
+                render=self._render_details
+            ),
+            ToolSpec(
+                name="get_work_package_details_batch",
+                description="Get several work packages with their relations, activities, watchers and attachments in one call",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "work_package_ids": {
+                            "type": "array",
+                            "description": "Work package IDs",
+                            "items": {"type": "integer"},
+                            "minItems": 1,
+                            "maxItems": 100
+                        },
+                        "include": {
+                            "type": "array",
+                            "description": "Related collections to fetch (default: all)",
+                            "items": {
+                                "type": "string",
+                                "enum": list(OpenProjectClient.DETAIL_SECTIONS)
+                            }
+                        }
+                    },
+                    "required": ["work_package_ids"]
+                },
+                handler=self._tool_work_package_details,
+                render=self._render_details,
+                cost="fanout"
+            ),
+            ToolSpec(
+                name="summarize_work_packages",
+                description="Count work packages (and optionally sum estimated and remaining time) grouped by an attribute",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "group_by": {
+                            "type": "string",
+                            "description": "Attribute to group by",
+                            "enum": list(OpenProjectClient.GROUP_BY_FIELDS)
+                        },
+                        "project_id": {
+                            "type": "integer",
+                            "description": "Project ID (optional, for project-specific work packages)"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Status filter (open, closed, all)",
+                            "enum": ["open", "closed", "all"],
+                            "default": "open"
+                        },
+                        "assignee_id": {
+                            "type": "integer",
+                            "description": "Assignee user ID (optional)"
+                        },
+                        "type_id": {
+                            "type": "integer",
+                            "description": "Type ID (optional)"
+                        },
+                        "priority_id": {
+                            "type": "integer",
+                            "description": "Priority ID (optional)"
+                        },
+                        "updated_after": {
+                            "type": "string",
+                            "description": "Only work packages updated at or after this ISO 8601 timestamp (optional)"
+                        },
+                        "updated_before": {
+                            "type": "string",
+                            "description": "Only work packages updated at or before this ISO 8601 timestamp (optional)"
+                        },
+                        "show_sums": {
+                            "type": "boolean",
+                            "description": "Include sums of estimated and remaining time per group",
+                            "default": False
+                        }
+                    },
+                    "required": ["group_by"]
+                },
+                handler=self._tool_summarize_work_packages,
+                render=lambda result, arguments: self._render_summary(arguments["group_by"], result),
+                cost="fanout"
+            ),
+            ToolSpec(
+                name="create_work_package",
+                description="Create a new work package",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "project_id": {
+                            "type": "integer",
+                            "description": "Project ID"
+                        },
+                        "subject": {
+                            "type": "string",
+                            "description": "Work package title"
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "Description (Markdown supported)"
+                        },
+                        "type_id": {
+                            "type": "integer",
+                            "description": "Type ID (e.g., 1 for Task, 2 for Bug)"
+                        },
+                        "priority_id": {
+                            "type": "integer",
+                            "description": "Priority ID (optional)"
+                        },
+                        "assignee_id": {
+                            "type": "integer",
+                            "description": "Assignee user ID (optional)"
                         }
-                    }
-                ),
-                Tool(
-                    name="list_work_packages",
-                    description="List work packages",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "project_id": {
-                                "type": "integer",
-                                "description": "Project ID (optional, for project-specific work packages)"
+                    },
+                    "required": ["project_id", "subject", "type_id"]
+                },
+                handler=self._tool_create_work_package,
+                render=self._render_created
+            ),
+            ToolSpec(
+                name="create_work_packages",
+                description="Create many work packages in one call",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "work_packages": {
+                            "type": "array",
+                            "description": "Work packages to create",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "project_id": {"type": "integer"},
+                                    "subject": {"type": "string"},
+                                    "description": {"type": "string"},
+                                    "type_id": {"type": "integer"},
+                                    "priority_id": {"type": "integer"},
+                                    "assignee_id": {"type": "integer"}
+                                },
+                                "required": ["project_id", "subject", "type_id"]
                             },
-                            "status": {
-                                "type": "string",
-                                "description": "Status filter (open, closed, all)",
-                                "enum": ["open", "closed", "all"],
-                                "default": "open"
-                            }
+                            "minItems": 1,
+                            "maxItems": 500
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum creations in flight (optional)",
+                            "minimum": 1,
+                            "maximum": 32
+                        }
+                    },
+                    "required": ["work_packages"]
+                },
+                handler=self._tool_create_work_packages,
+                render=self._render_created_batch,
+                cost="bulk"
+            ),
+            ToolSpec(
+                name="update_work_packages",
+                description="Update fields, status or assignee of many work packages in one call",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "work_package_ids": {
+                            "type": "array",
+                            "description": "Work packages that all receive the same changes",
+                            "items": {"type": "integer"},
+                            "maxItems": 500
+                        },
+                        "changes": {
+                            "type": "object",
+                            "description": "Changes applied to every ID in work_package_ids",
+                            "properties": UPDATE_FIELDS_SCHEMA
+                        },
+                        "updates": {
+                            "type": "array",
+                            "description": "Individual changes per work package, applied in order",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "work_package_id": {"type": "integer"},
+                                    **UPDATE_FIELDS_SCHEMA
+                                },
+                                "required": ["work_package_id"]
+                            },
+                            "maxItems": 500
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum updates in flight (optional)",
+                            "minimum": 1,
+                            "maximum": 32
                         }
                     }
-                ),
-                Tool(
-                    name="list_types",
-                    description="List available work package types",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "project_id": {
-                                "type": "integer",
-                                "description": "Project ID (optional, for project-specific types)"
-                            }
+                },
+                handler=self._tool_update_work_packages,
+                render=self._render_updated,
+                check=self._check_updates,
+                cost="bulk"
+            ),
+            ToolSpec(
+                name="upload_attachment",
+                description="Attach local files to a work package, streamed from disk with checksum verification",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "work_package_id": {
+                            "type": "integer",
+                            "description": "Work package ID"
+                        },
+                        "paths": {
+                            "type": "array",
+                            "description": "Files to upload, relative to the attachment root or absolute inside it",
+                            "items": {"type": "string"},
+                            "minItems": 1,
+                            "maxItems": 50
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "Description for every uploaded attachment (optional)"
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum uploads in flight (optional)",
+                            "minimum": 1
+                        }
+                    },
+                    "required": ["work_package_id", "paths"]
+                },
+                handler=self._tool_upload_attachment,
+                render=self._render_transfers,
+                check=self._check_upload,
+                cost="bulk"
+            ),
+            ToolSpec(
+                name="download_attachment",
+                description="Download attachments to a local directory, streamed to disk with checksum verification",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "attachment_ids": {
+                            "type": "array",
+                            "description": "Attachment IDs",
+                            "items": {"type": "integer"},
+                            "minItems": 1,
+                            "maxItems": 50
+                        },
+                        "directory": {
+                            "type": "string",
+                            "description": "Existing directory to save the files in, relative to the attachment root or absolute inside it"
+                        },
+                        "overwrite": {
+                            "type": "boolean",
+                            "description": "Replace files that already exist",
+                            "default": False
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum downloads in flight (optional)",
+                            "minimum": 1
+                        }
+                    },
+                    "required": ["attachment_ids", "directory"]
+                },
+                handler=self._tool_download_attachment,
+                render=self._render_transfers,
+                check=self._check_download,
+                cost="bulk"
+            ),
+            ToolSpec(
+                name="query_work_packages",
+                description="Query work packages from the local mirror (fast, no API round trip)",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "project_id": {
+                            "type": "integer",
+                            "description": "Project ID (optional)"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Status filter (open, closed, all)",
+                            "enum": ["open", "closed", "all"],
+                            "default": "open"
+                        },
+                        "type_id": {
+                            "type": "integer",
+                            "description": "Type ID (optional)"
+                        },
+                        "assignee_id": {
+                            "type": "integer",
+                            "description": "Assignee user ID (optional)"
+                        },
+                        "priority_id": {
+                            "type": "integer",
+                            "description": "Priority ID (optional)"
+                        },
+                        "subject_contains": {
+                            "type": "string",
+                            "description": "Case-insensitive text the subject must contain (optional)"
+                        },
+                        "updated_after": {
+                            "type": "string",
+                            "description": "Only work packages updated after this ISO 8601 timestamp (optional)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of results",
+                            "default": 50,
+                            "minimum": 1
+                        },
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "Sync the mirror before querying",
+                            "default": False
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Continuation cursor from a previous call with the same filters"
                         }
                     }
-                ),
-                Tool(
-                    name="create_work_package",
-                    description="Create a new work package",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "project_id": {
-                                "type": "integer",
-                                "description": "Project ID"
-                            },
-                            "subject": {
-                                "type": "string",
-                                "description": "Work package title"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "Description (Markdown supported)"
-                            },
-                            "type_id": {
-                                "type": "integer",
-                                "description": "Type ID (e.g., 1 for Task, 2 for Bug)"
-                            },
-                            "priority_id": {
-                                "type": "integer",
-                                "description": "Priority ID (optional)"
-                            },
-                            "assignee_id": {
-                                "type": "integer",
-                                "description": "Assignee user ID (optional)"
-                            }
+                },
+                handler=self._tool_query_work_packages,
+                scope="server"
+            ),
+            ToolSpec(
+                name="server_stats",
+                description="Show per-tool and per-endpoint latency, request, payload and cache statistics",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "format": {
+                            "type": "string",
+                            "description": "Summary table or raw Prometheus text",
+                            "enum": ["summary", "prometheus"],
+                            "default": "summary"
+                        }
+                    }
+                },
+                handler=self._tool_server_stats,
+                scope="server"
+            ),
+            ToolSpec(
+                name="cache_stats",
+                description="Show metadata cache and request coalescing counters",
+                input_schema={
+                    "type": "object",
+                    "properties": {}
+                },
+                handler=self._tool_cache_stats
+            ),
+            ToolSpec(
+                name="invalidate_cache",
+                description="Drop cached types, projects, priorities, statuses and form templates",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "resource": {
+                            "type": "string",
+                            "description": "Only drop this resource (default: everything)",
+                            "enum": ["types", "projects", "priorities", "statuses", "forms"]
+                        }
+                    }
+                },
+                handler=self._tool_invalidate_cache
+            ),
+            ToolSpec(
+                name="list_projects_across_instances",
+                description="List projects of all OpenProject instances at once, merged as they arrive",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "active_only": {
+                            "type": "boolean",
+                            "description": "Show only active projects",
+                            "default": True
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": "Maximum projects per instance (optional)",
+                            "minimum": 1
+                        }
+                    }
+                },
+                handler=self._tool_list_projects_across_instances,
+                cost="bulk",
+                scope="fan_out"
+            ),
+            ToolSpec(
+                name="list_work_packages_across_instances",
+                description="List work packages of all OpenProject instances at once, merged as they arrive",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "status": {
+                            "type": "string",
+                            "description": "Status filter (open, closed, all)",
+                            "enum": ["open", "closed", "all"],
+                            "default": "open"
+                        },
+                        "updated_after": {
+                            "type": "string",
+                            "description": "Only work packages updated at or after this ISO 8601 timestamp (optional)"
+                        },
+                        "updated_before": {
+                            "type": "string",
+                            "description": "Only work packages updated at or before this ISO 8601 timestamp (optional)"
                         },
-                        "required": ["project_id", "subject", "type_id"]
+                        "subject_contains": {
+                            "type": "string",
+                            "description": "Text the subject must contain (optional)"
+                        },
+                        "sort_by": {
+                            "type": "string",
+                            "description": "Sort field within each instance (optional)",
+                            "enum": list(OpenProjectClient.SORT_FIELDS)
+                        },
+                        "sort_order": {
+                            "type": "string",
+                            "description": "Sort direction",
+                            "enum": ["asc", "desc"],
+                            "default": "asc"
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": "Maximum work packages per instance (optional)",
+                            "minimum": 1
+                        }
                     }
+                },
+                handler=self._tool_list_work_packages_across_instances,
+                cost="bulk",
+                scope="fan_out"
+            )
+        ]
+        if not self.attachment_root:
+            # Reading and writing local files is only offered inside a configured root
+            specs = [spec for spec in specs if spec.name not in ("upload_attachment", "download_attachment")]
+        return specs
+    
+    @staticmethod
+    def _check_updates(arguments: Dict[str, Any]) -> None:
+        """update_work_packages needs shared changes for some IDs, or individual updates"""
+        if not OpenProjectMCPServer._work_package_updates(arguments):
+            raise ToolInputError("Nothing to update: pass work_package_ids with changes, or updates.")
+    
+    def _check_upload(self, arguments: Dict[str, Any]) -> None:
+        """Every file to upload must lie inside the attachment root and exist before the first one is sent"""
+        missing = [path for path in arguments["paths"] if not os.path.isfile(self._confined_path(path))]
+        if missing:
+            raise ToolInputError(f"File(s) not found: {', '.join(missing)}")
+    
+    def _check_download(self, arguments: Dict[str, Any]) -> None:
+        """Downloads go to an existing directory inside the attachment root"""
+        if not os.path.isdir(self._confined_path(arguments["directory"])):
+            raise ToolInputError(f"Directory not found: {arguments['directory']}")
+    
+    async def _tool_test_connection(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Check the API connection and report the client's resilience state"""
+        result = await client.test_connection()
+        
+        text = "✅ API connection successful!\n\n"
+        if client.proxy:
+            text += f"Connected via proxy: {client.proxy}\n"
+        text += f"API Version: {result.get('_type', 'Unknown')}\n"
+        text += f"Instance Version: {result.get('instanceVersion', 'Unknown')}\n"
+        
+        resilience = client.resilience_stats()
+        text += f"Circuit Breaker: {resilience['circuit_breaker']['state']}\n"
+        text += f"Retries So Far: {resilience['retries']}\n"
+        return text
+    
+    async def _tool_list_projects(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Stream projects into the output budget, continuing from a cursor"""
+        name = "list_projects"
+        filters = None
+        if arguments.get("active_only", True):
+            filters = json.dumps([{"active": {"operator": "=", "values": ["t"]}}])
+        
+        start, page_size = _decode_cursor(name, arguments)
+        output = OutputBuilder.from_env()
+        projects = client.iter_projects(
+            filters,
+            page_size=page_size or output.item_limit(),
+            max_results=output.item_limit(),
+            start=start
+        )
+        project_ids: List[Optional[int]] = []
+        await self._render_items(
+            name, projects, output, self._render_project,
+            (lambda project: project_ids.append(project.get("id"))) if self.prefetch else None
+        )
+        if self.prefetch:
+            self.prefetch.schedule(client, project_ids)
+        
+        if not output.items:
+            return "No projects found." if not start else "No more projects."
+        return output.render(
+            f"Found {projects.total or output.items} project(s):\n\n",
+            self._continuation(name, arguments, projects, start, output)
+        )
+    
+    async def _tool_list_work_packages(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Stream filtered work packages into the output budget, continuing from a cursor"""
+        name = "list_work_packages"
+        filters = client.work_package_filters(
+            status=arguments.get("status", "open"),
+            assignee_id=arguments.get("assignee_id"),
+            type_id=arguments.get("type_id"),
+            priority_id=arguments.get("priority_id"),
+            updated_after=arguments.get("updated_after"),
+            updated_before=arguments.get("updated_before"),
+            subject_contains=arguments.get("subject_contains")
+        )
+        sort_by = None
+        if arguments.get("sort_by"):
+            sort_by = [[arguments["sort_by"], arguments.get("sort_order", "asc")]]
+        
+        start, page_size = _decode_cursor(name, arguments)
+        output = OutputBuilder.from_env()
+        limit = output.item_limit(arguments.get("max_results"))
+        work_packages = client.iter_work_packages(
+            arguments.get("project_id"),
+            filters,
+            # One page per response unless asked otherwise
+            page_size=page_size or limit,
+            max_results=limit,
+            sort_by=sort_by,
+            fields=list(client.WORK_PACKAGE_FIELDS),
+            start=start
+        )
+        project_ids: List[Optional[int]] = [arguments.get("project_id")]
+        await self._render_items(
+            name, work_packages, output, self._render_work_package,
+            (lambda wp: project_ids.append(_href_id((wp.get("_links") or {}).get("project"))))
+            if self.prefetch else None
+        )
+        if self.prefetch:
+            self.prefetch.schedule(client, project_ids)
+        
+        if not output.items:
+            return "No work packages found." if not start else "No more work packages."
+        header = f"Found {output.items} work package(s)"
+        if work_packages.total and work_packages.total > output.items:
+            header += f" (of {work_packages.total} matching)"
+        return output.render(
+            header + ":\n\n",
+            self._continuation(name, arguments, work_packages, start, output)
+        )
+    
+    async def _tool_list_types(self, arguments: Dict[str, Any], client: OpenProjectClient) -> Dict:
+        """Fetch the work package types, cached per project"""
+        return await client.get_types(arguments.get("project_id"))
+    
+    async def _tool_work_package_details(self, arguments: Dict[str, Any], client: OpenProjectClient) -> Dict:
+        """Fetch one or several work packages with their related collections"""
+        wp_ids = arguments.get("work_package_ids") or [arguments["work_package_id"]]
+        return await client.get_work_package_details(wp_ids, arguments.get("include"))
+    
+    async def _tool_summarize_work_packages(self, arguments: Dict[str, Any], client: OpenProjectClient) -> Dict:
+        """Group and count work packages on the server"""
+        filters = client.work_package_filters(
+            status=arguments.get("status", "open"),
+            assignee_id=arguments.get("assignee_id"),
+            type_id=arguments.get("type_id"),
+            priority_id=arguments.get("priority_id"),
+            updated_after=arguments.get("updated_after"),
+            updated_before=arguments.get("updated_before")
+        )
+        return await client.summarize_work_packages(
+            arguments["group_by"],
+            arguments.get("project_id"),
+            filters,
+            show_sums=arguments.get("show_sums", False)
+        )
+    
+    async def _tool_create_work_package(self, arguments: Dict[str, Any], client: OpenProjectClient) -> Dict:
+        """Create one work package"""
+        result = await client.create_work_package(self._work_package_data(arguments))
+        if self.feed:
+            self.feed.nudge()
+        return result
+    
+    async def _tool_create_work_packages(self, arguments: Dict[str, Any], client: OpenProjectClient) -> List[Dict]:
+        """Create work packages concurrently, one result per item"""
+        items = [self._work_package_data(item) for item in arguments["work_packages"]]
+        concurrency = arguments.get("concurrency") or self.bulk_concurrency
+        results = await client.create_work_packages(items, concurrency)
+        if self.feed:
+            self.feed.nudge()
+        return results
+    
+    async def _tool_update_work_packages(self, arguments: Dict[str, Any], client: OpenProjectClient) -> Tuple[List[Dict], List[Dict]]:
+        """Apply shared and individual changes, returning the updates with their results"""
+        updates = self._work_package_updates(arguments)
+        concurrency = arguments.get("concurrency") or self.bulk_concurrency
+        results = await client.update_work_packages(updates, concurrency)
+        if self.feed:
+            self.feed.nudge()
+        return updates, results
+    
+    async def _tool_upload_attachment(self, arguments: Dict[str, Any], client: OpenProjectClient) -> List[Dict]:
+        """Stream local files to a work package"""
+        wp_id = arguments["work_package_id"]
+        return await client.transfer_attachments(
+            [
+                lambda path=path: client.upload_attachment(wp_id, path, arguments.get("description"))
+                for path in map(self._confined_path, arguments["paths"])
+            ],
+            arguments.get("concurrency") or self.transfer_concurrency
+        )
+    
+    async def _tool_download_attachment(self, arguments: Dict[str, Any], client: OpenProjectClient) -> List[Dict]:
+        """Stream attachments into a local directory"""
+        directory = self._confined_path(arguments["directory"])
+        # Attachments sharing a file name must not write to the same target
+        claimed: set = set()
+        return await client.transfer_attachments(
+            [
+                lambda attachment_id=attachment_id: client.download_attachment(
+                    attachment_id, directory, arguments.get("overwrite", False), claimed
                 )
-            ]
+                for attachment_id in arguments["attachment_ids"]
+            ],
+            arguments.get("concurrency") or self.transfer_concurrency
+        )
+    
+    async def _tool_list_projects_across_instances(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """List projects of the selected instances"""
+        filters = None
+        if arguments.get("active_only", True):
+            filters = json.dumps([{"active": {"operator": "=", "values": ["t"]}}])
+        
+        def source(instance_client: OpenProjectClient, limit: Optional[int]) -> CollectionPaginator:
+            return instance_client.iter_projects(filters, page_size=limit, max_results=limit)
+        
+        return await self._list_across_instances(
+            "list_projects_across_instances", arguments, client, source, self._render_project, "project"
+        )
+    
+    async def _tool_list_work_packages_across_instances(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """List work packages of the selected instances"""
+        filters = client.work_package_filters(
+            status=arguments.get("status", "open"),
+            updated_after=arguments.get("updated_after"),
+            updated_before=arguments.get("updated_before"),
+            subject_contains=arguments.get("subject_contains")
+        )
+        sort_by = None
+        if arguments.get("sort_by"):
+            sort_by = [[arguments["sort_by"], arguments.get("sort_order", "asc")]]
+        
+        def source(instance_client: OpenProjectClient, limit: Optional[int]) -> CollectionPaginator:
+            return instance_client.iter_work_packages(
+                None,
+                filters,
+                page_size=limit,
+                max_results=limit,
+                sort_by=sort_by,
+                fields=list(OpenProjectClient.WORK_PACKAGE_FIELDS)
+            )
+        
+        return await self._list_across_instances(
+            "list_work_packages_across_instances", arguments, client, source,
+            self._render_work_package, "work package"
+        )
+    
+    async def _list_across_instances(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        client: OpenProjectClient,
+        source: Callable[[OpenProjectClient, Optional[int]], CollectionPaginator],
+        render: Callable[[Dict], str],
+        noun: str
+    ) -> str:
+        """
+        Render one collection of every selected instance, merged as they arrive.
+        
+        Args:
+            name: Tool name
+            arguments: Call arguments, possibly with ``instances`` and ``max_results``
+            client: Default client, used when no instances are configured
+            source: Builds an instance's paginator from its client and the item limit
+            render: Renders one element as a Markdown list item
+            noun: Element name for the header
+            
+        Returns:
+            str: Rendered listing with a per-instance footer
+        """
+        clients = self.instances.clients if self.instances else {"default": client}
+        selected = arguments.get("instances") or list(clients)
+        unknown = [instance for instance in selected if instance not in clients]
+        if unknown:
+            raise ValueError(f"Unknown instance(s): {', '.join(unknown)}")
+        
+        output = OutputBuilder.from_env()
+        limit = output.item_limit(arguments.get("max_results"))
+        fan_out = InstanceFanOut(
+            {instance: source(clients[instance], limit) for instance in selected},
+            self.instance_timeout
+        )
+        shown = await self._render_fan_out(name, fan_out, output, render)
+        return output.render(
+            f"Found {output.items} {noun}(s) across {len(selected)} instance(s):\n\n",
+            self._fan_out_footer(fan_out, shown, output)
+        )
+    
+    async def _tool_query_work_packages(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Query the local mirror, syncing it first if asked or never synced"""
+        name = "query_work_packages"
+        if not self.mirror:
+            return "Local mirror is disabled. Set OPENPROJECT_MIRROR_PATH to enable it."
+        
+        project_id = arguments.get("project_id")
+        if None in self.mirror_projects:
+            scopes = [None]
+        elif project_id is None:
+            scopes = self.mirror_projects
+        elif project_id in self.mirror_projects:
+            scopes = [project_id]
+        else:
+            # Only the configured projects are mirrored; never fall back to syncing everything
+            return (
+                f"Project {project_id} is not in the local mirror "
+                f"(OPENPROJECT_MIRROR_PROJECTS={','.join(map(str, self.mirror_projects))}). "
+                "Use list_work_packages instead."
+            )
+        synced = []
+        for scope in scopes:
+            synced_at = await self.mirror.last_synced(scope)
+            if arguments.get("refresh") or synced_at is None:
+                await self.mirror.sync(self.client, scope)
+                synced_at = await self.mirror.last_synced(scope)
+            synced.append(synced_at)
+        
+        start, _ = _decode_cursor(name, arguments)
+        output = OutputBuilder.from_env()
+        rows, total = await self.mirror.query(
+            project_id=project_id,
+            status=arguments.get("status", "open"),
+            type_id=arguments.get("type_id"),
+            assignee_id=arguments.get("assignee_id"),
+            priority_id=arguments.get("priority_id"),
+            subject_contains=arguments.get("subject_contains"),
+            updated_after=arguments.get("updated_after"),
+            limit=output.item_limit(arguments.get("limit", 50)) or 50,
+            offset=start
+        )
+        # The oldest scope bounds how stale the answer can be
+        synced_at = min(synced)
+        age = f"{time.time() - synced_at:.0f}s ago" if synced_at else "never"
+        
+        with self.metrics.timer("openproject_mcp_render_seconds", tool=name):
+            for row in rows:
+                if not output.add_item(self._render_mirror_row(row)):
+                    break
+            
+            if not output.items:
+                return f"No work packages found in the local mirror (synced {age})."
+            header = f"Found {total} work package(s) in the local mirror (synced {age})"
+            if total > output.items:
+                header += f", showing {start + 1}-{start + output.items}"
+            footer = ""
+            if start + output.items < total:
+                cursor = _encode_cursor(name, arguments, start + output.items, 0)
+                footer = f"More results: call {name} again with cursor=\"{cursor}\".\n"
+            return output.render(header + ":\n\n", footer)
+    
+    async def _tool_server_stats(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Render the metrics registry"""
+        if arguments.get("format") == "prometheus":
+            return self.metrics.render_prometheus()
+        return self._render_stats_summary()
+    
+    async def _tool_cache_stats(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Render cache and coalescing counters"""
+        if client.cache:
+            parts = ["Metadata cache statistics:\n\n"]
+            for key, value in client.cache.stats().items():
+                parts.append(f"- **{key}**: {value}\n")
+        else:
+            parts = ["Metadata cache is disabled.\n"]
+        
+        parts.append("\nRequest coalescing:\n\n")
+        for key, value in client.coalescing_stats().items():
+            parts.append(f"- **{key}**: {value}\n")
+        return "".join(parts)
+    
+    async def _tool_invalidate_cache(self, arguments: Dict[str, Any], client: OpenProjectClient) -> str:
+        """Drop cached metadata"""
+        if not client.cache:
+            return "Metadata cache is disabled."
+        
+        resource = arguments.get("resource")
+        removed = client.cache.invalidate(resource)
+        return f"✅ Dropped {removed} cached {resource or 'metadata'} response(s)."
+    
+    async def _execute(self, spec: ToolSpec, arguments: Dict[str, Any], client: OpenProjectClient) -> List[TextContent]:
+        """Run a tool once it got a tool and a global concurrency slot, then render its result"""
+        async with self.limiter.slot(spec.name):
+            result = await spec.handler(arguments, client)
+        if spec.render is None:
+            return [TextContent(type="text", text=result)]
+        with self.metrics.timer("openproject_mcp_render_seconds", tool=spec.name):
+            text = spec.render(result, arguments)
+        return [TextContent(type="text", text=text)]
+    
+    def _setup_handlers(self):
+        """Register all MCP handlers"""
+        
+        @self.server.list_tools()
+        async def list_tools() -> List[Tool]:
+            """List available tools"""
+            return self.tools.tools
         
-        @self.server.call_tool()
+        # Arguments are validated by the registry's compiled schemas instead
+        @self.server.call_tool(validate_input=False)
         async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             """Execute a tool"""
             if not self.client:
@@ -418,168 +5721,954 @@ class OpenProjectMCPServer:
                          "- OPENPROJECT_API_KEY=your-api-key"
                 )]
             
+            started = time.perf_counter()
+            outcome = "ok"
             try:
-                if name == "test_connection":
-                    result = await self.client.test_connection()
-                    
-                    text = "✅ API connection successful!\n\n"
-                    if self.client.proxy:
-                        text += f"Connected via proxy: {self.client.proxy}\n"
-                    text += f"API Version: {result.get('_type', 'Unknown')}\n"
-                    text += f"Instance Version: {result.get('instanceVersion', 'Unknown')}\n"
-                    
-                    return [TextContent(type="text", text=text)]
-                
-                elif name == "list_projects":
-                    filters = None
-                    if arguments.get("active_only", True):
-                        filters = json.dumps([{"active": {"operator": "=", "values": ["t"]}}])
-                    
-                    result = await self.client.get_projects(filters)
-                    projects = result.get("_embedded", {}).get("elements", [])
-                    
-                    if not projects:
-                        text = "No projects found."
-                    else:
-                        text = f"Found {len(projects)} project(s):\n\n"
-                        for project in projects:
-                            text += f"- **{project['name']}** (ID: {project['id']})\n"
-                            if project.get("description", {}).get("raw"):
-                                text += f"  {project['description']['raw']}\n"
-                            text += f"  Status: {'Active' if project.get('active') else 'Inactive'}\n"
-                            text += f"  Public: {'Yes' if project.get('public') else 'No'}\n\n"
-                    
-                    return [TextContent(type="text", text=text)]
-                
-                elif name == "list_work_packages":
-                    project_id = arguments.get("project_id")
-                    status = arguments.get("status", "open")
-                    
-                    filters = None
-                    if status == "open":
-                        filters = json.dumps([{"status": {"operator": "open", "values": []}}])
-                    elif status == "closed":
-                        filters = json.dumps([{"status": {"operator": "closed", "values": []}}])
-                    
-                    result = await self.client.get_work_packages(project_id, filters)
-                    work_packages = result.get("_embedded", {}).get("elements", [])
-                    
-                    if not work_packages:
-                        text = "No work packages found."
-                    else:
-                        text = f"Found {len(work_packages)} work package(s):\n\n"
-                        for wp in work_packages:
-                            text += f"- **{wp.get('subject', 'No title')}** (#{wp.get('id', 'N/A')})\n"
-                            
-                            if "_embedded" in wp:
-                                embedded = wp["_embedded"]
-                                if "type" in embedded:
-                                    text += f"  Type: {embedded['type'].get('name', 'Unknown')}\n"
-                                if "status" in embedded:
-                                    text += f"  Status: {embedded['status'].get('name', 'Unknown')}\n"
-                                if "project" in embedded:
-                                    text += f"  Project: {embedded['project'].get('name', 'Unknown')}\n"
-                                if "assignee" in embedded and embedded["assignee"]:
-                                    text += f"  Assignee: {embedded['assignee'].get('name', 'Unassigned')}\n"
-                            
-                            if "percentageDone" in wp:
-                                text += f"  Progress: {wp['percentageDone']}%\n"
-                            
-                            text += "\n"
-                    
-                    return [TextContent(type="text", text=text)]
-                
-                elif name == "list_types":
-                    result = await self.client.get_types(arguments.get("project_id"))
-                    types = result.get("_embedded", {}).get("elements", [])
-                    
-                    if not types:
-                        text = "No work package types found."
-                    else:
-                        text = "Available work package types:\n\n"
-                        for type_item in types:
-                            text += f"- **{type_item.get('name', 'Unnamed')}** (ID: {type_item.get('id', 'N/A')})\n"
-                            if type_item.get('isDefault'):
-                                text += "  ✓ Default type\n"
-                            if type_item.get('isMilestone'):
-                                text += "  ✓ Milestone\n"
-                            text += "\n"
-                    
-                    return [TextContent(type="text", text=text)]
-                
-                elif name == "create_work_package":
-                    data = {
-                        "project": arguments["project_id"],
-                        "subject": arguments["subject"],
-                        "type": arguments["type_id"]
-                    }
-                    
-                    # Add optional fields
-                    for field in ["description", "priority_id", "assignee_id"]:
-                        if field in arguments:
-                            data[field] = arguments[field]
-                    
-                    result = await self.client.create_work_package(data)
-                    
-                    text = f"✅ Work package created successfully:\n\n"
-                    text += f"- **Title**: {result.get('subject', 'N/A')}\n"
-                    text += f"- **ID**: #{result.get('id', 'N/A')}\n"
-                    
-                    if "_embedded" in result:
-                        embedded = result["_embedded"]
-                        if "type" in embedded:
-                            text += f"- **Type**: {embedded['type'].get('name', 'Unknown')}\n"
-                        if "status" in embedded:
-                            text += f"- **Status**: {embedded['status'].get('name', 'Unknown')}\n"
-                        if "project" in embedded:
-                            text += f"- **Project**: {embedded['project'].get('name', 'Unknown')}\n"
-                    
-                    return [TextContent(type="text", text=text)]
+                arguments = arguments or {}
+                try:
+                    spec = self.tools.resolve(name, arguments)
+                except ToolInputError as e:
+                    # Rejected before any API request or slot is taken
+                    outcome = "invalid"
+                    return [TextContent(type="text", text=f"❌ {e}")]
                 
-                else:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}"
-                    )]
-                    
+                client = self.client
+                if self.instances and spec.scope == "instance":
+                    client = self.instances.get(arguments.get("instance"))
+                async with self._session_slot():
+                    with self.prefetch.foreground_call() if self.prefetch else nullcontext():
+                        return await self.limiter.within_deadline(name, self._execute(spec, arguments, client))
+            except ToolDeadlineExceeded as e:
+                outcome = "timeout"
+                logger.warning(f"Tool {name} exceeded its {e.deadline:g}s deadline and was cancelled")
+                return [TextContent(
+                    type="text",
+                    text=f"❌ Tool '{name}' did not finish within {e.deadline:g}s and was cancelled. "
+                         f"Narrow the query or raise OPENPROJECT_TOOL_TIMEOUT_{name.upper()}."
+                )]
+            except asyncio.CancelledError:
+                # The client cancelled the request; in-flight API requests are cancelled with it
+                outcome = "cancelled"
+                raise
             except Exception as e:
+                outcome = "error"
                 logger.error(f"Error executing tool {name}: {e}", exc_info=True)
                 
                 error_text = f"❌ Error executing tool '{name}':\n\n{str(e)}"
                 
                 return [TextContent(type="text", text=error_text)]
+            finally:
+                self.metrics.inc("openproject_mcp_tool_calls_total", tool=name, outcome=outcome)
+                self.metrics.observe(
+                    "openproject_mcp_tool_duration_seconds",
+                    time.perf_counter() - started,
+                    tool=name
+                )
+        
+        @self.server.list_resources()
+        async def list_resources() -> List[Resource]:
+            """List the change feeds: all work packages plus every watched project"""
+            project_ids = sorted(
+                project_id for project_id in (self.feed.watches if self.feed else ())
+                if project_id is not None
+            )
+            return [
+                Resource(
+                    uri=ChangeFeed.uri(project_id),
+                    name=f"Changes in project {project_id}" if project_id else "Changes to all work packages",
+                    description="Work packages changed since the feed started; subscribe for update notifications",
+                    mimeType="application/json"
+                )
+                for project_id in [None] + project_ids
+            ]
+        
+        @self.server.list_resource_templates()
+        async def list_resource_templates() -> List[ResourceTemplate]:
+            """List the per-project change feed template"""
+            return [
+                ResourceTemplate(
+                    uriTemplate=f"{ChangeFeed.URI_PREFIX}project/{{project_id}}",
+                    name="Changes in a project",
+                    description="Work packages of one project changed since the feed started; append ?since=N for deltas after sequence N",
+                    mimeType="application/json"
+                )
+            ]
+        
+        @self.server.read_resource()
+        async def read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+            """Return the buffered deltas of a change feed"""
+            if not self.client or not self.feed:
+                raise ValueError("OpenProject Client not initialized")
+            project_id, since = ChangeFeed.parse_uri(str(uri))
+            watch = self.feed.watch(project_id)
+            # Reading keeps an unsubscribed feed polled for a while
+            watch.lease_until = time.monotonic() + 2 * self.feed.max_interval
+            await self.feed.start(self.client, watch)
+            return [ReadResourceContents(
+                content=json.dumps(self.feed.read(project_id, since)),
+                mime_type="application/json"
+            )]
+        
+        @self.server.subscribe_resource()
+        async def subscribe_resource(uri: AnyUrl) -> None:
+            """Start notifying this session when a change feed gets new deltas"""
+            if not self.feed:
+                raise ValueError("OpenProject Client not initialized")
+            project_id, _ = ChangeFeed.parse_uri(str(uri))
+            session = self.server.request_context.session
+            if not any(session in sessions for sessions in self._feed_sessions.values()):
+                # A disconnected client never unsubscribes; release its feeds when its session ends
+                self.server.on_session_close(lambda: self._drop_feed_subscriptions(session))
+            sessions = self._feed_sessions.setdefault(project_id, set())
+            if session not in sessions:
+                sessions.add(session)
+                self.feed.watch(project_id).subscribers += 1
+        
+        @self.server.unsubscribe_resource()
+        async def unsubscribe_resource(uri: AnyUrl) -> None:
+            """Stop notifying this session about a change feed"""
+            project_id, _ = ChangeFeed.parse_uri(str(uri))
+            self._drop_feed_session(project_id, self.server.request_context.session)
+    
+    @asynccontextmanager
+    async def _session_slot(self):
+        """
+        Hold one of the calling session's tool call slots.
+        
+        Every MCP session may run OPENPROJECT_SESSION_CONCURRENCY tool calls at
+        once; further calls wait. This keeps one busy client from taking over
+        the connection pool that all sessions of an HTTP server share.
+        """
+        semaphore = None
+        if self.session_concurrency > 0:
+            try:
+                session = self.server.request_context.session
+            except LookupError:
+                session = None
+            if session is not None:
+                semaphore = self._session_limits.get(session)
+                if semaphore is None:
+                    semaphore = self._session_limits[session] = asyncio.Semaphore(self.session_concurrency)
+        if semaphore is None:
+            yield
+            return
+        if semaphore.locked():
+            self.metrics.inc("openproject_mcp_session_throttled_total")
+        async with semaphore:
+            yield
+    
+    def _collect_session_metrics(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Gauge of sessions that have called a tool and are still connected"""
+        return [("openproject_mcp_sessions", "gauge", {}, float(len(self._session_limits)))]
+    
+    def _drop_feed_session(self, project_id: Optional[int], session) -> None:
+        """Forget a change feed subscriber and stop polling the scope if it was the last"""
+        sessions = self._feed_sessions.get(project_id)
+        if not sessions or session not in sessions:
+            return
+        sessions.discard(session)
+        watch = self.feed.watches.get(project_id) if self.feed else None
+        if watch:
+            watch.subscribers -= 1
+            self.feed.release(project_id)
+    
+    def _drop_feed_subscriptions(self, session) -> None:
+        """Forget every change feed subscription of a session that ended"""
+        for project_id in list(self._feed_sessions):
+            self._drop_feed_session(project_id, session)
+    
+    @staticmethod
+    def _render_project(project: Dict) -> str:
+        """Render one project as a Markdown list item"""
+        parts = [f"- **{project['name']}** (ID: {project['id']})\n"]
+        if (project.get("description") or {}).get("raw"):
+            parts.append(f"  {project['description']['raw']}\n")
+        parts.append(f"  Status: {'Active' if project.get('active') else 'Inactive'}\n")
+        parts.append(f"  Public: {'Yes' if project.get('public') else 'No'}\n\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_work_package(wp: Dict) -> str:
+        """Render one work package as a Markdown list item"""
+        parts = [f"- **{wp.get('subject', 'No title')}** (#{wp.get('id', 'N/A')})\n"]
+        
+        # Related names come from _embedded on full resources and
+        # from link titles on sparse ones
+        for label, relation in (
+            ("Type", "type"),
+            ("Status", "status"),
+            ("Project", "project"),
+            ("Assignee", "assignee")
+        ):
+            related = _related_name(wp, relation)
+            if related:
+                parts.append(f"  {label}: {related}\n")
+        
+        if "percentageDone" in wp:
+            parts.append(f"  Progress: {wp['percentageDone']}%\n")
+        
+        parts.append("\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_work_package_details(wp_id: int, detail: Dict, linked: Dict[str, str]) -> str:
+        """Render a work package with its related collections as Markdown"""
+        wp = detail["work_package"]
+        if wp is None:
+            reason = detail["errors"].get("work_packages", "not found or not visible")
+            return f"## #{wp_id}\n\n❌ Work package {reason}.\n\n"
+        
+        parts = [f"## {wp.get('subject', 'No title')} (#{wp_id})\n\n"]
+        for label, relation in (
+            ("Type", "type"),
+            ("Status", "status"),
+            ("Priority", "priority"),
+            ("Project", "project"),
+            ("Assignee", "assignee"),
+            ("Responsible", "responsible"),
+            ("Author", "author")
+        ):
+            related = _related_name(wp, relation)
+            if related:
+                parts.append(f"- **{label}**: {related}\n")
+        for label, field in (
+            ("Start", "startDate"),
+            ("Due", "dueDate"),
+            ("Progress", "percentageDone"),
+            ("Updated", "updatedAt")
+        ):
+            if wp.get(field) is not None:
+                parts.append(f"- **{label}**: {wp[field]}{'%' if field == 'percentageDone' else ''}\n")
+        description = (wp.get("description") or {}).get("raw")
+        if description:
+            parts.append(f"\n{description}\n")
+        
+        if "relations" in detail:
+            parts.append(f"\n**Relations** ({len(detail['relations'])}):\n")
+            for relation in detail["relations"]:
+                links = relation.get("_links", {})
+                outgoing = _href_id(links.get("from")) == wp_id
+                other = links.get("to" if outgoing else "from") or {}
+                kind = relation.get("type", "relates") if outgoing else relation.get("reverseType", relation.get("type", "relates"))
+                parts.append(f"- {kind} #{_href_id(other)} {other.get('title', '')}\n")
+        
+        if "watchers" in detail:
+            names = [watcher.get("name", f"User #{watcher.get('id')}") for watcher in detail["watchers"]]
+            parts.append(f"\n**Watchers** ({len(names)}): {', '.join(names) or 'none'}\n")
+        
+        if "attachments" in detail:
+            parts.append(f"\n**Attachments** ({len(detail['attachments'])}):\n")
+            for attachment in detail["attachments"]:
+                size = attachment.get("fileSize")
+                parts.append(
+                    f"- {attachment.get('fileName', 'unnamed')} (ID: {attachment.get('id')}"
+                    + (f", {size} bytes" if size is not None else "")
+                    + (f", {attachment['contentType']}" if attachment.get("contentType") else "")
+                    + ")\n"
+                )
+        
+        if "activities" in detail:
+            parts.append(f"\n**Activity** ({len(detail['activities'])}):\n")
+            for activity in detail["activities"]:
+                user_link = (activity.get("_links") or {}).get("user") or {}
+                user = user_link.get("title") or linked.get(user_link.get("href")) or f"User #{_href_id(user_link)}"
+                parts.append(f"- {activity.get('createdAt', '')} {user}\n")
+                for change in activity.get("details") or []:
+                    if change.get("raw"):
+                        parts.append(f"  - {change['raw']}\n")
+                comment = (activity.get("comment") or {}).get("raw")
+                if comment:
+                    parts.append(f"  > {comment}\n")
+        
+        for section, error in detail["errors"].items():
+            parts.append(f"\n⚠️ Could not fetch {section}: {error}\n")
+        
+        parts.append("\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_transfer(source: Any, result: Dict[str, Any]) -> str:
+        """Render one attachment upload or download result"""
+        if not result["ok"]:
+            return f"- ❌ {source}: {result['error'].splitlines()[0]}\n"
+        attachment = result["attachment"]
+        megabytes = result["size"] / 1048576
+        rate = megabytes / result["seconds"] if result["seconds"] > 0 else 0.0
+        check = "MD5 verified" if result["verified"] else "no server digest to verify"
+        line = (
+            f"- ✅ **{attachment.get('fileName', source)}** (attachment #{attachment.get('id', 'N/A')}): "
+            f"{megabytes:.1f} MiB in {result['seconds']:.1f}s ({rate:.1f} MiB/s), {check}\n"
+            f"  SHA-256: `{result['sha256']}`\n"
+        )
+        if result.get("path"):
+            line += f"  Saved to: {result['path']}\n"
+        return line
+    
+    @staticmethod
+    def _render_types(result: Dict, arguments: Dict[str, Any]) -> str:
+        """Render list_types"""
+        types = result.get("_embedded", {}).get("elements", [])
+        if not types:
+            return "No work package types found."
+        parts = ["Available work package types:\n\n"]
+        for type_item in types:
+            parts.append(f"- **{type_item.get('name', 'Unnamed')}** (ID: {type_item.get('id', 'N/A')})\n")
+            if type_item.get('isDefault'):
+                parts.append("  ✓ Default type\n")
+            if type_item.get('isMilestone'):
+                parts.append("  ✓ Milestone\n")
+            parts.append("\n")
+        return "".join(parts)
+    
+    @classmethod
+    def _render_details(cls, result: Dict[str, Any], arguments: Dict[str, Any]) -> str:
+        """Render get_work_package_details and its batch variant within the output budget"""
+        output = OutputBuilder.from_env()
+        for wp_id, detail in result["work_packages"].items():
+            if not output.add_item(cls._render_work_package_details(wp_id, detail, result["linked"])):
+                break
+        footer = ""
+        if output.truncated:
+            footer = (
+                f"Output budget reached after {output.items} of "
+                f"{len(result['work_packages'])} work packages; request the rest separately.\n"
+            )
+        return output.render("", footer)
+    
+    @staticmethod
+    def _render_created(result: Dict, arguments: Dict[str, Any]) -> str:
+        """Render create_work_package"""
+        parts = [
+            "✅ Work package created successfully:\n\n",
+            f"- **Title**: {result.get('subject', 'N/A')}\n",
+            f"- **ID**: #{result.get('id', 'N/A')}\n"
+        ]
+        
+        if "_embedded" in result:
+            embedded = result["_embedded"]
+            if "type" in embedded:
+                parts.append(f"- **Type**: {embedded['type'].get('name', 'Unknown')}\n")
+            if "status" in embedded:
+                parts.append(f"- **Status**: {embedded['status'].get('name', 'Unknown')}\n")
+            if "project" in embedded:
+                parts.append(f"- **Project**: {embedded['project'].get('name', 'Unknown')}\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_created_batch(results: List[Dict], arguments: Dict[str, Any]) -> str:
+        """Render create_work_packages, one line per requested work package"""
+        created = sum(1 for result in results if result["ok"])
+        parts = [f"Created {created} of {len(results)} work package(s):\n\n"]
+        for index, (item, result) in enumerate(zip(arguments["work_packages"], results), 1):
+            subject = item["subject"]
+            if result["ok"]:
+                wp = result["work_package"]
+                parts.append(f"{index}. ✅ **{wp.get('subject', subject)}** (#{wp.get('id', 'N/A')})\n")
+            else:
+                parts.append(f"{index}. ❌ **{subject}**: {result['error']}\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_updated(result: Tuple[List[Dict], List[Dict]], arguments: Dict[str, Any]) -> str:
+        """Render update_work_packages within the output budget"""
+        updates, results = result
+        updated = sum(1 for result in results if result["ok"])
+        conflicts = sum(result["conflicts"] for result in results)
+        header = f"Updated {updated} of {len(results)} work package(s)"
+        if conflicts:
+            header += f" ({conflicts} conflict(s) retried)"
+        output = OutputBuilder.from_env()
+        for update, result in zip(updates, results):
+            if result["ok"]:
+                wp = result["work_package"]
+                status = _related_name(wp, "status")
+                line = f"- ✅ #{update['id']} **{wp.get('subject', 'N/A')}**"
+                line += f" ({status})\n" if status else "\n"
+            else:
+                line = f"- ❌ #{update['id']}: {result['error'].splitlines()[0]}\n"
+            if not output.add_item(line):
+                break
+        footer = ""
+        if output.truncated:
+            footer = f"\nOutput budget reached after {output.items} of {len(results)} results.\n"
+        return output.render(header + ":\n\n", footer)
+    
+    @classmethod
+    def _render_transfers(cls, results: List[Dict[str, Any]], arguments: Dict[str, Any]) -> str:
+        """Render upload_attachment and download_attachment, one line per file"""
+        if "paths" in arguments:
+            sources, verb = arguments["paths"], "Uploaded"
+        else:
+            sources, verb = arguments["attachment_ids"], "Downloaded"
+        done = sum(1 for result in results if result["ok"])
+        parts = [f"{verb} {done} of {len(results)} attachment(s):\n\n"]
+        for source, result in zip(sources, results):
+            parts.append(cls._render_transfer(source, result))
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_summary(group_by: str, result: Dict[str, Any]) -> str:
+        """Render grouped counts and sums as a Markdown table"""
+        if not result["groups"]:
+            return "No work packages found."
+        sum_fields = list(result["total_sums"])
+        for group in result["groups"]:
+            sum_fields.extend(field for field in group["sums"] if field not in sum_fields)
+        
+        def cell(value: Any) -> str:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value) if isinstance(value, int) else f"{value:.2f}".rstrip("0").rstrip(".")
+            return "" if value is None else str(value)
+        
+        heading = group_by[0].upper() + group_by[1:]
+        parts = [
+            f"{result['total']} work package(s) by {group_by}:\n\n",
+            "| " + " | ".join([heading, "Count"] + sum_fields) + " |\n",
+            "|" + "---|" * (2 + len(sum_fields)) + "\n"
+        ]
+        for group in result["groups"]:
+            label = group["value"] if group["id"] is None else f"{group['value']} (ID: {group['id']})"
+            parts.append(
+                "| " + " | ".join([label, str(group["count"])] + [cell(group["sums"].get(field)) for field in sum_fields]) + " |\n"
+            )
+        if sum_fields:
+            parts.append(
+                "| **Total** | " + " | ".join([str(result["total"])] + [cell(result["total_sums"].get(field)) for field in sum_fields]) + " |\n"
+            )
+            parts.append("\nDurations are in hours.\n")
+        if result["source"] == "local":
+            parts.append("\n_Grouped locally: the server did not return grouped results._\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_mirror_row(row: Dict) -> str:
+        """Render one mirrored work package row as a Markdown list item"""
+        parts = [f"- **{row['subject']}** (#{row['id']})\n"]
+        for label, key in (
+            ("Type", "type"),
+            ("Status", "status"),
+            ("Project", "project"),
+            ("Assignee", "assignee")
+        ):
+            if row[key]:
+                parts.append(f"  {label}: {row[key]}\n")
+        if row["percentage_done"] is not None:
+            parts.append(f"  Progress: {row['percentage_done']}%\n")
+        parts.append(f"  Updated: {row['updated_at']}\n\n")
+        return "".join(parts)
+    
+    async def _render_items(
+        self,
+        name: str,
+        paginator: CollectionPaginator,
+        output: OutputBuilder,
+        render: Callable[[Dict], str],
+        rendered: Optional[Callable[[Dict], None]] = None
+    ) -> None:
+        """
+        Render collection elements into ``output`` as they arrive.
+        
+        Stops fetching as soon as the output budget is spent.
+        
+        Args:
+            name: Tool name, for the render time metric
+            paginator: Collection to render
+            output: Builder enforcing the output budget
+            render: Renders one element
+            rendered: Optional callback for every element that made it into the output
+        """
+        render_seconds = 0.0
+        try:
+            async for element in paginator:
+                render_started = time.perf_counter()
+                added = output.add_item(render(element))
+                render_seconds += time.perf_counter() - render_started
+                if not added:
+                    break
+                if rendered:
+                    rendered(element)
+        finally:
+            await paginator.aclose()
+            self.metrics.observe("openproject_mcp_render_seconds", render_seconds, tool=name)
+    
+    async def _render_fan_out(
+        self,
+        name: str,
+        fan_out: InstanceFanOut,
+        output: OutputBuilder,
+        render: Callable[[Dict], str]
+    ) -> Dict[str, int]:
+        """
+        Render elements from several instances into ``output`` as they arrive.
+        
+        Stops every instance's fetch as soon as the output budget is spent.
+        
+        Args:
+            name: Tool name, for the render time metric
+            fan_out: Merged collections of the instances
+            output: Builder enforcing the output budget
+            render: Renders one element as a Markdown list item
+            
+        Returns:
+            Dict[str, int]: Rendered elements per instance
+        """
+        shown = {instance: 0 for instance in fan_out.sources}
+        render_seconds = 0.0
+        try:
+            async for instance, element in fan_out:
+                render_started = time.perf_counter()
+                # Tag the list item with the instance it came from
+                added = output.add_item(f"- [{instance}] {render(element)[2:]}")
+                render_seconds += time.perf_counter() - render_started
+                if not added:
+                    break
+                shown[instance] += 1
+        finally:
+            await fan_out.aclose()
+            self.metrics.observe("openproject_mcp_render_seconds", render_seconds, tool=name)
+        return shown
+    
+    @staticmethod
+    def _fan_out_footer(fan_out: InstanceFanOut, shown: Dict[str, int], output: OutputBuilder) -> str:
+        """Per-instance outcome of a cross-instance listing"""
+        lines = ["Instances:"]
+        for instance, status in fan_out.status.items():
+            line = f"- {instance}: {shown[instance]}"
+            if status["total"] is not None:
+                line += f" of {status['total']}"
+            if status["state"] == "timeout":
+                line += f", timed out after {fan_out.timeout:g}s"
+            elif status["state"] == "error":
+                line += f", failed: {status['error']}"
+            elif status["state"] == "stopped":
+                line += ", stopped at the output budget"
+            lines.append(line)
+        if output.truncated:
+            lines.append("Output budget reached; pass instance= to the single-instance tool to page further.")
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _continuation(
+        name: str,
+        arguments: Dict[str, Any],
+        paginator: CollectionPaginator,
+        start: int,
+        output: OutputBuilder
+    ) -> str:
+        """
+        Footer pointing to the next slice of a listing, if there is one.
+        
+        Args:
+            name: Tool name
+            arguments: Arguments of the current call
+            paginator: Paginator the items came from
+            start: Position the current call started at
+            output: Builder holding the rendered items
+            
+        Returns:
+            str: Footer with a continuation cursor, or an empty string
+        """
+        position = start + output.items
+        more = output.truncated or (
+            paginator.total is not None and position < paginator.total
+        )
+        if not more or not paginator.effective_page_size:
+            return ""
+        cursor = _encode_cursor(name, arguments, position, paginator.effective_page_size)
+        return (
+            f"Showing {start + 1}-{position}"
+            + (f" of {paginator.total}" if paginator.total is not None else "")
+            + f". More results: call {name} again with cursor=\"{cursor}\".\n"
+        )
+    
+    def _render_stats_summary(self) -> str:
+        """Render the metrics registry as a Markdown summary"""
+        metrics = self.metrics
+        uptime = time.time() - metrics.started_at
+        lines = [f"Server statistics (uptime {uptime:.0f}s):", ""]
+        
+        def latency_table(title: str, metric: str, count_metric: str, key: str) -> None:
+            histograms = metrics.histograms(metric)
+            if not histograms:
+                return
+            counts: Dict[str, Dict[str, float]] = {}
+            for labels, value in metrics.counters(count_metric).items():
+                label_map = dict(labels)
+                outcome = label_map.get("outcome") or label_map.get("status", "")
+                counts.setdefault(label_map.get(key, ""), {})[outcome] = value
+            lines.extend([
+                f"**{title}**", "",
+                f"| {key} | calls | mean ms | p50 ms | p95 ms | p99 ms | results |",
+                "|---|---|---|---|---|---|---|"
+            ])
+            for labels, histogram in sorted(histograms.items(), key=lambda item: -item[1].sum):
+                label_map = dict(labels)
+                name = " ".join(v for k, v in labels if k != key) + " " + label_map.get(key, "")
+                results = ", ".join(
+                    f"{outcome}: {value:g}"
+                    for outcome, value in sorted(counts.get(label_map.get(key, ""), {}).items())
+                )
+                lines.append(
+                    f"| {name.strip()} | {histogram.count} "
+                    f"| {histogram.sum / histogram.count * 1000:.1f} "
+                    f"| {histogram.quantile(0.5) * 1000:.1f} "
+                    f"| {histogram.quantile(0.95) * 1000:.1f} "
+                    f"| {histogram.quantile(0.99) * 1000:.1f} | {results} |"
+                )
+            lines.append("")
+        
+        latency_table(
+            "Tools", "openproject_mcp_tool_duration_seconds",
+            "openproject_mcp_tool_calls_total", "tool"
+        )
+        latency_table(
+            "API endpoints", "openproject_mcp_http_request_duration_seconds",
+            "openproject_mcp_http_requests_total", "endpoint"
+        )
+        
+        sizes = metrics.histograms("openproject_mcp_http_response_bytes")
+        decode = {
+            dict(labels).get("endpoint"): h
+            for labels, h in metrics.histograms("openproject_mcp_json_decode_seconds").items()
+        }
+        if sizes:
+            lines.extend([
+                "**Payloads**", "",
+                "| endpoint | responses | total KB | mean KB | JSON decode ms (mean) |",
+                "|---|---|---|---|---|"
+            ])
+            for labels, histogram in sorted(sizes.items(), key=lambda item: -item[1].sum):
+                endpoint = dict(labels).get("endpoint", "")
+                decode_ms = 0.0
+                if decode.get(endpoint) and decode[endpoint].count:
+                    decode_ms = decode[endpoint].sum / decode[endpoint].count * 1000
+                lines.append(
+                    f"| {endpoint} | {histogram.count} | {histogram.sum / 1024:.1f} "
+                    f"| {histogram.sum / histogram.count / 1024:.1f} | {decode_ms:.2f} |"
+                )
+            lines.append("")
+        
+        render = metrics.histograms("openproject_mcp_render_seconds")
+        if render:
+            lines.extend(["**Rendering**", "", "| tool | renders | mean ms | p95 ms |", "|---|---|---|---|"])
+            for labels, histogram in sorted(render.items(), key=lambda item: -item[1].sum):
+                lines.append(
+                    f"| {dict(labels).get('tool', '')} | {histogram.count} "
+                    f"| {histogram.sum / histogram.count * 1000:.2f} "
+                    f"| {histogram.quantile(0.95) * 1000:.2f} |"
+                )
+            lines.append("")
+        
+        prefetches = metrics.counters("openproject_mcp_prefetch_requests_total")
+        if prefetches:
+            by_resource: Dict[str, Dict[str, float]] = {}
+            for labels, value in prefetches.items():
+                label_map = dict(labels)
+                by_resource.setdefault(label_map.get("resource", ""), {})[label_map.get("outcome", "")] = value
+            lines.extend(["**Prefetch**", "", "| resource | results |", "|---|---|"])
+            for resource, outcomes in sorted(by_resource.items()):
+                results = ", ".join(f"{outcome}: {value:g}" for outcome, value in sorted(outcomes.items()))
+                lines.append(f"| {resource} | {results} |")
+            lines.append("")
+        
+        collected = metrics.collected()
+        if collected:
+            lines.extend(["**Client state**", ""])
+            for metric, _, labels, value in collected:
+                suffix = "".join(f" {k}={v}" for k, v in sorted(labels.items()))
+                lines.append(f"- {metric}{suffix}: {value:g}")
+        
+        return "\n".join(lines)
+    
+    async def _write_metrics_forever(self, path: str, interval: float):
+        """Periodically write the Prometheus exposition to a file"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.metrics.write_prometheus_file(path)
+            except OSError as e:
+                logger.warning(f"Could not write metrics file {path}: {e}")
+    
+    async def _start_metrics_export(self):
+        """Start the optional Prometheus file writer and HTTP endpoint"""
+        path = os.getenv("OPENPROJECT_METRICS_FILE")
+        if path:
+            interval = _env_float("OPENPROJECT_METRICS_INTERVAL", 15.0)
+            self._metrics_tasks.append(
+                asyncio.create_task(self._write_metrics_forever(path, interval))
+            )
+            logger.info(f"Writing Prometheus metrics to {path} every {interval:.0f}s")
+        
+        port = _env_int("OPENPROJECT_METRICS_PORT", 0)
+        if port:
+            from aiohttp import web
+            
+            async def serve_metrics(request):
+                return web.Response(
+                    text=self.metrics.render_prometheus(),
+                    content_type="text/plain",
+                    charset="utf-8",
+                    headers={"X-Content-Type-Options": "nosniff"}
+                )
+            
+            app = web.Application()
+            app.router.add_get("/metrics", serve_metrics)
+            self._metrics_runner = web.AppRunner(app, access_log=None)
+            await self._metrics_runner.setup()
+            host = os.getenv("OPENPROJECT_METRICS_HOST", "127.0.0.1")
+            await web.TCPSite(self._metrics_runner, host, port).start()
+            logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    
+    async def _stop_metrics_export(self):
+        """Stop metrics export, writing the file one last time"""
+        for task in self._metrics_tasks:
+            task.cancel()
+        await asyncio.gather(*self._metrics_tasks, return_exceptions=True)
+        self._metrics_tasks = []
+        path = os.getenv("OPENPROJECT_METRICS_FILE")
+        if path:
+            try:
+                self.metrics.write_prometheus_file(path)
+            except OSError:
+                pass
+        if self._metrics_runner:
+            await self._metrics_runner.cleanup()
+            self._metrics_runner = None
+    
+    async def _sync_mirror_forever(self, interval: float):
+        """Keep the local mirror fresh with periodic incremental syncs"""
+        while True:
+            for project_id in self.mirror_projects:
+                try:
+                    await self.mirror.sync(self.client, project_id)
+                except Exception as e:
+                    logger.warning(f"Mirror sync failed: {e}")
+            await asyncio.sleep(interval)
+    
+    async def _notify_feed_subscribers(self, project_id: Optional[int]):
+        """Send resources/updated to every session subscribed to a change feed"""
+        uri = AnyUrl(ChangeFeed.uri(project_id))
+        for session in list(self._feed_sessions.get(project_id, ())):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as e:
+                logger.debug(f"Dropping change feed subscriber of {uri}: {e}")
+                self._drop_feed_session(project_id, session)
+    
+    async def _poll_changes_forever(self):
+        """Poll watched change feeds when they are due and notify their subscribers"""
+        while True:
+            self.feed.wakeup.clear()
+            due = self.feed.due()
+            if due:
+                results = await asyncio.gather(
+                    *(self.feed.poll(self.client, watch) for watch in due),
+                    return_exceptions=True
+                )
+                for watch, result in zip(due, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Change feed poll of {ChangeFeed.uri(watch.project_id)} failed: {result}")
+                    elif result:
+                        await self._notify_feed_subscribers(watch.project_id)
+                continue
+            try:
+                await asyncio.wait_for(self.feed.wakeup.wait(), self.feed.next_due())
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _start_feed(self):
+        """Create the change feed and start its poller"""
+        if not self.client:
+            return
+        self.feed = ChangeFeed.from_env(self.metrics)
+        self._feed_task = asyncio.create_task(self._poll_changes_forever())
+    
+    async def _stop_feed(self):
+        """Stop the change feed poller"""
+        if self._feed_task:
+            self._feed_task.cancel()
+            await asyncio.gather(self._feed_task, return_exceptions=True)
+            self._feed_task = None
+    
+    async def _start_mirror(self):
+        """Open the local mirror and start background syncing if configured"""
+        path = os.getenv("OPENPROJECT_MIRROR_PATH")
+        if not path or not self.client:
+            return
+        
+        self.mirror = WorkPackageMirror(
+            path,
+            page_size=_env_int("OPENPROJECT_MIRROR_PAGE_SIZE", 1000),
+            reconcile_interval=_env_float("OPENPROJECT_MIRROR_RECONCILE_INTERVAL", 3600.0)
+        )
+        await self.mirror.open()
+        
+        projects = os.getenv("OPENPROJECT_MIRROR_PROJECTS", "")
+        project_ids = [int(p) for p in projects.split(",") if p.strip().isdigit()]
+        self.mirror_projects = project_ids or [None]
+        
+        interval = _env_float("OPENPROJECT_MIRROR_SYNC_INTERVAL", 300.0)
+        if interval > 0:
+            self._mirror_task = asyncio.create_task(self._sync_mirror_forever(interval))
+        logger.info(f"✅ Local work package mirror at {path}")
+    
+    async def _stop_mirror(self):
+        """Stop background syncing and close the local mirror"""
+        if self._mirror_task:
+            self._mirror_task.cancel()
+            await asyncio.gather(self._mirror_task, return_exceptions=True)
+            self._mirror_task = None
+        if self.mirror:
+            await self.mirror.close()
+            self.mirror = None
+    
+    async def _prewarm(self):
+        """Import the HTTP stack and connect to every instance while the MCP handshake runs"""
+        # The import is CPU bound, so it runs in a thread instead of stalling the handshake
+        await asyncio.to_thread(aiohttp.load)
+        await self.instances.open()
+        await asyncio.gather(*(client.prewarm() for client in self.instances.clients.values()))
+    
+    def _start_prewarm(self):
+        """Start prewarming in the background unless OPENPROJECT_PREWARM is false"""
+        if not self.instances or os.getenv("OPENPROJECT_PREWARM", "true").lower() != "true":
+            return
+        self._prewarm_task = asyncio.create_task(self._prewarm())
+    
+    async def _stop_prewarm(self):
+        """Cancel a prewarm that is still running"""
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
+            await asyncio.gather(self._prewarm_task, return_exceptions=True)
+            self._prewarm_task = None
+    
+    async def _serve_http(self):
+        """
+        Serve MCP over HTTP until the process is stopped.
+        
+        Streamable HTTP is served at OPENPROJECT_HTTP_PATH and the older
+        HTTP+SSE transport at the fixed path /sse, with messages posted to
+        /messages/. Every session of either transport runs in this process,
+        so they all share one API client with its connection pool, cache and
+        request coalescing.
+        """
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.responses import Response
+        from starlette.routing import Mount, Route
+        from mcp.server.sse import SseServerTransport
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        
+        host = os.getenv("OPENPROJECT_HTTP_HOST", "127.0.0.1")
+        port = _env_int("OPENPROJECT_HTTP_PORT", 8000)
+        path = "/" + os.getenv("OPENPROJECT_HTTP_PATH", "/mcp").strip("/")
+        max_sessions = _env_int("OPENPROJECT_HTTP_MAX_SESSIONS", 100)
+        
+        manager = StreamableHTTPSessionManager(
+            app=self.server,
+            session_idle_timeout=_env_float("OPENPROJECT_HTTP_SESSION_IDLE_TIMEOUT", 1800.0),
+            max_sessions=max_sessions if max_sessions > 0 else None
+        )
+        sse = SseServerTransport("/messages/")
+        
+        async def handle_sse(request):
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+            return Response()
+        
+        @asynccontextmanager
+        async def lifespan(app):
+            async with manager.run():
+                yield
+        
+        app = Starlette(
+            routes=[
+                # An exact route: a Mount would redirect the bare path to path + "/"
+                Route(path, endpoint=_StreamableHTTPApp(manager)),
+                Route("/sse", endpoint=handle_sse, methods=["GET"]),
+                Mount("/messages/", app=sse.handle_post_message)
+            ],
+            lifespan=lifespan
+        )
+        config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level=os.getenv("LOG_LEVEL", "INFO").lower(),
+            access_log=False
+        )
+        logger.info(f"Serving MCP on http://{host}:{port}{path} (Streamable HTTP) and /sse (SSE)")
+        await uvicorn.Server(config).serve()
     
     async def run(self):
         """Start the MCP server"""
-        # Initialize OpenProject client from environment variables
-        base_url = os.getenv("OPENPROJECT_URL")
-        api_key = os.getenv("OPENPROJECT_API_KEY")
-        proxy = os.getenv("OPENPROJECT_PROXY")  # Optional proxy
+        # Initialize the OpenProject clients from the instances file or environment variables
+        self.instances = InstanceRegistry.from_env(metrics=self.metrics)
         
-        if not base_url or not api_key:
+        if not self.instances:
             logger.error("OPENPROJECT_URL or OPENPROJECT_API_KEY not set!")
             logger.info("Please set the required environment variables in .env file")
         else:
-            self.client = OpenProjectClient(base_url, api_key, proxy)
-            logger.info(f"✅ OpenProject Client initialized for {base_url}")
+            self.client = self.instances.get()
+            self.tools.publish(self.instances.names, self.instances.default)
+            self.metrics.add_collector(self.instances.collect_metrics)
+            for instance, client in self.instances.clients.items():
+                logger.info(f"✅ OpenProject Client initialized for {instance}: {client.base_url}")
+            
+            if self.cache_snapshot:
+                restored = self.instances.load_snapshot(self.cache_snapshot)
+                logger.info(f"Restored {restored} metadata cache entries from {self.cache_snapshot}")
             
             # Optional: Test connection on startup
             if os.getenv("TEST_CONNECTION_ON_STARTUP", "false").lower() == "true":
-                try:
-                    await self.client.test_connection()
-                    logger.info("✅ API connection test successful!")
-                except Exception as e:
-                    logger.error(f"❌ API connection test failed: {e}")
+                for instance, client in self.instances.clients.items():
+                    try:
+                        await client.test_connection()
+                        logger.info(f"✅ API connection test successful for {instance}!")
+                    except Exception as e:
+                        logger.error(f"❌ API connection test failed for {instance}: {e}")
+        
+        await self._start_mirror()
+        await self._start_feed()
+        await self._start_metrics_export()
+        self._start_prewarm()
         
         # Start the server
-        from mcp.server.stdio import stdio_server
+        transport = os.getenv("OPENPROJECT_TRANSPORT", "stdio").lower()
+        if transport not in ("stdio", "http"):
+            logger.warning(f"Unknown OPENPROJECT_TRANSPORT {transport!r}, using stdio")
+            transport = "stdio"
         
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        try:
+            if transport == "http":
+                await self._serve_http()
+            else:
+                from mcp.server.stdio import stdio_server
+                
+                async with stdio_server() as (read_stream, write_stream):
+                    await self.server.run(
+                        read_stream,
+                        write_stream,
+                        self.server.create_initialization_options()
+                    )
+        finally:
+            await self._stop_prewarm()
+            if self.prefetch:
+                await self.prefetch.close()
+            await self._stop_metrics_export()
+            await self._stop_feed()
+            await self._stop_mirror()
+            if self.instances:
+                if self.cache_snapshot:
+                    try:
+                        self.instances.save_snapshot(self.cache_snapshot)
+                    except OSError as e:
+                        logger.warning(f"Could not write cache snapshot {self.cache_snapshot}: {e}")
+                await self.instances.close()
 
 
 async def main():
@@ -0,0 +1,149 @@
+"""
+Shared fixtures for the OpenProject MCP server tests.
+
+Tests run against ``benchmarks/stub_server.py``, a local stand-in for the
+OpenProject API v3, served in the test's event loop on a free port.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pytest
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_server import StubOpenProject  # noqa: E402
+
+
+def _load_server_module():
+    """Import openproject-mcp.py, whose file name is not a valid module name"""
+    spec = importlib.util.spec_from_file_location("openproject_mcp", ROOT / "openproject-mcp.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["openproject_mcp"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+openproject_mcp = _load_server_module()
+
+
+class FaultyStub(StubOpenProject):
+    """Stub that fails requests to chosen routes before serving them"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        # (method, path prefix) -> list of (status, headers) answered in order
+        self.faults: Dict[Tuple[str, str], list] = {}
+
+    def fail(self, method: str, prefix: str, statuses: Iterable[int], retry_after: str = None) -> None:
+        """Answer the next requests to a route prefix with the given statuses"""
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        self.faults.setdefault((method, prefix), []).extend((status, headers) for status in statuses)
+
+    def build_app(self) -> web.Application:
+        app = super().build_app()
+
+        @web.middleware
+        async def inject(request: web.Request, handler):
+            for (method, prefix), queue in self.faults.items():
+                if queue and request.method == method and request.path.startswith(prefix):
+                    status, headers = queue.pop(0)
+                    return web.json_response(
+                        {"_type": "Error", "message": f"Injected {status}"},
+                        status=status,
+                        headers=headers
+                    )
+            return await handler(request)
+
+        app.middlewares.append(inject)
+        return app
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    """Run every test with the server defaults, whatever the shell exports"""
+    for name in list(os.environ):
+        if name.startswith("OPENPROJECT_"):
+            monkeypatch.delenv(name)
+
+
+@pytest.fixture
+async def start_stub():
+    """Factory starting stubs with custom options; all are stopped after the test"""
+    stubs = []
+
+    async def start(stub_class=StubOpenProject, **options: Any) -> StubOpenProject:
+        options.setdefault("work_packages", 200)
+        options.setdefault("projects", 5)
+        stub = stub_class(**options)
+        await stub.start()
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        await stub.stop()
+
+
+@pytest.fixture
+async def stub(start_stub):
+    return await start_stub()
+
+
+@pytest.fixture
+async def client(stub):
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+async def make_server(monkeypatch):
+    """Factory building an MCP server for a stub; environment overrides apply first"""
+    servers = []
+
+    async def make(stub: StubOpenProject, **env: str):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        server = openproject_mcp.OpenProjectMCPServer()
+        server.client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key", metrics=server.metrics)
+        await server.client.open()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        for task in server._metrics_tasks:
+            task.cancel()
+        if server.prefetch:
+            await server.prefetch.close()
+        if server.mirror:
+            await server.mirror.close()
+        await server.client.close()
+
+
+async def list_tools(server) -> List[str]:
+    """Names of the tools the MCP server offers"""
+    from mcp import types
+
+    result = await server.server.request_handlers[types.ListToolsRequest](types.ListToolsRequest(method="tools/list"))
+    return [tool.name for tool in result.root.tools]
+
+
+async def call_tool(server, name: str, arguments: Dict[str, Any]) -> Tuple[bool, str]:
+    """Call a tool through the MCP request handler; returns (succeeded, text)"""
+    from mcp import types
+
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments)
+    )
+    result = await server.server.request_handlers[types.CallToolRequest](request)
+    text = "\n".join(item.text for item in result.root.content)
+    return not result.root.isError and not text.startswith("❌"), text
@@ -0,0 +1,261 @@
+"""Tests for streamed attachment transfers and the attachment root"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from aiohttp import web
+
+from conftest import StubOpenProject, call_tool, list_tools, openproject_mcp
+from stub_server import LARGE_ATTACHMENT_ID
+
+# Work package 5 of the stub has attachments 20 and 21
+ATTACHMENT_ID = 20
+
+
+class StallingStub(StubOpenProject):
+    """Stub that sends the first block of an attachment and then stalls until released"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.release = asyncio.Event()
+
+    async def attachment_content(self, request: web.Request) -> web.StreamResponse:
+        attachment_id = int(request.match_info["attachment_id"])
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        response.content_length = self._attachment_size(attachment_id)
+        await response.prepare(request)
+        await response.write(next(self._content(attachment_id, response.content_length)))
+        await self.release.wait()
+        return response
+
+
+class CorruptingStub(StubOpenProject):
+    """Stub that reports a wrong digest for every attachment"""
+
+    def _attachment(self, *args, **kwargs):
+        attachment = super()._attachment(*args, **kwargs)
+        attachment["digest"]["hash"] = "0" * 32
+        return attachment
+
+
+def part_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".part")]
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    return root
+
+
+async def test_upload_streams_the_file_and_verifies_the_stored_digest(client, stub, tmp_path):
+    data = os.urandom(3 * client.TRANSFER_CHUNK_BYTES + 17)
+    path = tmp_path / "report.pdf"
+    path.write_bytes(data)
+
+    result = await client.upload_attachment(5, str(path), "Quarterly report")
+
+    assert result["size"] == len(data)
+    assert result["md5"] == hashlib.md5(data).hexdigest()
+    assert result["sha256"] == hashlib.sha256(data).hexdigest()
+    assert result["verified"] is True
+    attachment = result["attachment"]
+    assert attachment["fileName"] == "report.pdf"
+    assert attachment["fileSize"] == len(data)
+    assert attachment["contentType"] == "application/pdf"
+
+
+async def test_unverified_upload_is_deleted_again(start_stub, tmp_path):
+    stub = await start_stub(CorruptingStub)
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"report")
+    try:
+        with pytest.raises(openproject_mcp.OpenProjectAPIError, match="Checksum mismatch.*was removed"):
+            await client.upload_attachment(5, str(path))
+    finally:
+        await client.close()
+
+    assert stub._uploads == {}
+    assert stub.requests["DELETE /api/v3/attachments/{attachment_id}"] == 1
+
+
+async def test_file_growing_during_upload_is_rejected(client, stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(client, "TRANSFER_CHUNK_BYTES", 1024)
+    path = tmp_path / "growing.log"
+    path.write_bytes(b"x" * 2048)
+    read_and_hash = client._read_and_hash
+
+    def append_while_reading(handle, size, digests):
+        if handle.tell() == 0:
+            with open(path, "ab") as writer:
+                writer.write(b"y" * 10)
+        return read_and_hash(handle, size, digests)
+
+    monkeypatch.setattr(client, "_read_and_hash", append_while_reading)
+
+    with pytest.raises(openproject_mcp.OpenProjectAPIError, match="changed while it was uploaded: expected 2048 bytes"):
+        await client.upload_attachment(5, str(path))
+
+    assert stub._uploads == {}
+
+
+async def test_download_writes_the_verified_file_and_no_part_file(client, stub, tmp_path):
+    result = await client.download_attachment(ATTACHMENT_ID, str(tmp_path))
+
+    path = tmp_path / "attachment-5-0.pdf"
+    assert result["path"] == str(path)
+    assert result["verified"] is True
+    data = path.read_bytes()
+    assert len(data) == result["size"] == result["attachment"]["fileSize"]
+    assert hashlib.md5(data).hexdigest() == stub._digests[ATTACHMENT_ID]
+    assert hashlib.sha256(data).hexdigest() == result["sha256"]
+    assert part_files(tmp_path) == []
+
+
+async def test_checksum_mismatch_raises_and_leaves_nothing_behind(client, stub, tmp_path):
+    stub._digests[ATTACHMENT_ID] = "0" * 32
+
+    with pytest.raises(openproject_mcp.OpenProjectAPIError, match="Checksum mismatch"):
+        await client.download_attachment(ATTACHMENT_ID, str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
+
+
+async def test_cancelled_download_removes_its_part_file(start_stub, tmp_path):
+    stub = await start_stub(StallingStub, large_attachment=8 * 1024 * 1024)
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    try:
+        task = asyncio.create_task(
+            client.download_attachment(LARGE_ATTACHMENT_ID, str(tmp_path))
+        )
+        for _ in range(500):
+            if part_files(tmp_path):
+                break
+            await asyncio.sleep(0.01)
+        assert part_files(tmp_path)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    finally:
+        stub.release.set()
+        await client.close()
+
+    assert os.listdir(tmp_path) == []
+
+
+async def test_existing_file_is_kept_without_overwrite(client, tmp_path):
+    target = tmp_path / "attachment-5-0.pdf"
+    target.write_bytes(b"mine")
+
+    with pytest.raises(FileExistsError):
+        await client.download_attachment(ATTACHMENT_ID, str(tmp_path))
+    assert target.read_bytes() == b"mine"
+
+    result = await client.download_attachment(ATTACHMENT_ID, str(tmp_path), overwrite=True)
+
+    assert target.stat().st_size == result["size"]
+    assert part_files(tmp_path) == []
+
+
+async def test_attachment_tools_are_not_offered_without_a_root(stub, make_server, tmp_path):
+    server = await make_server(stub)
+
+    names = await list_tools(server)
+    assert "upload_attachment" not in names
+    assert "download_attachment" not in names
+
+    ok, text = await call_tool(server, "download_attachment", {"attachment_ids": [ATTACHMENT_ID], "directory": str(tmp_path)})
+    assert not ok
+    assert "Unknown tool" in text
+    assert os.listdir(tmp_path) == []
+
+
+async def test_a_root_that_is_not_a_directory_disables_the_tools(stub, make_server, tmp_path):
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=tmp_path / "missing")
+
+    assert server.attachment_root is None
+    assert "upload_attachment" not in await list_tools(server)
+
+
+async def test_upload_tool_reads_files_relative_to_the_root(stub, make_server, root):
+    (root / "notes.txt").write_bytes(b"meeting notes\n")
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+
+    ok, text = await call_tool(server, "upload_attachment", {"work_package_id": 5, "paths": ["notes.txt"]})
+
+    assert ok, text
+    assert "Uploaded 1 of 1 attachment(s)" in text
+    assert "MD5 verified" in text
+
+
+@pytest.mark.parametrize("escape", ["absolute", "dotdot", "symlink"])
+async def test_upload_paths_outside_the_root_are_rejected(stub, make_server, root, tmp_path, escape):
+    secret = tmp_path / "id_rsa"
+    secret.write_bytes(b"private key")
+    (root / "link").symlink_to(secret)
+    path = {"absolute": str(secret), "dotdot": "../id_rsa", "symlink": "link"}[escape]
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+
+    ok, text = await call_tool(server, "upload_attachment", {"work_package_id": 5, "paths": [path]})
+
+    assert not ok
+    assert "outside the attachment root" in text
+    assert "POST /api/v3/work_packages/{wp_id}/attachments" not in stub.requests
+
+
+async def test_system_files_cannot_be_uploaded(stub, make_server, root):
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+
+    ok, text = await call_tool(server, "upload_attachment", {"work_package_id": 5, "paths": ["/etc/passwd"]})
+
+    assert not ok
+    assert "outside the attachment root" in text
+
+
+@pytest.mark.parametrize("directory", ["..", "/tmp"])
+async def test_download_directories_outside_the_root_are_rejected(stub, make_server, root, directory):
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+
+    ok, text = await call_tool(server, "download_attachment", {"attachment_ids": [ATTACHMENT_ID], "directory": directory})
+
+    assert not ok
+    assert "outside the attachment root" in text
+    assert not any(key.startswith("GET /api/v3/attachments") for key in stub.requests)
+
+
+async def test_download_tool_renames_repeated_file_names_in_a_batch(stub, make_server, root):
+    (root / "downloads").mkdir()
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+
+    ok, text = await call_tool(
+        server, "download_attachment", {"attachment_ids": [ATTACHMENT_ID, ATTACHMENT_ID], "directory": "downloads"}
+    )
+
+    assert ok, text
+    assert "Downloaded 2 of 2 attachment(s)" in text
+    assert sorted(os.listdir(root / "downloads")) == ["attachment-5-0 (2).pdf", "attachment-5-0.pdf"]
+
+
+async def test_download_tool_reports_existing_files_unless_overwriting(stub, make_server, root):
+    (root / "attachment-5-0.pdf").write_bytes(b"mine")
+    server = await make_server(stub, OPENPROJECT_ATTACHMENT_ROOT=root)
+    arguments = {"attachment_ids": [ATTACHMENT_ID], "directory": "."}
+
+    _, text = await call_tool(server, "download_attachment", arguments)
+
+    assert "Downloaded 0 of 1 attachment(s)" in text
+    assert "already exists" in text
+    assert (root / "attachment-5-0.pdf").read_bytes() == b"mine"
+
+    _, text = await call_tool(server, "download_attachment", {**arguments, "overwrite": True})
+
+    assert "Downloaded 1 of 1 attachment(s)" in text
+    assert (root / "attachment-5-0.pdf").read_bytes() != b"mine"
+    assert part_files(root) == []
@@ -0,0 +1,60 @@
+"""Tests for the benchmark suite and its stub server"""
+
+import argparse
+
+import aiohttp
+
+import benchmark
+from conftest import openproject_mcp
+
+
+def test_percentile_interpolates_between_samples():
+    assert benchmark.percentile([], 0.5) == 0.0
+    assert benchmark.percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert benchmark.percentile([1.0, 2.0, 3.0, 4.0], 1.0) == 4.0
+
+
+def test_compare_reports_only_regressions_beyond_the_threshold():
+    def result(p50, throughput):
+        return {"scenarios": {"list_types": {
+            "latency_ms": {"p50": p50, "p95": p50},
+            "peak_memory_bytes": 1000,
+            "throughput_per_second": throughput
+        }}}
+
+    assert benchmark.compare(result(10.5, 100), result(10.0, 100), 0.1) == []
+    regressions = benchmark.compare(result(10.0, 50), result(10.0, 100), 0.1)
+    assert regressions == ["list_types: throughput 100 -> 50 (-50.0%)"]
+
+
+async def test_stub_answers_unchanged_metadata_with_304(stub):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{stub.url}/api/v3/types") as response:
+            etag = response.headers["ETag"]
+        async with session.get(f"{stub.url}/api/v3/types", headers={"If-None-Match": etag}) as response:
+            assert response.status == 304
+
+
+async def test_stub_caps_the_page_size(start_stub):
+    stub = await start_stub(max_page_size=7)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{stub.url}/api/v3/projects", params={"pageSize": "100"}) as response:
+            page = await response.json(content_type=None)
+
+    assert page["pageSize"] == 7
+    assert page["count"] == 5
+    assert page["total"] == 5
+
+
+async def test_scenario_runs_against_the_stub(stub):
+    args = argparse.Namespace(
+        warmup=1, iterations=4, concurrency=2, work_packages=200, detail_batch=3, list_max_results=None
+    )
+    runner = benchmark.Benchmark(openproject_mcp, stub.url, args)
+
+    result = await runner.run_scenario("get_work_package_details_batch")
+
+    assert result["errors"] == 0
+    assert result["iterations"] == 4
+    assert result["api_requests_per_call"] > 0
+    assert result["latency_ms"]["min"] <= result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
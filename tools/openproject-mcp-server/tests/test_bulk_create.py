@@ -0,0 +1,62 @@
+"""Tests for bulk work package creation"""
+
+from conftest import call_tool
+
+
+async def test_one_form_per_project_and_type(client, stub):
+    items = [
+        {"project": project, "type": type_id, "subject": f"Item {n}"}
+        for n, (project, type_id) in enumerate([(1, 1), (1, 1), (2, 1), (1, 3), (2, 1)])
+    ]
+
+    results = await client.create_work_packages(items, concurrency=2)
+
+    assert [result["work_package"]["subject"] for result in results] == [item["subject"] for item in items]
+    assert stub.requests["POST /api/v3/work_packages/form"] == 3
+    assert stub.requests["POST /api/v3/work_packages"] == 5
+
+
+async def test_cached_form_templates_are_reused_across_batches(client, stub):
+    await client.create_work_packages([{"project": 1, "type": 1, "subject": "A"}])
+    await client.create_work_packages([{"project": 1, "type": 1, "subject": "B"}])
+    await client.create_work_package({"project": 1, "type": 1, "subject": "C"})
+
+    assert stub.requests["POST /api/v3/work_packages/form"] == 1
+
+
+async def test_a_failing_item_does_not_abort_the_batch(client):
+    results = await client.create_work_packages([
+        {"project": 1, "type": 1, "subject": "Valid"},
+        {"project": 1, "type": 1, "subject": ""},
+        {"project": 1, "type": 1, "subject": "Also valid"}
+    ])
+
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert "Subject can't be blank" in results[1]["error"]
+
+
+async def test_create_work_packages_tool_reports_each_item(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "create_work_packages", {
+        "work_packages": [
+            {"project_id": 1, "type_id": 1, "subject": "Tool item"},
+            {"project_id": 2, "type_id": 1, "subject": ""}
+        ]
+    })
+
+    assert ok
+    assert "Tool item" in text
+    assert "Subject can't be blank" in text
+
+
+async def test_oversized_batches_are_rejected_without_requests(stub, make_server):
+    server = await make_server(stub)
+    item = {"project_id": 1, "subject": "Item", "type_id": 1}
+
+    ok, _ = await call_tool(server, "create_work_packages", {"work_packages": [item] * 501})
+    assert not ok
+    ok, _ = await call_tool(server, "create_work_packages", {"work_packages": [item], "concurrency": 33})
+    assert not ok
+
+    assert stub.requests == {}
@@ -0,0 +1,86 @@
+"""Tests for bulk updates with optimistic-lock retry"""
+
+from conftest import call_tool, openproject_mcp
+
+
+async def test_updates_share_one_lock_version_lookup(client, stub):
+    results = await client.update_work_packages([
+        {"id": wp_id, "status_id": 2, "assignee_id": 4} for wp_id in (3, 4, 5)
+    ])
+
+    assert all(result["ok"] and result["conflicts"] == 0 for result in results)
+    assert {result["work_package"]["_links"]["status"]["title"] for result in results} == {"In progress"}
+    assert stub.requests["GET /api/v3/work_packages"] == 1
+    assert "GET /api/v3/work_packages/{wp_id}" not in stub.requests
+    assert stub.requests["PATCH /api/v3/work_packages/{wp_id}"] == 3
+
+
+async def test_conflicts_are_retried_with_a_fresh_lock_version(start_stub):
+    stub = await start_stub(conflict_every=2)
+    metrics = openproject_mcp.Metrics()
+    async with openproject_mcp.OpenProjectClient(stub.url, "test-key", metrics=metrics) as client:
+        results = await client.update_work_packages(
+            [{"id": wp_id, "subject": f"Renamed {wp_id}"} for wp_id in range(1, 7)],
+            concurrency=1
+        )
+
+    assert all(result["ok"] for result in results)
+    conflicts = sum(result["conflicts"] for result in results)
+    assert conflicts >= 1
+    assert sum(metrics.counters("openproject_mcp_update_conflicts_total").values()) == conflicts
+
+
+async def test_exhausted_conflict_retries_fail_only_that_update(start_stub):
+    stub = await start_stub(conflict_every=1)
+    async with openproject_mcp.OpenProjectClient(stub.url, "test-key") as client:
+        results = await client.update_work_packages([{"id": 2, "subject": "Never"}], conflict_retries=2)
+
+    assert results[0]["ok"] is False
+    assert results[0]["conflicts"] == 2
+    assert "409" in results[0]["error"]
+
+
+async def test_updates_of_one_work_package_apply_in_order(client):
+    results = await client.update_work_packages([
+        {"id": 8, "subject": "First"},
+        {"id": 9, "percentage_done": 50},
+        {"id": 8, "subject": "Second"}
+    ])
+
+    assert [result["ok"] for result in results] == [True, True, True]
+    assert results[2]["work_package"]["subject"] == "Second"
+    assert results[2]["work_package"]["lockVersion"] > results[0]["work_package"]["lockVersion"]
+
+
+async def test_missing_work_package_does_not_abort_the_batch(client):
+    results = await client.update_work_packages([{"id": 9999, "subject": "x"}, {"id": 3, "subject": "y"}])
+
+    assert [result["ok"] for result in results] == [False, True]
+
+
+async def test_update_tool_applies_shared_changes(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "update_work_packages", {
+        "work_package_ids": [11, 12],
+        "changes": {"status_id": 4}
+    })
+
+    assert ok
+    assert "#11" in text and "#12" in text
+    assert stub.requests["PATCH /api/v3/work_packages/{wp_id}"] == 2
+
+
+async def test_oversized_update_batches_are_rejected_without_requests(stub, make_server):
+    server = await make_server(stub)
+
+    ok, _ = await call_tool(server, "update_work_packages", {
+        "work_package_ids": list(range(1, 502)), "changes": {"status_id": 4}
+    })
+    assert not ok
+    ok, _ = await call_tool(server, "update_work_packages", {
+        "work_package_ids": [11], "changes": {"status_id": 4}, "concurrency": 33
+    })
+    assert not ok
+
+    assert stub.requests == {}
@@ -0,0 +1,84 @@
+"""Tests for the work package change feed"""
+
+import pytest
+
+from conftest import openproject_mcp
+
+ChangeFeed = openproject_mcp.ChangeFeed
+
+
+def test_uris_name_a_scope_and_an_optional_sequence():
+    assert ChangeFeed.uri(None) == "openproject://changes/all"
+    assert ChangeFeed.parse_uri("openproject://changes/project/4?since=12") == (4, 12)
+    assert ChangeFeed.parse_uri("openproject://changes/all") == (None, None)
+    with pytest.raises(ValueError):
+        ChangeFeed.parse_uri("openproject://changes/project/x")
+
+
+@pytest.fixture
+def feed():
+    return ChangeFeed(min_interval=1.0, max_interval=8.0, buffer=3)
+
+
+async def test_first_poll_only_records_the_starting_point(client, feed):
+    watch = feed.watch(None)
+
+    assert await feed.poll(client, watch) == 0
+    assert watch.high_water
+    assert feed.read(None)["changes"] == []
+
+
+async def test_idle_polls_back_off_and_changes_reset_the_interval(client, feed):
+    watch = feed.watch(None)
+    await feed.start(client, watch)
+
+    await feed.poll(client, watch)
+    await feed.poll(client, watch)
+    assert watch.interval == 4.0
+
+    await client.update_work_packages([{"id": 3, "subject": "Changed"}])
+    assert await feed.poll(client, watch) == 1
+    assert watch.interval == 1.0
+
+
+async def test_changes_are_reported_once(client, feed):
+    watch = feed.watch(None)
+    await feed.start(client, watch)
+
+    await client.update_work_packages([{"id": 3, "subject": "First change"}])
+    await feed.poll(client, watch)
+    await client.update_work_packages([{"id": 4, "subject": "Second change"}])
+    await feed.poll(client, watch)
+    assert await feed.poll(client, watch) == 0
+
+    changes = feed.read(None)["changes"]
+    assert [(change["sequence"], change["id"], change["subject"]) for change in changes] == [
+        (1, 3, "First change"), (2, 4, "Second change")
+    ]
+    assert changes[0]["change"] == "updated"
+    assert [change["id"] for change in feed.read(None, since=1)["changes"]] == [4]
+
+
+async def test_project_scope_ignores_other_projects(client, stub, feed):
+    project_id = stub._attributes(3)["project"]
+    other = next(wp_id for wp_id in range(4, 200) if stub._attributes(wp_id)["project"] != project_id)
+    watch = feed.watch(project_id)
+    await feed.start(client, watch)
+
+    await client.update_work_packages([{"id": 3, "subject": "Mine"}, {"id": other, "subject": "Not mine"}])
+
+    assert await feed.poll(client, watch) == 1
+    assert feed.read(project_id)["changes"][0]["id"] == 3
+
+
+async def test_reader_is_told_when_deltas_were_dropped(client, feed):
+    watch = feed.watch(None)
+    await feed.start(client, watch)
+
+    await client.update_work_packages([{"id": wp_id, "subject": "Bulk"} for wp_id in range(10, 15)])
+    await feed.poll(client, watch)
+
+    snapshot = feed.read(None, since=0)
+    assert [change["sequence"] for change in snapshot["changes"]] == [3, 4, 5]
+    assert snapshot["truncated"] is True
+    assert feed.read(None, since=2)["truncated"] is False
@@ -0,0 +1,55 @@
+"""Tests for single-flight request coalescing"""
+
+import asyncio
+
+import pytest
+
+from conftest import openproject_mcp
+
+
+@pytest.fixture
+async def slow_stub(start_stub):
+    return await start_stub(latency=0.05)
+
+
+async def test_identical_concurrent_gets_share_one_request(slow_stub):
+    async with openproject_mcp.OpenProjectClient(slow_stub.url, "test-key") as client:
+        results = await asyncio.gather(*(client._request("GET", "/work_packages/7") for _ in range(5)))
+
+    assert all(result is results[0] for result in results)
+    assert slow_stub.requests["GET /api/v3/work_packages/{wp_id}"] == 1
+    assert client.coalescing_stats()["coalesced"] == 4
+
+
+async def test_coalescing_can_be_disabled(slow_stub):
+    async with openproject_mcp.OpenProjectClient(slow_stub.url, "test-key", coalesce=False) as client:
+        await asyncio.gather(*(client._request("GET", "/work_packages/7") for _ in range(3)))
+
+    assert slow_stub.requests["GET /api/v3/work_packages/{wp_id}"] == 3
+
+
+async def test_cancelling_one_caller_leaves_the_others_served(slow_stub):
+    async with openproject_mcp.OpenProjectClient(slow_stub.url, "test-key") as client:
+        first = asyncio.ensure_future(client._request("GET", "/work_packages/7"))
+        second = asyncio.ensure_future(client._request("GET", "/work_packages/7"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        result = await second
+
+    assert first.cancelled()
+    assert result["id"] == 7
+
+
+async def test_cancelling_every_caller_cancels_the_request(slow_stub):
+    async with openproject_mcp.OpenProjectClient(slow_stub.url, "test-key") as client:
+        callers = [asyncio.ensure_future(client._request("GET", "/work_packages/7")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        flight = client._inflight["/work_packages/7"]
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert flight.task.cancelled()
+        assert "/work_packages/7" not in client._inflight
@@ -0,0 +1,102 @@
+"""Tests for lazy imports, the persisted metadata cache and connection prewarm"""
+
+import json
+import os
+import stat
+import subprocess
+import sys
+
+from conftest import ROOT, openproject_mcp
+
+InstanceRegistry = openproject_mcp.InstanceRegistry
+
+
+def test_lazy_module_imports_on_first_use():
+    module = openproject_mcp._LazyModule("colorsys")
+
+    assert module._module is None
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert module._module is module.load()
+
+
+def test_server_module_does_not_import_the_http_stack():
+    script = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('openproject_mcp', {str(ROOT / 'openproject-mcp.py')!r})\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "print(sorted(name for name in ('aiohttp', 'sqlite3') if name in sys.modules))\n"
+    )
+    env = {key: value for key, value in os.environ.items() if not key.startswith("OPENPROJECT_")}
+
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def registry_for(stub) -> InstanceRegistry:
+    return InstanceRegistry({"default": openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")}, "default")
+
+
+async def test_snapshot_lets_a_new_process_skip_metadata_requests(stub, tmp_path):
+    path = str(tmp_path / "cache.json")
+    first = registry_for(stub)
+    await first.get().get_types()
+    await first.get().get_statuses()
+    first.save_snapshot(path)
+    await first.close()
+
+    second = registry_for(stub)
+    try:
+        assert second.load_snapshot(path) == 2
+        await second.get().get_types()
+    finally:
+        await second.close()
+
+    assert stub.requests["GET /api/v3/types"] == 1
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+async def test_expired_snapshot_entries_are_revalidated(stub, tmp_path):
+    path = tmp_path / "cache.json"
+    first = registry_for(stub)
+    await first.get().get_types()
+    first.save_snapshot(str(path))
+    await first.close()
+    snapshot = json.loads(path.read_text())
+    for instance in snapshot["instances"].values():
+        instance["saved_at"] -= 7 * 24 * 3600
+    path.write_text(json.dumps(snapshot))
+
+    second = registry_for(stub)
+    try:
+        assert second.load_snapshot(str(path)) == 1
+        await second.get().get_types()
+    finally:
+        await second.close()
+
+    assert second.get().cache.revalidated == 1
+
+
+async def test_snapshot_keeps_entries_of_other_instances(stub, start_stub, tmp_path):
+    path = str(tmp_path / "cache.json")
+    other = registry_for(await start_stub())
+    await other.get().get_priorities()
+    other.save_snapshot(path)
+    await other.close()
+
+    mine = registry_for(stub)
+    await mine.get().get_types()
+    mine.save_snapshot(path)
+    await mine.close()
+
+    with open(path) as f:
+        keys = set(json.load(f)["instances"])
+    assert keys == {other.get().snapshot_key, mine.get().snapshot_key}
+
+
+async def test_prewarm_opens_a_pooled_connection(client, stub):
+    await client.prewarm()
+    await client.test_connection()
+
+    assert stub.requests["GET /api/v3"] == 2
+    assert client._session.connector._conns
@@ -0,0 +1,39 @@
+"""Tests for the pooled client session"""
+
+from conftest import openproject_mcp
+
+
+def test_pool_config_from_env(monkeypatch):
+    monkeypatch.setenv("OPENPROJECT_POOL_LIMIT", "7")
+    monkeypatch.setenv("OPENPROJECT_POOL_LIMIT_PER_HOST", "3")
+    monkeypatch.setenv("OPENPROJECT_CONNECT_TIMEOUT", "0")
+
+    config = openproject_mcp.ConnectionPoolConfig.from_env()
+
+    assert config.limit == 7
+    assert config.limit_per_host == 3
+    assert config.connect_timeout is None
+    assert config.client_timeout(transfer=True).total is None
+
+
+async def test_requests_share_one_session(client):
+    session = client._session
+
+    await client.test_connection()
+    await client.get_statuses()
+
+    assert client._session is session
+    assert session.connector.limit == 100
+    assert session.connector.limit_per_host == 20
+
+
+async def test_close_releases_the_session_and_reopens_on_demand(client):
+    await client.test_connection()
+    session = client._session
+
+    await client.close()
+    assert session.closed
+    assert client._session is None
+
+    await client.test_connection()
+    assert client._session is not None and client._session is not session
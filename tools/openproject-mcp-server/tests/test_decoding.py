@@ -0,0 +1,73 @@
+"""Tests for the JSON backend and streamed page parsing"""
+
+import asyncio
+
+import pytest
+
+from conftest import openproject_mcp
+
+OpenProjectClient = openproject_mcp.OpenProjectClient
+
+needs_ijson = pytest.mark.skipif(openproject_mcp.ijson is None, reason="ijson is not installed")
+
+
+def test_json_backend_follows_the_environment(monkeypatch):
+    monkeypatch.setenv("OPENPROJECT_JSON_BACKEND", "json")
+    name, loads, dumps = openproject_mcp._select_json_backend()
+    assert name == "json"
+    assert loads(dumps({"total": 3, "subject": "Übersicht"})) == {"total": 3, "subject": "Übersicht"}
+
+    monkeypatch.setenv("OPENPROJECT_JSON_BACKEND", "auto")
+    name, _, _ = openproject_mcp._select_json_backend()
+    assert name == ("orjson" if openproject_mcp.orjson is not None else "json")
+
+
+def streaming_client(stub, **options):
+    return OpenProjectClient(
+        stub.url, "test-key", cache=openproject_mcp.MetadataCache(), stream_pages=True, **options
+    )
+
+
+@needs_ijson
+async def test_streamed_pages_match_buffered_pages(client, stub):
+    buffered = await client.get_work_packages(filters="[]", page_size=30)
+    async with streaming_client(stub) as streaming:
+        streamed = await streaming.get_work_packages(filters="[]", page_size=30)
+
+    assert streamed == buffered
+    assert streamed["total"] == 200
+
+
+@needs_ijson
+async def test_streamed_iteration_resumes_and_stops_like_buffered(stub):
+    async with streaming_client(stub) as streaming:
+        paginator = streaming.iter_work_packages(filters="[]", page_size=20, start=45, max_results=30)
+        ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(46, 76))
+    assert paginator.total == 200
+
+
+@needs_ijson
+async def test_streamed_metadata_is_served_from_the_cache(stub):
+    async with streaming_client(stub) as streaming:
+        first = await streaming.get_projects()
+        second = await streaming.get_projects()
+
+    assert first == second
+    assert stub.requests["GET /api/v3/projects"] == 1
+
+
+@needs_ijson
+async def test_streamed_page_joins_a_buffered_request_in_flight(start_stub):
+    stub = await start_stub(latency=0.05)
+    async with streaming_client(stub) as streaming:
+        paginator = streaming.paginate("/work_packages", {"filters": "[]"}, page_size=50)
+        first_page = paginator._page_endpoint(1)
+        buffered = asyncio.ensure_future(streaming._request("GET", first_page))
+        await asyncio.sleep(0)
+        ids = [wp["id"] async for wp in paginator]
+        await buffered
+
+    assert ids == list(range(1, 201))
+    assert stub.requests["GET /api/v3/work_packages"] == 4
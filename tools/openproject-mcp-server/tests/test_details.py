@@ -0,0 +1,57 @@
+"""Tests for the concurrent work package detail fetch"""
+
+from conftest import FaultyStub, call_tool
+
+
+async def test_batch_fetches_every_section_with_few_requests(client, stub):
+    result = await client.get_work_package_details([3, 5, 3])
+
+    details = result["work_packages"]
+    assert list(details) == [3, 5]
+    for wp_id in (3, 5):
+        assert details[wp_id]["work_package"]["id"] == wp_id
+        assert len(details[wp_id]["activities"]) == 3
+        assert details[wp_id]["watchers"]
+        assert details[wp_id]["errors"] == {}
+    assert [relation["id"] for relation in details[5]["relations"]] == [10]
+    assert len(details[5]["attachments"]) == 2
+
+    assert stub.requests["GET /api/v3/work_packages"] == 1
+    assert stub.requests["GET /api/v3/relations"] == 1
+    assert stub.requests["GET /api/v3/work_packages/{wp_id}/activities"] == 2
+
+
+async def test_activity_users_are_resolved_once_per_batch(client, stub):
+    result = await client.get_work_package_details([3, 5], sections=["activities"])
+
+    assert sorted(result["linked"]) == [f"/api/v3/users/{n}" for n in (5, 6, 7, 8, 9)]
+    assert stub.requests["GET /api/v3/users/{user_id}"] == 5
+
+
+async def test_only_the_requested_sections_are_fetched(client, stub):
+    result = await client.get_work_package_details([4], sections=["watchers"])
+
+    assert set(result["work_packages"][4]) == {"work_package", "errors", "watchers"}
+    assert "GET /api/v3/relations" not in stub.requests
+    assert "GET /api/v3/work_packages/{wp_id}/activities" not in stub.requests
+
+
+async def test_a_failing_section_is_reported_without_failing_the_batch(start_stub, make_server):
+    stub = await start_stub(FaultyStub)
+    stub.fail("GET", "/api/v3/relations", [403])
+    server = await make_server(stub)
+
+    result = await server.client.get_work_package_details([3, 9999])
+
+    assert result["work_packages"][3]["work_package"]["id"] == 3
+    assert "403" in result["work_packages"][3]["errors"]["relations"]
+    assert result["work_packages"][9999]["work_package"] is None
+
+
+async def test_details_batch_tool(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "get_work_package_details_batch", {"work_package_ids": [3, 5]})
+
+    assert ok
+    assert "#3" in text and "#5" in text
@@ -0,0 +1,88 @@
+"""Tests for serving many MCP sessions over HTTP from one process"""
+
+import asyncio
+import socket
+
+import pytest
+
+mcp_client = pytest.importorskip("mcp.client.streamable_http")
+pytest.importorskip("uvicorn")
+
+from mcp import ClientSession  # noqa: E402
+from pydantic import AnyUrl  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def wait_until_listening(port: int, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if asyncio.get_running_loop().time() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return
+
+
+@pytest.fixture
+async def http_server(stub, make_server):
+    port = free_port()
+    server = await make_server(stub, OPENPROJECT_HTTP_PORT=str(port), OPENPROJECT_HTTP_PATH="/mcp")
+    task = asyncio.create_task(server._serve_http())
+    await wait_until_listening(port)
+    yield server, f"http://127.0.0.1:{port}/mcp"
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def call_over_http(url: str, name: str, arguments: dict) -> str:
+    async with mcp_client.streamable_http_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            assert name in {tool.name for tool in tools.tools}
+            result = await session.call_tool(name, arguments)
+            return result.content[0].text
+
+
+async def test_sessions_share_one_client_and_cache(http_server, stub):
+    server, url = http_server
+
+    texts = await asyncio.gather(*(call_over_http(url, "list_types", {}) for _ in range(3)))
+    texts.append(await call_over_http(url, "list_types", {}))
+
+    assert all("Task" in text for text in texts)
+    assert stub.requests["GET /api/v3/types"] == 1
+    assert server.client.cache.stats()["hits"] >= 1
+
+
+async def test_disconnected_subscribers_release_their_feeds(http_server):
+    server, url = http_server
+    await server._start_feed()
+    try:
+        async with mcp_client.streamable_http_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                await session.subscribe_resource(AnyUrl("openproject://changes/project/1"))
+                await session.subscribe_resource(AnyUrl("openproject://changes/all"))
+                assert server.feed.watches[1].subscribers == 1
+                assert server.feed.watches[None].subscribers == 1
+
+        # The client ended its session without unsubscribing
+        for _ in range(100):
+            if not server.feed.watches:
+                break
+            await asyncio.sleep(0.05)
+        assert server.feed.watches == {}
+        assert not any(server._feed_sessions.values())
+    finally:
+        await server._stop_feed()
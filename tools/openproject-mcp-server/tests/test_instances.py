@@ -0,0 +1,110 @@
+"""Tests for serving several OpenProject instances"""
+
+import json
+import os
+
+import pytest
+
+from conftest import FaultyStub, call_tool, openproject_mcp
+
+InstanceRegistry = openproject_mcp.InstanceRegistry
+InstanceFanOut = openproject_mcp.InstanceFanOut
+
+
+def write_instances(tmp_path, instances, default=None):
+    path = tmp_path / "instances.json"
+    path.write_text(json.dumps({"default": default, "instances": instances}))
+    return str(path)
+
+
+async def test_every_instance_gets_its_own_tuned_client(tmp_path, start_stub, monkeypatch):
+    production, staging = await start_stub(), await start_stub()
+    monkeypatch.setenv("STAGING_KEY", "secret")
+    path = write_instances(tmp_path, {
+        "production": {"url": production.url, "api_key": "key"},
+        "staging": {
+            "url": staging.url,
+            "api_key_env": "STAGING_KEY",
+            "settings": {"OPENPROJECT_POOL_LIMIT_PER_HOST": 4}
+        }
+    }, default="staging")
+
+    registry = InstanceRegistry.from_file(path)
+
+    assert registry.names == ["production", "staging"]
+    assert registry.get() is registry.get("staging")
+    assert registry.get("staging").pool_config.limit_per_host == 4
+    assert registry.get("production").pool_config.limit_per_host == 20
+    assert registry.get("staging").labels == {"instance": "staging"}
+    assert registry.get("production").cache is not registry.get("staging").cache
+    assert "OPENPROJECT_POOL_LIMIT_PER_HOST" not in os.environ
+    with pytest.raises(ValueError, match="Unknown instance"):
+        registry.get("test")
+
+
+def test_instance_without_a_key_is_rejected(tmp_path):
+    path = write_instances(tmp_path, {"broken": {"url": "http://localhost", "api_key_env": "MISSING_KEY"}})
+
+    with pytest.raises(ValueError, match="needs a url and an api_key"):
+        InstanceRegistry.from_file(path)
+
+
+async def test_fan_out_keeps_going_when_an_instance_fails_or_stalls(start_stub):
+    healthy = await start_stub(work_packages=30)
+    slow = await start_stub(work_packages=30, latency=1.0)
+    failing = await start_stub(FaultyStub, work_packages=30)
+    failing.fail("GET", "/api/v3/work_packages", [403])
+    clients = {
+        name: openproject_mcp.OpenProjectClient(stub.url, "test-key")
+        for name, stub in (("healthy", healthy), ("slow", slow), ("failing", failing))
+    }
+    try:
+        fan_out = InstanceFanOut(
+            {name: client.paginate("/work_packages", {"filters": "[]"}) for name, client in clients.items()},
+            timeout=0.3
+        )
+        received = [(name, wp["id"]) async for name, wp in fan_out]
+    finally:
+        for client in clients.values():
+            await client.close()
+
+    assert received == [("healthy", wp_id) for wp_id in range(1, 31)]
+    assert fan_out.status["healthy"] == {"state": "ok", "total": 30, "error": None}
+    assert fan_out.status["slow"]["state"] == "timeout"
+    assert fan_out.status["failing"]["state"] == "error"
+
+
+@pytest.fixture
+async def multi_server(tmp_path, start_stub, monkeypatch):
+    first, second = await start_stub(work_packages=20), await start_stub(work_packages=30)
+    monkeypatch.setenv("OPENPROJECT_INSTANCES_FILE", write_instances(tmp_path, {
+        "first": {"url": first.url, "api_key": "key"},
+        "second": {"url": second.url, "api_key": "key"}
+    }))
+    server = openproject_mcp.OpenProjectMCPServer()
+    server.instances = InstanceRegistry.from_env(metrics=server.metrics)
+    server.client = server.instances.get()
+    server.tools.publish(server.instances.names, server.instances.default)
+    yield server, first, second
+    await server.instances.close()
+
+
+async def test_fan_out_tool_lists_every_instance(multi_server):
+    server, _, _ = multi_server
+
+    ok, text = await call_tool(server, "list_work_packages_across_instances", {"status": "all"})
+
+    assert ok
+    assert "Found 50 work package(s) across 2 instance(s)" in text
+    assert "- first: 20 of 20" in text
+    assert "- second: 30 of 30" in text
+
+
+async def test_instance_argument_selects_the_client(multi_server):
+    server, first, second = multi_server
+
+    ok, _ = await call_tool(server, "list_types", {"instance": "second"})
+
+    assert ok
+    assert "GET /api/v3/types" not in first.requests
+    assert second.requests["GET /api/v3/types"] == 1
@@ -0,0 +1,78 @@
+"""Tests for the metadata cache"""
+
+from conftest import openproject_mcp
+
+MetadataCache = openproject_mcp.MetadataCache
+
+
+async def test_repeated_lookups_are_served_from_the_cache(client, stub):
+    first = await client.get_types()
+    second = await client.get_types()
+
+    assert second == first
+    assert stub.requests["GET /api/v3/types"] == 1
+    assert client.cache.stats()["hits"] == 1
+
+
+async def test_expired_entry_is_revalidated_with_its_etag(monkeypatch, stub):
+    monkeypatch.setenv("OPENPROJECT_CACHE_TTL_STATUSES", "0")
+    async with openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key") as client:
+        first = await client.get_statuses()
+        second = await client.get_statuses()
+
+    assert second == first
+    assert stub.requests["GET /api/v3/statuses"] == 2
+    assert client.cache.revalidated == 1
+
+
+async def test_invalidated_resource_is_fetched_again(client, stub):
+    await client.get_priorities()
+    await client.get_types()
+
+    assert client.cache.invalidate("priorities") == 1
+    await client.get_priorities()
+    await client.get_types()
+
+    assert stub.requests["GET /api/v3/priorities"] == 2
+    assert stub.requests["GET /api/v3/types"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MetadataCache(max_entries=2)
+    cache.store("/types", "types", {"n": 1}, None)
+    cache.store("/statuses", "statuses", {"n": 2}, None)
+    cache.lookup("/types")
+    cache.store("/priorities", "priorities", {"n": 3}, None)
+
+    assert cache.lookup("/statuses") is None
+    assert cache.lookup("/types") is not None
+    assert cache.evictions == 1
+
+
+def test_only_metadata_endpoints_are_cacheable():
+    cache = MetadataCache()
+
+    assert cache.resource_for("/projects/3/types") == "types"
+    assert cache.resource_for("/projects?filters=%5B%5D") == "projects"
+    assert cache.resource_for("/work_packages") is None
+    assert cache.resource_for("/projects/3/work_packages") is None
+
+
+def test_normalising_a_response_leaves_the_shared_body_alone():
+    shared = {"_type": "Collection", "_embedded": {}}
+
+    result = openproject_mcp.OpenProjectClient._with_elements(shared)
+
+    assert result["_embedded"]["elements"] == []
+    assert shared == {"_type": "Collection", "_embedded": {}}
+
+
+async def test_creating_work_packages_leaves_the_cached_form_alone(client, stub):
+    await client.create_work_package({"project": 1, "type": 1, "subject": "First", "priority_id": 9})
+    await client.create_work_package({"project": 1, "type": 1, "subject": "Second"})
+
+    cached = client.cache.lookup(client.form_template_key(1, 1)).value
+    assert "subject" not in cached
+    assert "lockVersion" not in cached
+    assert cached["_links"]["priority"]["href"] == "/api/v3/priorities/8"
+    assert stub.requests["POST /api/v3/work_packages/form"] == 1
@@ -0,0 +1,62 @@
+"""Tests for request and tool instrumentation"""
+
+from conftest import call_tool, openproject_mcp
+
+Metrics = openproject_mcp.Metrics
+
+
+def test_endpoint_labels_drop_ids_and_queries():
+    assert Metrics.endpoint_label("/projects/5/types") == "/projects/{id}/types"
+    assert Metrics.endpoint_label("/work_packages/12?select=id") == "/work_packages/{id}"
+
+
+def test_prometheus_exposition_of_counters_and_histograms():
+    metrics = Metrics()
+    metrics.inc("openproject_mcp_tool_calls_total", tool="list_types", outcome="ok")
+    metrics.observe("openproject_mcp_tool_duration_seconds", 0.02, tool="list_types")
+    metrics.observe("openproject_mcp_tool_duration_seconds", 3.0, tool="list_types")
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE openproject_mcp_tool_calls_total counter" in text
+    assert 'openproject_mcp_tool_calls_total{outcome="ok",tool="list_types"} 1' in text
+    assert 'openproject_mcp_tool_duration_seconds_bucket{tool="list_types",le="0.025"} 1' in text
+    assert 'openproject_mcp_tool_duration_seconds_bucket{tool="list_types",le="+Inf"} 2' in text
+    assert 'openproject_mcp_tool_duration_seconds_count{tool="list_types"} 2' in text
+
+
+def test_histogram_quantiles_interpolate_inside_buckets():
+    histogram = openproject_mcp._Histogram((1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 1.5):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.25) == 1.0
+    assert 1.0 < histogram.quantile(0.5) < 2.0
+
+
+def test_prometheus_file_is_written_whole(tmp_path):
+    metrics = Metrics()
+    metrics.inc("openproject_mcp_feed_polls_total", outcome="ok")
+    path = tmp_path / "openproject.prom"
+
+    metrics.write_prometheus_file(str(path))
+
+    assert 'openproject_mcp_feed_polls_total{outcome="ok"} 1' in path.read_text()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+async def test_tool_calls_and_api_requests_are_recorded(stub, make_server):
+    server = await make_server(stub)
+    await call_tool(server, "list_types", {})
+
+    requests = server.metrics.counters("openproject_mcp_http_requests_total")
+    assert requests[(("endpoint", "/types"), ("method", "GET"), ("status", "200"))] == 1
+    calls = server.metrics.counters("openproject_mcp_tool_calls_total")
+    assert calls[(("outcome", "ok"), ("tool", "list_types"))] == 1
+
+    ok, summary = await call_tool(server, "server_stats", {})
+    assert ok
+    assert "list_types" in summary and "/types" in summary
+
+    ok, exposition = await call_tool(server, "server_stats", {"format": "prometheus"})
+    assert 'openproject_mcp_http_response_bytes_count{endpoint="/types"} 1' in exposition
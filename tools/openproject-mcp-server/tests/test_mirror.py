@@ -0,0 +1,83 @@
+"""Tests for the local SQLite work package mirror"""
+
+import pytest
+
+from conftest import call_tool, openproject_mcp
+
+
+@pytest.fixture
+async def mirror():
+    mirror = openproject_mcp.WorkPackageMirror(":memory:", page_size=50)
+    await mirror.open()
+    yield mirror
+    await mirror.close()
+
+
+async def test_first_sync_copies_every_work_package(client, mirror):
+    result = await mirror.sync(client)
+
+    rows, total = await mirror.query(status="all", limit=5)
+    assert result["fetched"] == 200
+    assert total == 200
+    assert rows[0]["subject"] and rows[0]["status"]
+
+
+async def test_incremental_sync_fetches_only_newer_work_packages(client, stub, mirror):
+    stub.work_package_count = 190
+    await mirror.sync(client)
+    stub.work_package_count = 200
+
+    result = await mirror.sync(client)
+
+    _, total = await mirror.query(status="all")
+    assert result["fetched"] == 11
+    assert total == 200
+
+
+async def test_due_reconcile_drops_remotely_deleted_work_packages(client, stub):
+    mirror = openproject_mcp.WorkPackageMirror(":memory:", page_size=50, reconcile_interval=1e-6)
+    await mirror.open()
+    try:
+        await mirror.sync(client)
+        stub.work_package_count = 190
+
+        result = await mirror.sync(client)
+        _, total = await mirror.query(status="all")
+    finally:
+        await mirror.close()
+
+    assert result["reconciled"] is True
+    assert result["removed"] == 10
+    assert total == 190
+
+
+async def test_reconcile_waits_for_its_interval(client, stub, mirror):
+    await mirror.sync(client)
+    stub.work_package_count = 190
+
+    result = await mirror.sync(client)
+
+    _, total = await mirror.query(status="all")
+    assert result["reconciled"] is False
+    assert total == 200
+
+
+async def test_query_tool_keeps_to_the_mirrored_projects(stub, make_server):
+    server = await make_server(
+        stub,
+        OPENPROJECT_MIRROR_PATH=":memory:",
+        OPENPROJECT_MIRROR_PROJECTS="1,2",
+        OPENPROJECT_MIRROR_SYNC_INTERVAL="0"
+    )
+    await server._start_mirror()
+
+    ok, text = await call_tool(server, "query_work_packages", {"project_id": 3})
+    assert ok
+    assert "not in the local mirror" in text
+    assert "GET /api/v3/work_packages" not in stub.requests
+    assert "GET /api/v3/projects/{project_id}/work_packages" not in stub.requests
+
+    ok, text = await call_tool(server, "query_work_packages", {"project_id": 1, "status": "all"})
+    assert ok
+    assert "in the local mirror" in text
+    assert "GET /api/v3/work_packages" not in stub.requests
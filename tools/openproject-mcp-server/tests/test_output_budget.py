@@ -0,0 +1,61 @@
+"""Tests for output budgets and continuation cursors"""
+
+import re
+
+import pytest
+
+from conftest import call_tool, openproject_mcp
+
+OutputBuilder = openproject_mcp.OutputBuilder
+
+
+def test_builder_refuses_items_beyond_the_item_budget():
+    output = OutputBuilder(max_chars=1000, max_items=2)
+
+    assert output.add_item("a\n") and output.add_item("b\n")
+    assert not output.add_item("c\n")
+    assert output.truncated
+    assert output.render("head\n", "foot\n") == "head\na\nb\nfoot\n"
+
+
+def test_builder_keeps_the_first_item_and_respects_the_char_budget():
+    output = OutputBuilder(max_chars=10, max_items=0)
+
+    assert output.add_item("x" * 25)
+    assert not output.add_item("y")
+    assert output.parts == ["x" * 10 + "…\n\n"]
+
+
+def test_item_limit_is_the_smaller_of_request_and_budget():
+    assert OutputBuilder(max_items=500).item_limit(20) == 20
+    assert OutputBuilder(max_items=50).item_limit(200) == 50
+    assert OutputBuilder(max_items=0).item_limit(None) is None
+
+
+def test_cursor_round_trip_and_query_binding():
+    arguments = {"status": "all", "project_id": 2}
+    cursor = openproject_mcp._encode_cursor("list_work_packages", arguments, 40, 20)
+
+    resumed = {**arguments, "cursor": cursor, "max_results": 10}
+    assert openproject_mcp._decode_cursor("list_work_packages", resumed) == (40, 20)
+
+    with pytest.raises(ValueError, match="different query"):
+        openproject_mcp._decode_cursor("list_work_packages", {"status": "open", "cursor": cursor})
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        openproject_mcp._decode_cursor("list_work_packages", {"cursor": "not-a-cursor"})
+
+
+async def test_listing_continues_from_its_cursor(stub, make_server):
+    server = await make_server(stub, OPENPROJECT_OUTPUT_MAX_ITEMS="20")
+    arguments = {"status": "all"}
+    seen = []
+
+    for _ in range(3):
+        ok, text = await call_tool(server, "list_work_packages", arguments)
+        assert ok
+        seen.extend(int(n) for n in re.findall(r"\(#(\d+)\)", text))
+        cursor = re.search(r'cursor="([^"]+)"', text).group(1)
+        arguments = {"status": "all", "cursor": cursor}
+
+    assert seen == list(range(1, 61))
+    assert "Showing 41-60 of 200" in text
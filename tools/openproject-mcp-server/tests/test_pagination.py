@@ -0,0 +1,92 @@
+"""Tests for concurrent collection pagination"""
+
+import asyncio
+import random
+
+from conftest import openproject_mcp
+
+ALL = {"filters": "[]"}
+WORK_PACKAGES = "/work_packages"
+
+
+class FakeCollectionClient:
+    """Serves a list of numbers as pages that complete in random order"""
+
+    stream_pages = False
+
+    def __init__(self, size: int, page_size: int, report_total: bool = True):
+        self.size = size
+        self.page_size = page_size
+        self.report_total = report_total
+        self.requested = []
+
+    @staticmethod
+    def _build_endpoint(path, params):
+        return params["offset"]
+
+    async def _request(self, method, offset):
+        self.requested.append(offset)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        start = (offset - 1) * self.page_size
+        elements = [{"id": n} for n in range(start + 1, min(start + self.page_size, self.size) + 1)]
+        page = {"pageSize": self.page_size, "_embedded": {"elements": elements}}
+        if self.report_total:
+            page["total"] = self.size
+        return page
+
+
+async def test_pages_fetched_out_of_order_are_yielded_in_offset_order():
+    client = FakeCollectionClient(size=95, page_size=10)
+    paginator = openproject_mcp.CollectionPaginator(client, "/items", concurrency=4)
+
+    ids = [element["id"] async for element in paginator]
+
+    assert ids == list(range(1, 96))
+    assert sorted(client.requested) == list(range(1, 11))
+
+
+async def test_collection_without_total_is_walked_until_a_short_page():
+    client = FakeCollectionClient(size=35, page_size=10, report_total=False)
+    paginator = openproject_mcp.CollectionPaginator(client, "/items", concurrency=4)
+
+    ids = [element["id"] async for element in paginator]
+
+    assert ids == list(range(1, 36))
+    assert client.requested == [1, 2, 3, 4]
+
+
+async def test_paginate_reads_every_page_of_the_stub(client, stub):
+    paginator = client.paginate(WORK_PACKAGES, ALL, page_size=30)
+
+    ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(1, 201))
+    assert paginator.total == 200
+    assert stub.requests["GET /api/v3/work_packages"] == 7
+
+
+async def test_max_results_stops_at_a_prefix_without_fetching_further_pages(client, stub):
+    paginator = client.paginate(WORK_PACKAGES, ALL, page_size=20, max_results=45)
+
+    ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(1, 46))
+    assert stub.requests["GET /api/v3/work_packages"] == 3
+
+
+async def test_start_resumes_inside_a_page(client):
+    paginator = client.paginate(WORK_PACKAGES, ALL, page_size=20, start=45, max_results=10)
+
+    ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(46, 56))
+
+
+async def test_server_page_size_cap_is_respected(start_stub):
+    stub = await start_stub(max_page_size=25)
+    async with openproject_mcp.OpenProjectClient(stub.url, "test-key") as client:
+        paginator = client.paginate(WORK_PACKAGES, ALL, page_size=100)
+        ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(1, 201))
+    assert paginator.effective_page_size == 25
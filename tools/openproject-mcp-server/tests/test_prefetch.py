@@ -0,0 +1,153 @@
+"""Tests for speculative metadata prefetching"""
+
+import asyncio
+
+from conftest import call_tool, openproject_mcp
+
+PrefetchScheduler = openproject_mcp.PrefetchScheduler
+
+
+async def finish(scheduler):
+    """Wait for the scheduler's running prefetches"""
+    await asyncio.gather(*scheduler._tasks.values(), return_exceptions=True)
+
+
+def outcomes(scheduler):
+    return {
+        (labels[1][1], labels[0][1]): count
+        for labels, count in scheduler.metrics.counters("openproject_mcp_prefetch_requests_total").items()
+    }
+
+
+async def test_prefetch_warms_types_forms_priorities_and_statuses(client, stub):
+    scheduler = PrefetchScheduler(max_projects=2)
+
+    scheduler.schedule(client, [1, 1, None, 2, 3])
+    await finish(scheduler)
+
+    assert stub.requests["GET /api/v3/projects/{project_id}/types"] == 2
+    assert stub.requests["POST /api/v3/work_packages/form"] == 2
+    assert stub.requests["GET /api/v3/priorities"] == 1
+    assert stub.requests["GET /api/v3/statuses"] == 1
+    assert client.cache.stats()["prefetched"] == 6
+
+    await client.get_types(2)
+    await client.get_priorities()
+
+    assert stub.requests["GET /api/v3/projects/{project_id}/types"] == 2
+    assert client.cache.stats()["prefetch_hits"] == 2
+
+
+async def test_fresh_entries_are_not_fetched_again(client, stub):
+    await client.get_priorities()
+    scheduler = PrefetchScheduler(max_projects=1)
+
+    scheduler.schedule(client, [1])
+    await finish(scheduler)
+
+    assert stub.requests["GET /api/v3/priorities"] == 1
+    assert outcomes(scheduler)[("priorities", "cached")] == 1
+
+
+async def test_request_budget_limits_one_listing(client, stub):
+    scheduler = PrefetchScheduler(max_projects=3, max_requests=2)
+
+    scheduler.schedule(client, [1, 2, 3])
+    await finish(scheduler)
+
+    assert sum(stub.requests.values()) == 2
+    assert outcomes(scheduler)[("statuses", "budget")] == 1
+
+
+async def test_time_budget_stops_a_slow_prefetch(start_stub):
+    stub = await start_stub(latency=0.2)
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    try:
+        scheduler = PrefetchScheduler(max_projects=3, budget=0.1)
+
+        scheduler.schedule(client, [1, 2, 3])
+        await finish(scheduler)
+
+        assert outcomes(scheduler) == {("types", "budget"): 1}
+        assert scheduler._tasks == {}
+        assert client.cache.stats()["prefetched"] == 0
+    finally:
+        await client.close()
+
+
+async def test_a_joined_flight_is_not_counted_as_prefetched(start_stub):
+    stub = await start_stub(latency=0.2)
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    try:
+        scheduler = PrefetchScheduler(max_projects=1, max_requests=1)
+        scheduler.schedule(client, [1])
+        await asyncio.sleep(0.05)
+
+        # A tool call asks for the types the prefetch is fetching right now
+        await client.get_types(1)
+        await finish(scheduler)
+
+        assert stub.requests["GET /api/v3/projects/{project_id}/types"] == 1
+        assert client.cache.lookup("/projects/1/types").prefetched is False
+        assert client.cache.stats()["prefetched"] == 0
+    finally:
+        await client.close()
+
+
+async def test_busy_tool_calls_cancel_the_prefetch(start_stub):
+    stub = await start_stub(latency=0.2)
+    client = openproject_mcp.OpenProjectClient.from_env(stub.url, "test-key")
+    await client.open()
+    try:
+        scheduler = PrefetchScheduler(max_projects=3, yield_at=2)
+        scheduler.schedule(client, [1, 2, 3])
+        await asyncio.sleep(0.05)
+
+        with scheduler.foreground_call():
+            assert scheduler._tasks
+            with scheduler.foreground_call():
+                await finish(scheduler)
+
+        assert outcomes(scheduler) == {("types", "cancelled"): 1}
+    finally:
+        await client.close()
+
+
+async def test_prefetch_waits_while_a_tool_call_runs(client, stub):
+    scheduler = PrefetchScheduler(max_projects=1)
+
+    with scheduler.foreground_call():
+        scheduler.schedule(client, [1])
+        await asyncio.sleep(0.05)
+        assert stub.requests == {}
+
+    await finish(scheduler)
+    assert stub.requests["GET /api/v3/statuses"] == 1
+
+
+async def test_list_projects_warms_the_metadata_of_listed_projects(stub, make_server):
+    server = await make_server(stub, OPENPROJECT_PREFETCH="true", OPENPROJECT_PREFETCH_PROJECTS=2)
+
+    ok, _ = await call_tool(server, "list_projects", {})
+    assert ok
+    await finish(server.prefetch)
+
+    types_requests = stub.requests["GET /api/v3/projects/{project_id}/types"]
+    assert types_requests == 2
+
+    ok, text = await call_tool(server, "list_types", {"project_id": 1})
+
+    assert ok, text
+    assert stub.requests["GET /api/v3/projects/{project_id}/types"] == types_requests
+    assert server.client.cache.stats()["prefetch_hits"] == 1
+
+
+async def test_prefetch_is_off_by_default(stub, make_server):
+    server = await make_server(stub)
+
+    await call_tool(server, "list_projects", {})
+
+    assert server.prefetch is None
+    assert "GET /api/v3/projects/{project_id}/types" not in stub.requests
@@ -0,0 +1,65 @@
+"""Tests for filter, sort and sparse fieldset pushdown"""
+
+import json
+import re
+
+from conftest import call_tool, openproject_mcp
+
+OpenProjectClient = openproject_mcp.OpenProjectClient
+
+
+def test_filters_are_encoded_for_the_api():
+    filters = json.loads(OpenProjectClient.work_package_filters(
+        status="closed", type_id=3, updated_after="2024-01-01T00:00:00Z", subject_contains="login"
+    ))
+
+    assert filters == [
+        {"status": {"operator": "c", "values": []}},
+        {"type": {"operator": "=", "values": ["3"]}},
+        {"updatedAt": {"operator": "<>d", "values": ["2024-01-01T00:00:00Z", ""]}},
+        {"subject": {"operator": "~", "values": ["login"]}}
+    ]
+    assert OpenProjectClient.work_package_filters(status="all") == "[]"
+
+
+async def test_sorted_listing_with_a_limit_is_a_sorted_prefix(start_stub):
+    stub = await start_stub(latency=0.01)
+    async with OpenProjectClient(stub.url, "test-key", page_concurrency=4) as client:
+        paginator = client.iter_work_packages(
+            filters="[]", page_size=10, max_results=45, sort_by=[["id", "desc"]]
+        )
+        ids = [wp["id"] async for wp in paginator]
+
+    assert ids == list(range(200, 155, -1))
+    assert stub.requests["GET /api/v3/work_packages"] == 5
+
+
+async def test_filtered_listing_returns_only_matching_work_packages(client):
+    result = await client.get_work_packages(
+        filters=client.work_package_filters(status="all", type_id=3), page_size=25
+    )
+
+    elements = result["_embedded"]["elements"]
+    assert elements
+    assert result["total"] == len(elements)
+    assert all(wp["_links"]["type"]["href"].endswith("/types/3") for wp in elements)
+
+
+async def test_sparse_fieldset_leaves_out_unrequested_fields(client):
+    result = await client.get_work_packages(filters="[]", max_results=3, page_size=3, fields=["id", "subject"])
+
+    for wp in result["_embedded"]["elements"]:
+        assert set(wp) == {"id", "subject", "_links"}
+        assert wp["_links"] == {}
+
+
+async def test_list_tool_pushes_sort_and_limit_to_the_api(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "list_work_packages", {
+        "status": "all", "sort_by": "id", "sort_order": "desc", "max_results": 5
+    })
+
+    assert ok
+    assert [int(n) for n in re.findall(r"\(#(\d+)\)", text)] == [200, 199, 198, 197, 196]
+    assert stub.requests["GET /api/v3/work_packages"] == 1
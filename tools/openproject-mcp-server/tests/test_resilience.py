@@ -0,0 +1,123 @@
+"""Tests for retries with backoff and the circuit breaker"""
+
+import asyncio
+import time
+
+import pytest
+
+from conftest import FaultyStub, openproject_mcp
+
+CircuitBreaker = openproject_mcp.CircuitBreaker
+RetryPolicy = openproject_mcp.RetryPolicy
+
+
+@pytest.fixture
+async def faulty(start_stub):
+    return await start_stub(FaultyStub)
+
+
+def make_client(stub, retries=3, threshold=5, reset=30.0):
+    return openproject_mcp.OpenProjectClient(
+        stub.url,
+        "test-key",
+        cache=openproject_mcp.MetadataCache(),
+        retry_policy=RetryPolicy(max_retries=retries, backoff_base=0.001),
+        circuit_breaker=CircuitBreaker(failure_threshold=threshold, reset_timeout=reset)
+    )
+
+
+async def test_transient_failures_are_retried(faulty):
+    faulty.fail("GET", "/api/v3/statuses", [503, 502])
+
+    async with make_client(faulty) as client:
+        result = await client.get_statuses()
+
+    assert result["_embedded"]["elements"]
+    assert client.retries == 2
+    assert faulty.requests["GET /api/v3/statuses"] == 1
+
+
+async def test_retry_after_is_honoured(faulty):
+    faulty.fail("GET", "/api/v3/priorities", [429], retry_after="0.2")
+
+    async with make_client(faulty) as client:
+        started = time.monotonic()
+        await client.get_priorities()
+
+    assert time.monotonic() - started >= 0.2
+
+
+async def test_exhausted_retries_raise_the_last_error(faulty):
+    faulty.fail("GET", "/api/v3/types", [503] * 3)
+
+    async with make_client(faulty, retries=2) as client:
+        with pytest.raises(openproject_mcp.OpenProjectAPIError) as raised:
+            await client.get_types()
+
+    assert raised.value.status == 503
+    assert client.retries_exhausted == 1
+
+
+async def test_creations_are_not_retried(faulty):
+    async with make_client(faulty) as client:
+        await client.get_form_template(1, 1)
+        faulty.fail("POST", "/api/v3/work_packages", [503])
+        with pytest.raises(openproject_mcp.OpenProjectAPIError):
+            await client.create_work_package({"project": 1, "type": 1, "subject": "Once"})
+
+    assert "POST /api/v3/work_packages" not in faulty.requests
+
+
+async def test_breaker_opens_fails_fast_and_closes_after_a_probe(faulty):
+    faulty.fail("GET", "/api/v3/statuses", [503, 503])
+
+    async with make_client(faulty, retries=0, threshold=2, reset=0.1) as client:
+        for _ in range(2):
+            with pytest.raises(openproject_mcp.OpenProjectAPIError):
+                await client.get_statuses()
+        assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(openproject_mcp.CircuitOpenError):
+            await client.get_statuses()
+        assert client.circuit_breaker.rejected == 1
+
+        await asyncio.sleep(0.1)
+        await client.get_statuses()
+
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+    assert faulty.requests["GET /api/v3/statuses"] == 1
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    return breaker
+
+
+def test_only_the_probe_frees_the_probe_slot():
+    breaker = open_breaker()
+    assert breaker.before_request() is True
+    with pytest.raises(openproject_mcp.CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_cancelled(probe=False)
+    with pytest.raises(openproject_mcp.CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_cancelled(probe=True)
+    assert breaker.before_request() is True
+
+
+async def test_cancelled_probe_lets_the_next_request_probe(start_stub):
+    stub = await start_stub(latency=0.2)
+    async with make_client(stub, retries=0, threshold=1, reset=0.0) as client:
+        client.circuit_breaker.record_failure()
+        probe = asyncio.ensure_future(client._request("GET", "/work_packages/1"))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        result = await client._request("GET", "/work_packages/2")
+
+    assert result["id"] == 2
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,51 @@
+"""Tests for grouped work package summaries"""
+
+import pytest
+
+from conftest import call_tool, openproject_mcp
+
+
+def by_id(summary):
+    return {group["id"]: (group["count"], group["sums"]) for group in summary["groups"]}
+
+
+async def test_server_grouping_takes_one_request(client, stub):
+    summary = await client.summarize_work_packages("status", filters="[]", show_sums=True)
+
+    assert summary["source"] == "server"
+    assert summary["total"] == 200
+    assert sum(group["count"] for group in summary["groups"]) == 200
+    counts = [group["count"] for group in summary["groups"]]
+    assert counts == sorted(counts, reverse=True)
+    assert summary["total_sums"]["estimatedTime"] > 0
+    assert stub.requests["GET /api/v3/work_packages"] == 1
+
+
+async def test_local_fallback_matches_server_grouping(client, start_stub):
+    grouped = await client.summarize_work_packages("type", filters="[]", show_sums=True)
+    ungrouped_stub = await start_stub(grouping=False)
+    async with openproject_mcp.OpenProjectClient(ungrouped_stub.url, "test-key") as ungrouped:
+        local = await ungrouped.summarize_work_packages("type", filters="[]", show_sums=True)
+
+    assert local["source"] == "local"
+    assert by_id(local) == pytest.approx(by_id(grouped))
+    assert local["total_sums"] == pytest.approx(grouped["total_sums"])
+
+
+async def test_unknown_group_is_rejected_before_any_request(client, stub):
+    with pytest.raises(ValueError, match="Cannot group by"):
+        await client.summarize_work_packages("subject")
+
+    assert "GET /api/v3/work_packages" not in stub.requests
+
+
+async def test_summarize_tool_renders_the_groups(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "summarize_work_packages", {
+        "group_by": "status", "status": "all", "show_sums": True
+    })
+
+    assert ok
+    assert "New" in text and "Closed" in text
+    assert "200" in text
@@ -0,0 +1,102 @@
+"""Tests for tool deadlines, cancellation and concurrency limits"""
+
+import asyncio
+
+import pytest
+
+from conftest import call_tool, openproject_mcp
+
+ToolLimiter = openproject_mcp.ToolLimiter
+
+
+async def test_without_a_deadline_the_call_is_awaited_directly():
+    limiter = ToolLimiter(deadline=0)
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert limiter.deadline_for("list_types") is None
+    assert await limiter.within_deadline("list_types", work()) == "done"
+
+
+async def test_expired_deadline_cancels_the_call():
+    limiter = ToolLimiter(deadline=60, tool_deadlines={"slow_tool": 0.05})
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(openproject_mcp.ToolDeadlineExceeded) as raised:
+        await limiter.within_deadline("slow_tool", work())
+
+    assert raised.value.deadline == 0.05
+    assert cancelled.is_set()
+
+
+async def test_timeout_inside_the_call_is_not_the_deadline():
+    limiter = ToolLimiter(deadline=60)
+
+    async def work():
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.within_deadline("list_types", work())
+
+
+async def test_tool_limit_queues_calls_without_holding_global_slots():
+    limiter = ToolLimiter(max_concurrent=2, tool_limits={"expensive": 1})
+    release = asyncio.Event()
+    running = []
+
+    async def call(tool):
+        async with limiter.slot(tool):
+            running.append(tool)
+            await release.wait()
+
+    calls = [asyncio.ensure_future(call(tool)) for tool in ("expensive", "expensive", "cheap")]
+    await asyncio.sleep(0.01)
+
+    assert sorted(running) == ["cheap", "expensive"]
+    assert limiter.queued["expensive"] == 1
+    release.set()
+    await asyncio.gather(*calls)
+    assert limiter.running == {"expensive": 0, "cheap": 0}
+
+
+async def test_per_tool_request_timeouts_apply_inside_the_slot():
+    limiter = ToolLimiter(request_timeouts={"summarize_work_packages": (None, 120.0)})
+
+    async with limiter.slot("summarize_work_packages"):
+        assert openproject_mcp._request_timeouts.get() == (None, 120.0)
+    assert openproject_mcp._request_timeouts.get() is None
+
+
+async def test_tool_over_its_deadline_reports_a_timeout(start_stub, make_server):
+    stub = await start_stub(latency=0.5)
+    server = await make_server(stub, OPENPROJECT_TOOL_TIMEOUT_LIST_TYPES="0.1")
+
+    ok, text = await call_tool(server, "list_types", {})
+
+    assert not ok
+    assert "did not finish within 0.1s and was cancelled" in text
+    assert server.client.coalescing_stats()["in_flight"] == 0
+    calls = server.metrics.counters("openproject_mcp_tool_calls_total")
+    assert calls[(("outcome", "timeout"), ("tool", "list_types"))] == 1
+
+
+async def test_read_timeout_is_reported_as_an_error(start_stub, make_server):
+    stub = await start_stub(latency=0.5)
+    server = await make_server(
+        stub, OPENPROJECT_READ_TIMEOUT_LIST_TYPES="0.1", OPENPROJECT_RETRY_MAX="0"
+    )
+
+    ok, text = await call_tool(server, "list_types", {})
+
+    assert not ok
+    assert "Network error" in text
+    assert "deadline" not in text and "did not finish" not in text
@@ -0,0 +1,135 @@
+"""Tests for the tool registry and its compiled argument validators"""
+
+import pytest
+
+from conftest import call_tool, openproject_mcp
+
+ToolInputError = openproject_mcp.ToolInputError
+ToolRegistry = openproject_mcp.ToolRegistry
+ToolSpec = openproject_mcp.ToolSpec
+_compile_schema = openproject_mcp._compile_schema
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project_id": {"type": "integer", "minimum": 1},
+        "status": {"type": "string", "enum": ["open", "closed", "all"]},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+        "ids": {"type": "array", "items": {"type": "integer"}, "minItems": 1, "maxItems": 3},
+        "active": {"type": "boolean"}
+    },
+    "required": ["project_id"]
+}
+
+
+@pytest.mark.parametrize("arguments, error", [
+    ({}, "arguments: missing required project_id"),
+    ({"project_id": "5"}, "project_id: expected integer, got string"),
+    ({"project_id": True}, "project_id: expected integer, got boolean"),
+    ({"project_id": 0}, "project_id: must be at least 1, got 0"),
+    ({"project_id": 1, "limit": 101}, "limit: must be at most 100, got 101"),
+    ({"project_id": 1, "status": "done"}, "status: must be one of open, closed, all, got 'done'"),
+    ({"project_id": 1, "ids": []}, "ids: must have at least 1 item(s), got 0"),
+    ({"project_id": 1, "ids": [1, 2, 3, 4]}, "ids: must have at most 3 item(s), got 4"),
+    ({"project_id": 1, "ids": [1, "2"]}, "ids[1]: expected integer, got string"),
+    ({"project_id": 1, "active": 1}, "active: expected boolean, got integer"),
+    ([], "arguments: expected object, got array"),
+])
+def test_validator_reports_the_first_violation(arguments, error):
+    assert _compile_schema(SCHEMA)(arguments) == error
+
+
+def test_validator_accepts_valid_arguments_and_ignores_unknown_keys():
+    validate = _compile_schema(SCHEMA)
+
+    assert validate({"project_id": 3, "status": "all", "limit": 100, "ids": [1], "active": False}) is None
+    assert validate({"project_id": 3, "note": "not in the schema"}) is None
+
+
+def test_validator_accepts_any_of_several_types():
+    validate = _compile_schema({"type": ["integer", "null"]})
+
+    assert validate(None) is None
+    assert validate(4) is None
+    assert validate(1.5) == "arguments: expected integer or null, got number"
+
+
+def make_registry(check=None):
+    async def handler(arguments, client):
+        return "done"
+
+    return ToolRegistry([
+        ToolSpec("list_things", "List things", SCHEMA, handler, check=check),
+        ToolSpec("everywhere", "Query every instance", {"type": "object", "properties": {}}, handler, scope="fan_out"),
+        ToolSpec("server_info", "Server info", {"type": "object", "properties": {}}, handler, scope="server")
+    ])
+
+
+def test_registry_resolves_valid_calls_and_rejects_invalid_ones():
+    registry = make_registry()
+
+    assert registry.resolve("list_things", {"project_id": 1}).name == "list_things"
+    with pytest.raises(ToolInputError, match="Unknown tool: nope"):
+        registry.resolve("nope", {})
+    with pytest.raises(ToolInputError, match="Invalid arguments for 'list_things': project_id: must be at least 1"):
+        registry.resolve("list_things", {"project_id": 0})
+
+
+def test_check_runs_only_after_the_schema_passes():
+    checked = []
+
+    def check(arguments):
+        checked.append(arguments)
+        if arguments["project_id"] == 13:
+            raise ToolInputError("Project 13 is archived")
+
+    registry = make_registry(check)
+
+    with pytest.raises(ToolInputError, match="missing required"):
+        registry.resolve("list_things", {})
+    assert checked == []
+    with pytest.raises(ToolInputError, match="archived"):
+        registry.resolve("list_things", {"project_id": 13})
+
+
+def test_publish_adds_instance_arguments_and_fan_out_tools():
+    registry = make_registry()
+
+    assert [tool.name for tool in registry.tools] == ["list_things", "server_info"]
+
+    registry.publish(["prod", "staging"], default="prod")
+
+    tools = {tool.name: tool for tool in registry.tools}
+    assert set(tools) == {"list_things", "everywhere", "server_info"}
+    assert tools["list_things"].inputSchema["properties"]["instance"]["enum"] == ["prod", "staging"]
+    assert "instance" not in tools["server_info"].inputSchema["properties"]
+    assert tools["everywhere"].inputSchema["properties"]["instances"]["items"]["enum"] == ["prod", "staging"]
+    # The declared schema is left untouched
+    assert "instance" not in SCHEMA["properties"]
+    with pytest.raises(ToolInputError, match="instance: must be one of prod, staging"):
+        registry.resolve("list_things", {"project_id": 1, "instance": "test"})
+
+
+async def test_invalid_calls_are_answered_without_api_requests(stub, make_server):
+    server = await make_server(stub)
+
+    ok, text = await call_tool(server, "list_work_packages", {"status": "done"})
+    assert not ok
+    assert text.startswith("❌ Invalid arguments for 'list_work_packages': status: must be one of")
+
+    ok, text = await call_tool(server, "no_such_tool", {})
+    assert not ok
+    assert text == "❌ Unknown tool: no_such_tool"
+
+    assert stub.requests == {}
+    calls = server.metrics.counters("openproject_mcp_tool_calls_total")
+    assert calls[(("outcome", "invalid"), ("tool", "list_work_packages"))] == 1
+
+
+async def test_every_published_tool_schema_compiles(stub, make_server):
+    server = await make_server(stub)
+
+    assert server.tools.tools
+    for tool in server.tools.tools:
+        assert tool.inputSchema["type"] == "object"
+        assert callable(_compile_schema(tool.inputSchema))